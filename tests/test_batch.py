@@ -0,0 +1,141 @@
+import threading
+import time
+
+import numpy as np
+
+from voice_app import BATCH_MAX_CLIP_SEC, SAMPLE_RATE, BatchScheduler, TextSegment
+
+
+class StubModel:
+    """한 클립씩 디코딩하는 가짜 모델 - 클립 첫 샘플 값을 텍스트로"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return iter([TextSegment(0.0, len(audio) / SAMPLE_RATE, f"{audio[0]:g}")]), None
+
+
+class StubPipeline:
+    """BatchedInferencePipeline(faster-whisper 1.2)처럼 초 단위 clip_timestamps로 오디오를 잘라 클립마다 세그먼트 두 개를 냄"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, clip_timestamps=None, batch_size=None, **kwargs):
+        self.calls.append((clip_timestamps, batch_size, kwargs))
+        segments = []
+        for clip in clip_timestamps:
+            start, end = int(clip["start"] * SAMPLE_RATE), int(clip["end"] * SAMPLE_RATE)
+            chunk = audio[start:end]
+            offset, half = start / SAMPLE_RATE, len(chunk) / SAMPLE_RATE / 2
+            segments.append(TextSegment(offset, offset + half, f"{chunk[0]:g}a"))
+            segments.append(TextSegment(offset + half, offset + 2 * half, f"{chunk[0]:g}b"))
+        return iter(segments), None
+
+
+def clip(value, seconds):
+    return np.full(int(seconds * SAMPLE_RATE), value, dtype=np.float32)
+
+
+def run_together(scheduler, clips, **kwargs):
+    """클립마다 스레드 하나로 동시에 transcribe - 결과 세그먼트 목록 (클립 순)"""
+    results = [None] * len(clips)
+
+    def run(i):
+        segments, _ = scheduler.transcribe(clips[i], **kwargs)
+        results[i] = list(segments)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(clips))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_two_clip_batch_maps_segments_back():
+    pipeline = StubPipeline()
+    scheduler = BatchScheduler(StubModel(), max_wait=0.2, pipeline=pipeline)
+    results = run_together(scheduler, [clip(1, 2), clip(2, 3)], language="ko")
+
+    assert scheduler.batches == 1 and scheduler.batched_clips == 2
+    clips, batch_size, kwargs = pipeline.calls[0]
+    assert batch_size == 2 and kwargs == {"language": "ko"}
+    assert clips == [{"start": 0.0, "end": 2.0}, {"start": 2.0, "end": 5.0}]
+
+    first, second = results
+    assert [s.text for s in first] == ["1a", "1b"]
+    assert [s.text for s in second] == ["2a", "2b"]
+    assert (first[0].start, first[-1].end) == (0.0, 2.0)
+    assert (second[0].start, second[-1].end) == (0.0, 3.0)  # 클립 기준 시각
+
+
+def test_different_settings_or_lengths_are_not_grouped():
+    model = StubModel()
+    pipeline = StubPipeline()
+    scheduler = BatchScheduler(model, max_wait=0.2, pipeline=pipeline)
+    first = {"audio": clip(1, 1), "key": "a"}
+    scheduler.pending = [first, {"audio": clip(2, 1), "key": "b"}, {"audio": clip(3, 5), "key": "a"},
+                         {"audio": clip(4, 1.5), "key": "a"}]
+    assert [r["audio"][0] for r in scheduler._group(first)] == [1, 4]
+
+
+def test_single_clip_uses_model_directly():
+    model = StubModel()
+    pipeline = StubPipeline()
+    scheduler = BatchScheduler(model, max_wait=0.01, pipeline=pipeline)
+    segments, _ = scheduler.transcribe(clip(7, 1))
+    assert [s.text for s in segments] == ["7"]
+    assert model.calls == 1 and pipeline.calls == [] and scheduler.batches == 0
+
+
+def test_pipeline_error_reaches_every_clip():
+    class FailingPipeline:
+        def transcribe(self, audio, **kwargs):
+            raise RuntimeError("batch failed")
+
+    scheduler = BatchScheduler(StubModel(), max_wait=0.2, pipeline=FailingPipeline())
+    errors = []
+
+    def run(value):
+        try:
+            list(scheduler.transcribe(clip(value, 1))[0])
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=run, args=(v,)) for v in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert errors == ["batch failed", "batch failed"]
+
+
+def test_long_clips_share_decode_slots():
+    class CountingModel:
+        """동시에 디코딩 중인 수를 세는 모델 - 세그먼트를 꺼내는 동안도 디코딩 중"""
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.active = self.peak = 0
+
+        def transcribe(self, audio, **kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+
+            def segments():
+                time.sleep(0.05)
+                yield TextSegment(0.0, 1.0, f"{audio[0]:g}")
+                with self.lock:
+                    self.active -= 1
+            return segments(), None
+
+    model = CountingModel()
+    scheduler = BatchScheduler(model, max_wait=0.01, pipeline=StubPipeline(), decode_slots=2)
+    long_clips = [clip(v, BATCH_MAX_CLIP_SEC + 1) for v in range(5)]  # 묶지 않는 긴 클립
+    results = run_together(scheduler, long_clips + [clip(9, 1)])
+    assert [[s.text for s in r] for r in results] == [["0"], ["1"], ["2"], ["3"], ["4"], ["9"]]
+    assert model.peak == 2
@@ -0,0 +1,61 @@
+import types
+
+import pytest
+
+from voice_app import CallbackMonitor
+
+BLOCK = 1600  # 16kHz에서 0.1초
+
+
+def status(overflow=False, underflow=False):
+    return types.SimpleNamespace(input_overflow=overflow, input_underflow=underflow)
+
+
+def adc(t):
+    return types.SimpleNamespace(inputBufferAdcTime=t)
+
+
+def test_healthy_recording_has_no_loss_or_warning():
+    monitor = CallbackMonitor()
+    for i in range(20):
+        monitor.record(BLOCK, adc(10 + i * 0.1), None, 0.002)
+    summary = monitor.summary()
+    assert summary["callbacks"] == 20
+    assert summary["lost_audio_sec"] == 0 and summary["late_callbacks"] == 0
+    assert summary["callback_p95_load"] == 0.05
+    assert not monitor.falling_behind()
+
+
+def test_overflow_and_adc_gap_are_counted_as_lost_audio():
+    monitor = CallbackMonitor()
+    monitor.record(BLOCK, adc(10.0), None, 0.002)
+    monitor.record(BLOCK, adc(10.1), status(overflow=True), 0.002)
+    monitor.record(BLOCK, adc(10.5), status(underflow=True), 0.002)  # 0.3초 빠짐
+    summary = monitor.summary(dropped_samples=800)  # 버퍼가 가득 차 버린 0.05초
+    assert summary["input_overflows"] == 1 and summary["input_underflows"] == 1
+    assert summary["lost_audio_sec"] == pytest.approx(0.3 + 0.05)
+    assert monitor.falling_behind()
+
+
+def test_slow_callbacks_fill_histogram_and_warn():
+    monitor = CallbackMonitor()
+    for _ in range(18):
+        monitor.record(BLOCK, adc(0), None, 0.001)
+    monitor.record(BLOCK, adc(0), None, 0.06)   # 블록의 60% - 경고
+    monitor.record(BLOCK, adc(0), None, 0.12)   # 마감 초과
+    assert monitor.late == 1
+    assert monitor.max_elapsed == 0.12 and monitor.max_load == pytest.approx(1.2)
+    assert monitor.load_percentile(50) == 0.05
+    assert monitor.load_percentile(100) == 1.5
+    assert monitor.falling_behind()
+    assert monitor.format_hist() == "≤0.05:18 ≤0.75:1 ≤1.5:1"
+    assert monitor.summary()["lost_audio_sec"] == 0  # 늦었어도 ADC 빈틈이 없으면 손실 아님
+
+
+def test_reset_starts_a_new_recording():
+    monitor = CallbackMonitor()
+    monitor.record(BLOCK, adc(1.0), status(overflow=True), 0.2)
+    monitor.reset(48000)
+    assert monitor.summary()["callbacks"] == 0 and not monitor.falling_behind()
+    monitor.record(4800, adc(5.0), None, 0.001)
+    assert monitor.block_sec == pytest.approx(0.1)
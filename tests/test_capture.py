@@ -0,0 +1,47 @@
+import numpy as np
+
+from voice_app import SAMPLE_RATE, CaptureBuffer
+
+
+def blocks(total, size=1024):
+    audio = np.sin(np.arange(total, dtype=np.float32) / 50).astype(np.float32) * 0.5
+    return audio, [audio[i:i + size] for i in range(0, total, size)]
+
+
+def test_view_is_zero_copy_and_matches_written_blocks():
+    buffer = CaptureBuffer(2)
+    audio, parts = blocks(SAMPLE_RATE)
+    for part in parts:
+        buffer.write(part)
+    assert len(buffer) == len(audio)
+    view = buffer.view()
+    np.testing.assert_array_equal(view, audio)
+    assert np.shares_memory(view, buffer.data)  # 변환기에 복사 없이 넘김
+    np.testing.assert_array_equal(buffer.view(100, 200), audio[100:200])
+
+
+def test_compact_storage_round_trips_within_int16_precision():
+    buffer = CaptureBuffer(2, compact=True)
+    audio, parts = blocks(SAMPLE_RATE)
+    for part in parts:
+        buffer.write(part)
+    assert buffer.data.dtype == np.int16
+    view = buffer.view()
+    assert view.dtype == np.float32
+    np.testing.assert_allclose(view, audio, atol=2 / 32768)
+
+
+def test_compact_write_clips_out_of_range_samples():
+    buffer = CaptureBuffer(1, compact=True)
+    buffer.write(np.array([2.0, -2.0], dtype=np.float32))
+    assert buffer.data[:2].tolist() == [32767, -32767]
+
+
+def test_full_buffer_drops_and_counts_overflow():
+    buffer = CaptureBuffer(0)  # 여유 1초만
+    audio, parts = blocks(SAMPLE_RATE + 1000)
+    for part in parts:
+        buffer.write(part)
+    assert len(buffer) == buffer.capacity == SAMPLE_RATE
+    assert buffer.dropped == 1000
+    np.testing.assert_array_equal(buffer.view(), audio[:SAMPLE_RATE])
@@ -0,0 +1,73 @@
+import types
+
+import pytest
+
+import voice_app
+from voice_app import VoiceApp, choose_decode_profile, load_config, record_rtf
+
+
+class FakeRoot:
+    """Tk root 대신 after 콜백을 모아 두었다가 직접 실행"""
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, fn, *args):
+        self.next_id += 1
+        self.pending[self.next_id] = (ms, fn, args)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run(self, max_ms):
+        """max_ms 이하로 예약된 콜백을 예약 순서대로 실행 (실행 중 새로 예약된 것도)"""
+        while True:
+            due = [i for i, (ms, _, _) in sorted(self.pending.items()) if ms <= max_ms]
+            if not due:
+                return
+            _, fn, args = self.pending.pop(due[0])
+            fn(*args)
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(voice_app, "CONFIG_FILE", str(path))
+    return path
+
+
+def make_app(config):
+    app = types.SimpleNamespace(config=config, root=FakeRoot(), config_save_id=None)
+    for name in ("post_config_change", "apply_config_change", "flush_config"):
+        setattr(app, name, types.MethodType(getattr(VoiceApp, name), app))
+    return app
+
+
+def test_measured_rtf_survives_restart(config_file):
+    config = load_config()
+    app = make_app(config)
+    for _ in range(3):  # 변환 스레드가 녹음마다 보냄
+        app.post_config_change(record_rtf, config, "small", "accurate", 10.0, 0.5)
+    app.root.run(0)
+    assert not config_file.exists()  # 모아서 한 번만 저장
+    assert [ms for ms, _, _ in app.root.pending.values()] == [voice_app.CONFIG_SAVE_DELAY_MS]
+    app.root.run(voice_app.CONFIG_SAVE_DELAY_MS)
+    assert config_file.exists()
+
+    restarted = load_config()
+    assert restarted["rtf_stats"]["small"]["accurate"] == pytest.approx(0.05)
+    # 기본 추정치(accurate 0.3)로는 20초 청크가 3초 목표를 넘지만, 측정값으로는 accurate 선택
+    assert choose_decode_profile(dict(voice_app.DEFAULT_CONFIG), "small", 20) != "accurate"
+    assert choose_decode_profile(restarted, "small", 20) == "accurate"
+
+
+def test_flush_writes_pending_changes(config_file):
+    config = load_config()
+    app = make_app(config)
+    app.post_config_change(record_rtf, config, "base", "fastest", 5.0, 0.25)
+    app.root.run(0)
+    app.flush_config()  # 종료 시
+    assert app.config_save_id is None and not app.root.pending
+    assert load_config()["rtf_stats"]["base"]["fastest"] == pytest.approx(0.05)
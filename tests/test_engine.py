@@ -0,0 +1,52 @@
+import threading
+import time
+
+from voice_app import Transcriber
+
+
+def test_set_model_waits_for_load_lock():
+    engine = Transcriber({})
+    engine.set_model("old", "small")
+    done = threading.Event()
+    with engine.load_lock:  # 유휴 해제/재로드가 잠금을 잡고 있는 동안
+        thread = threading.Thread(target=lambda: (engine.set_model("new", "medium"), done.set()))
+        thread.start()
+        assert not done.wait(0.1)
+        assert (engine.model, engine.model_size) == ("old", "small")
+    thread.join(1)
+    assert (engine.model, engine.model_size) == ("new", "medium")
+
+
+def test_switch_keeps_acquired_model_for_running_decode():
+    engine = Transcriber({})
+    engine.set_model("old", "small")
+    model, size = engine.acquire()
+    engine.set_model("new", "medium")
+    assert (model, size) == ("old", "small")
+    assert not engine.unload()  # 사용 중
+    engine.release()
+    assert engine.acquire() == ("new", "medium")
+    engine.release()
+
+
+def test_reload_after_unload_uses_loader_once():
+    engine = Transcriber({})
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "reloaded", "small"
+
+    engine.loader = loader
+    engine.set_model("first", "small")
+    assert engine.unload()
+    results = []
+    threads = [threading.Thread(target=lambda: (results.append(engine.acquire()), engine.release()))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(2)
+    assert calls == [1]
+    assert results == [("reloaded", "small")] * 4
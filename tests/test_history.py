@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import voice_app
+from voice_app import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.db.close()
+
+
+def test_migrates_string_and_dict_entries(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_app, "CONFIG_FILE", str(tmp_path / "config.json"))
+    config = {"language": "ko", "history": [
+        "예전 문자열 항목",
+        {"text": "사전 형식 항목", "time": "2024-01-02 03:04:05", "duration": 3.5, "model": "small"},
+        {"text": ""},  # 빈 텍스트는 건너뜀
+    ]}
+    assert store.migrate_from_config(config) == 3
+    assert "history" not in config
+    with open(tmp_path / "config.json", encoding="utf-8") as f:
+        assert "history" not in json.load(f)
+
+    newest, oldest = store.page()
+    assert oldest["text"] == "예전 문자열 항목"
+    assert newest["text"] == "사전 형식 항목"
+    assert newest["time"] == "2024-01-02 03:04:05"
+    assert newest["duration"] == 3.5 and newest["model"] == "small"
+    assert store.migrate_from_config(config) == 0  # 한 번만
+
+
+def test_search_finds_korean_substrings(store):
+    store.add("오늘 회의록을 정리했습니다")
+    store.add("내일 발표 자료")
+    store.add("회의실 예약")
+    assert [e["text"] for e in store.page(query="회의")] == ["회의실 예약", "오늘 회의록을 정리했습니다"]
+    assert store.count(query="회의록을") == 1
+    assert store.count(query='따옴표"') == 0
+    assert store.count(query="100%") == 0
+
+
+def test_update_reindexes_text(store):
+    entry_id = store.add("초안 텍스트", model="tiny")
+    assert store.update(entry_id, "다듬은 텍스트", model="small", refined=True)
+    assert store.count(query="초안 텍스트") == 0
+    assert store.count(query="다듬은 텍스트") == 1
+    entry = store.page()[0]
+    assert entry["model"] == "small" and entry["refined"] is True
+    assert not store.update(entry_id + 1, "없는 항목")
+
+
+def test_paging_and_clear(store):
+    for i in range(5):
+        store.add(f"항목 {i}")
+    assert [e["text"] for e in store.page(offset=1, limit=2)] == ["항목 3", "항목 2"]
+    assert store.count() == 5
+    store.clear()
+    assert store.count() == 0
+    assert store.count(query="항목") == 0
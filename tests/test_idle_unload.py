@@ -0,0 +1,87 @@
+import threading
+import time
+import types
+
+from voice_app import Transcriber, VoiceApp
+
+
+class Queue:
+    def __init__(self, pending=0):
+        self.pending = pending
+
+    def pending_count(self):
+        return self.pending
+
+
+def make_idle_app(idle_min=5, idle_for_min=10):
+    """유휴 해제/다시 로드만 묶은 앱 - 모델은 문자열, 캐시는 로드 호출을 기록"""
+    loads = []
+
+    def load_cached_model(model_size):
+        loads.append(model_size)
+        time.sleep(0.05)  # 그동안 다른 변환도 모델을 기다림
+        return f"reloaded-{model_size}", True
+
+    cleared = []
+    app = types.SimpleNamespace(
+        config={"idle_unload_min": idle_min}, recording=False, models_unloaded=False, vad_model=None,
+        vad_unloaded=False, root=types.SimpleNamespace(after=lambda ms, fn, *args: None),
+        engine=Transcriber({}), draft_engine=Transcriber({}),
+        worker=Queue(), refine_worker=Queue(), retranscribe_worker=Queue(),
+        model_cache=types.SimpleNamespace(clear=lambda: cleared.append(1)),
+        load_cached_model=load_cached_model, reload_extras=lambda: None)
+    app.engine.warm_up = lambda model: None
+    app.engine.set_model("small-model", "small")
+    idle_since = time.monotonic() - idle_for_min * 60
+    app.engine.last_used = app.draft_engine.last_used = app.last_recording = idle_since
+    for name in ("check_idle", "unload_models", "reload_model"):
+        setattr(app, name, types.MethodType(getattr(VoiceApp, name), app))
+    app.engine.loader = app.reload_model
+    return app, loads, cleared
+
+
+def test_idle_check_unloads_only_when_nothing_is_pending():
+    app, _, cleared = make_idle_app()
+    app.refine_worker.pending = 1  # 2단계 변환 진행 중
+    app.check_idle()
+    assert app.engine.model == "small-model" and not app.models_unloaded
+
+    app.refine_worker.pending = 0
+    app.check_idle()
+    assert app.engine.model is None and app.models_unloaded and cleared == [1]
+
+
+def test_recent_use_keeps_model():
+    app, _, _ = make_idle_app(idle_min=5, idle_for_min=1)
+    app.check_idle()
+    assert app.engine.model == "small-model" and not app.models_unloaded
+
+
+def test_unload_skips_model_in_use():
+    app, _, cleared = make_idle_app()
+    model, size = app.engine.acquire()  # 로컬 서비스 요청이 변환 중
+    app.unload_models(5)
+    assert app.engine.model == "small-model" and not app.models_unloaded and cleared == []
+    app.engine.release()
+    assert model == "small-model"
+
+
+def test_concurrent_transcriptions_share_one_reload():
+    app, loads, _ = make_idle_app()
+    app.check_idle()
+    assert app.engine.model is None
+
+    results = []
+
+    def transcribe():
+        results.append(app.engine.acquire())
+        app.engine.release()
+
+    threads = [threading.Thread(target=transcribe) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(2)
+    assert loads == ["small"]  # 해제 전 모델 크기로 한 번만
+    assert results == [("reloaded-small", "small")] * 3
+    assert not app.models_unloaded
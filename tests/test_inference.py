@@ -0,0 +1,108 @@
+import threading
+import time
+
+import faster_whisper
+import numpy as np
+import pytest
+
+from voice_app import SAMPLE_RATE, RemoteWhisperModel, inference_worker_main
+
+
+class Segment:
+    def __init__(self, start, end, text):
+        self.start, self.end, self.text = start, end, text
+
+
+class SlowWhisperModel:
+    """초당 세그먼트 하나를 천천히 내는 가짜 WhisperModel - 오디오 첫 샘플 값을 텍스트로"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def transcribe(self, audio, **kwargs):
+        label = f"{audio[0]:g}"
+
+        def segments():
+            for i in range(int(len(audio) / SAMPLE_RATE)):
+                time.sleep(0.02)
+                yield Segment(i, i + 1, f"{label}-{i}")
+
+        return segments(), None
+
+
+class ThreadedRemoteModel(RemoteWhisperModel):
+    """추론 프로세스 대신 같은 프로세스의 스레드에서 inference_worker_main 실행"""
+
+    def _launch(self, child_conn):
+        thread = threading.Thread(target=inference_worker_main, args=(child_conn,) + self.args, daemon=True)
+        thread.start()
+        return thread
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    monkeypatch.setattr(faster_whisper, "WhisperModel", SlowWhisperModel)
+    model = ThreadedRemoteModel("fake")
+    yield model
+    model._finalizer()
+
+
+def clip(value, seconds):
+    return np.full(int(seconds * SAMPLE_RATE), value, dtype=np.float32)
+
+
+def test_segments_stream_in_order(remote):
+    segments, _ = remote.transcribe(clip(1, 3))
+    assert [seg.text for seg in segments] == ["1-0", "1-1", "1-2"]
+
+
+def test_abandoned_generator_does_not_block_next_request(remote):
+    segments, _ = remote.transcribe(clip(1, 20))
+    assert next(segments).text == "1-0"  # 멈춘 채로 닫지 않음 - 다음 요청은 추론 쪽이 끝나면 진행
+
+    result = []
+    thread = threading.Thread(target=lambda: result.extend(s.text for s in remote.transcribe(clip(2, 2))[0]))
+    thread.start()
+    thread.join(5)
+    assert result == ["2-0", "2-1"]
+    segments.close()
+
+
+def test_closed_generator_cancels_remaining_segments(remote):
+    segments, _ = remote.transcribe(clip(1, 200))
+    next(segments)
+    start = time.perf_counter()
+    segments.close()  # 취소 전송 - 남은 199개 세그먼트를 기다리지 않음
+    assert [seg.text for seg in remote.transcribe(clip(3, 1))[0]] == ["3-0"]
+    assert time.perf_counter() - start < 2
+
+
+def test_worker_keeps_messages_received_between_segments(monkeypatch):
+    from multiprocessing import Pipe, shared_memory
+    monkeypatch.setattr(faster_whisper, "WhisperModel", SlowWhisperModel)
+    conn, child = Pipe()
+    worker = threading.Thread(target=inference_worker_main, args=(child, "fake", "cpu", "int8", 0, 1), daemon=True)
+    worker.start()
+    assert conn.recv()[0] == "ready"
+    shm = shared_memory.SharedMemory(create=True, size=3 * SAMPLE_RATE * 4)
+    try:
+        np.ndarray((3 * SAMPLE_RATE,), dtype=np.float32, buffer=shm.buf)[:] = 1
+        # 첫 요청이 디코딩되는 동안 다음 메시지들이 도착 - 세그먼트 사이 취소 확인에서 읽힘
+        conn.send(("transcribe", 1, shm.name, 3 * SAMPLE_RATE, {}))
+        conn.send(("cancel", 0, None))
+        conn.send(("transcribe", 2, shm.name, SAMPLE_RATE, {}))
+        conn.send(("stop", None, None))
+        replies = []
+        while True:
+            try:
+                replies.append(conn.recv()[:2])
+            except EOFError:
+                break
+            if replies[-1] == ("done", 2):
+                break
+        worker.join(2)
+    finally:
+        shm.close()
+        shm.unlink()
+    assert replies == [("segment", 1)] * 3 + [("done", 1), ("segment", 2), ("done", 2)]
+    assert not worker.is_alive()  # 대기열에 넣어 둔 stop도 처리
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from voice_app import MetricsLog
+
+
+def test_summary_reports_stage_percentiles_and_throughput(tmp_path):
+    log = MetricsLog(str(tmp_path / "metrics.jsonl"))
+    for i in range(1, 21):
+        log.record({"duration": 10.0, "decode_sec": 2.0, "chars_out": 30, "capture_sec": float(i)})
+    summary = log.summary()
+    assert summary["recordings"] == 20
+    assert summary["audio_sec"] == 200.0 and summary["chars_out"] == 600
+    assert summary["rtf"] == pytest.approx(0.2)
+    capture = summary["stages"]["capture_sec"]
+    assert capture["n"] == 20
+    assert 10 <= capture["p50"] <= 11
+    assert 19 <= capture["p95"] <= 20
+    assert "decode_sec" in summary["stages"] and "clipboard_sec" not in summary["stages"]
+
+
+def test_recent_entries_survive_restart_and_skip_broken_lines(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    log = MetricsLog(str(path), window=3)
+    for i in range(5):
+        log.record({"duration": float(i)})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"duration": ')  # 쓰다 끊긴 줄
+    restarted = MetricsLog(str(path), window=3)
+    assert [e["duration"] for e in restarted.recent] == [2.0, 3.0, 4.0]
+
+
+def test_log_rotates_and_keeps_backups(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    log = MetricsLog(str(path), max_bytes=200, backups=2)
+    for i in range(30):
+        log.record({"duration": float(i), "capture_sec": 1.0})
+    assert (tmp_path / "metrics.jsonl.1").exists() and (tmp_path / "metrics.jsonl.2").exists()
+    assert not (tmp_path / "metrics.jsonl.3").exists()
+    assert path.stat().st_size < 400
+    last = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert last["duration"] == 29.0 and "time" in last
+    # 현재 파일이 짧아도 백업에서 이어서 읽음
+    recent = MetricsLog(str(path), window=5).recent
+    assert [e["duration"] for e in recent] == [25.0, 26.0, 27.0, 28.0, 29.0]
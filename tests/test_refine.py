@@ -0,0 +1,92 @@
+import threading
+import types
+
+import voice_app
+from test_vad import speech_pipeline, windows
+from voice_app import Transcriber, TranscriptionWorker, VoiceApp, text_diff_rate
+
+
+class LengthEngine:
+    """Transcriber.transcribe_range만 빌려 쓰는 엔진 - 디코딩 대신 받은 오디오 길이를 텍스트로"""
+
+    transcribe_range = Transcriber.transcribe_range
+
+    def __init__(self):
+        self.lengths = []
+
+    def transcribe(self, audio, initial_prompt=None, cancel_event=None, info=None):
+        self.lengths.append(len(audio))
+        return f"{len(audio)}"
+
+
+def test_refine_does_not_count_trimmed_silence_twice():
+    n = windows(1)
+    vad = speech_pipeline([True] * n + [False] * windows(3) + [True] * n)
+    capture = vad.buffer
+    engine = LengthEngine()
+    first = engine.transcribe_range(capture, vad, 0, len(capture), info={})  # 초안 변환
+    trimmed = vad.trimmed
+    assert 0 < trimmed < len(capture)
+
+    done = threading.Event()
+    app = types.SimpleNamespace(engine=engine, refine_worker=TranscriptionWorker(on_done=lambda job: done.set()))
+    VoiceApp.refine(app, capture, vad, history_id=1, draft=first)
+    assert done.wait(2)
+    assert engine.lengths[1] == engine.lengths[0]  # 같은 음성 구간을 다시 변환
+    assert vad.trimmed == trimmed
+    app.refine_worker.stop()
+
+
+class Label:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None, foreground=None):
+        self.text = text
+
+
+def make_refine_app(monkeypatch, clipboard):
+    monkeypatch.setattr(voice_app.pyperclip, "paste", lambda: clipboard[0])
+    monkeypatch.setattr(voice_app.pyperclip, "copy", lambda text: clipboard.__setitem__(0, text))
+    updates, metrics, shown = [], [], []
+    app = types.SimpleNamespace(
+        config={}, recording=False, last_history_id=5, status_label=Label(),
+        history=types.SimpleNamespace(update=lambda history_id, text, **info: updates.append((history_id, text, info))),
+        metrics=types.SimpleNamespace(record=metrics.append), set_result_text=shown.append,
+        worker=types.SimpleNamespace(pending_count=lambda: 0))
+    return app, updates, metrics, shown
+
+
+def refined_job(text):
+    return types.SimpleNamespace(result=text, info={"model": "medium", "refine_sec": 1.5})
+
+
+def test_refined_text_replaces_draft_everywhere(monkeypatch):
+    clipboard = ["오늘 회의는 세시"]
+    app, updates, metrics, shown = make_refine_app(monkeypatch, clipboard)
+    VoiceApp.apply_refined(app, refined_job("오늘 회의는 세 시"), 5, "오늘 회의는 세시")
+    diff = text_diff_rate("오늘 회의는 세시", "오늘 회의는 세 시")
+    assert diff > 0
+    assert updates == [(5, "오늘 회의는 세 시", {"model": "medium", "draft_text": "오늘 회의는 세시",
+                                                "refine_diff": diff, "refine_sec": 1.5})]
+    assert clipboard == ["오늘 회의는 세 시"]
+    assert shown == ["오늘 회의는 세 시"]
+    assert metrics == [{"refine_sec": 1.5, "refine_diff": diff, "model": "medium"}]
+
+
+def test_refine_leaves_newer_clipboard_and_other_results_alone(monkeypatch):
+    clipboard = ["사용자가 그사이 복사한 것"]
+    app, updates, metrics, shown = make_refine_app(monkeypatch, clipboard)
+    app.last_history_id = 6  # 다음 녹음 결과가 표시 중
+    VoiceApp.apply_refined(app, refined_job("고친 결과"), 5, "초안")
+    assert [u[:2] for u in updates] == [(5, "고친 결과")]
+    assert clipboard == ["사용자가 그사이 복사한 것"]
+    assert shown == []
+
+
+def test_unchanged_refine_is_only_measured(monkeypatch):
+    clipboard = ["같은 결과"]
+    app, updates, metrics, shown = make_refine_app(monkeypatch, clipboard)
+    VoiceApp.apply_refined(app, refined_job("같은 결과"), 5, "같은 결과")
+    assert updates == [] and shown == []
+    assert metrics[0]["refine_diff"] == 0
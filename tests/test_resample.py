@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from voice_app import SAMPLE_RATE, AudioRing, CaptureBuffer, PreRollBuffer, StreamResampler
+
+
+def sine(rate, freq, sec):
+    t = np.arange(int(rate * sec)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def process_in_blocks(resampler, audio, sizes):
+    out = []
+    pos = 0
+    i = 0
+    while pos < len(audio):
+        size = sizes[i % len(sizes)]
+        out.append(resampler.process(audio[pos:pos + size]))
+        pos += size
+        i += 1
+    return np.concatenate(out)
+
+
+@pytest.mark.parametrize("rate", [44100, 48000, 8000])
+def test_block_size_does_not_change_output(rate):
+    audio = sine(rate, 440, 1.0)
+    whole = StreamResampler(rate).process(audio)
+    blocks = process_in_blocks(StreamResampler(rate), audio, [441, 17, 1024, 1])
+    np.testing.assert_allclose(blocks, whole, atol=1e-5)
+
+
+@pytest.mark.parametrize("rate", [44100, 48000])
+def test_output_length_and_tone(rate):
+    audio = sine(rate, 440, 2.0)
+    out = StreamResampler(rate).process(audio)
+    assert abs(len(out) - len(audio) * SAMPLE_RATE / rate) <= 1
+    steady = out[SAMPLE_RATE // 2:]  # 필터 지연 이후
+    spectrum = np.abs(np.fft.rfft(steady))
+    peak_hz = np.argmax(spectrum) * SAMPLE_RATE / len(steady)
+    assert abs(peak_hz - 440) < 2
+    assert abs(np.max(np.abs(steady)) - 0.5) < 0.02
+
+
+def test_removes_content_above_new_nyquist():
+    out = StreamResampler(48000).process(sine(48000, 12000, 1.0))
+    assert np.max(np.abs(out[SAMPLE_RATE // 4:])) < 0.01
+
+
+def test_same_rate_passes_through():
+    audio = sine(SAMPLE_RATE, 440, 0.1)
+    np.testing.assert_allclose(StreamResampler(SAMPLE_RATE).process(audio), audio, atol=1e-6)
+
+
+def test_audio_ring_reads_across_wrap():
+    ring = AudioRing(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    block, pos = ring.read(0)
+    np.testing.assert_array_equal(block, np.arange(6))
+    ring.write(np.arange(6, 11, dtype=np.float32))
+    block, pos = ring.read(pos)
+    np.testing.assert_array_equal(block, np.arange(6, 11))
+    assert pos == 11 and ring.lost == 0
+
+
+def test_audio_ring_counts_overwritten_samples():
+    ring = AudioRing(4)
+    ring.write(np.arange(10, dtype=np.float32))
+    block, pos = ring.read(0)
+    np.testing.assert_array_equal(block, np.arange(6, 10))
+    assert ring.lost == 6 and pos == 10
+
+
+def test_preroll_drains_latest_audio_in_order():
+    preroll = PreRollBuffer(1.0, rate=4)
+    preroll.write(np.arange(3, dtype=np.float32))
+    preroll.write(np.arange(3, 6, dtype=np.float32))
+    capture = CaptureBuffer(1)
+    preroll.drain_into(capture)
+    np.testing.assert_array_equal(capture.view(), [2, 3, 4, 5])
+    preroll.drain_into(capture)
+    assert len(capture) == 4
@@ -0,0 +1,102 @@
+import threading
+import types
+
+import numpy as np
+
+import voice_app
+from voice_app import TranscriptionWorker, VoiceApp
+
+
+class Label:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None, foreground=None):
+        self.text = text
+
+
+class QueuedRoot:
+    """root.after(0, ...)으로 넘어온 완료 콜백을 모아 두었다가 직접 실행 (UI 스레드 대신)"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def after(self, ms, fn, *args):
+        with self.lock:
+            self.calls.append((ms, fn, args))
+
+    def run(self):
+        with self.lock:
+            calls, self.calls = [c for c in self.calls if c[0] == 0], [c for c in self.calls if c[0] != 0]
+        for _, fn, args in calls:
+            fn(*args)
+
+
+class FakeTranscriber:
+    """다시 변환에 쓰이는 Transcriber 대신 - 모델 크기와 언어를 그대로 결과로"""
+
+    def __init__(self, config, post=None):
+        self.model = self.model_size = None
+
+    def transcribe(self, audio, cancel_event=None, info=None, language=None):
+        info["model"] = self.model_size
+        return f"{self.model_size}:{language}"
+
+
+def make_app(monkeypatch):
+    monkeypatch.setattr(voice_app, "Transcriber", FakeTranscriber)
+    copied, history, metrics = [], [], []
+    monkeypatch.setattr(voice_app.pyperclip, "copy", copied.append)
+    root = QueuedRoot()
+    app = types.SimpleNamespace(
+        config={"language": "ko"}, root=root, recording=False, last_history_id=None,
+        engine=types.SimpleNamespace(post=None),
+        archive=types.SimpleNamespace(load=lambda name: np.zeros(16000, dtype=np.float32)),
+        load_cached_model=lambda size: (object(), False),
+        add_to_history=lambda text, **info: history.append((text, info)) or len(history),
+        metrics=types.SimpleNamespace(record=metrics.append),
+        status_label=Label(), update_tray_icon=lambda color: None,
+        set_result_text=lambda text: None, reset_status=lambda: None)
+    app.worker = TranscriptionWorker(on_done=lambda job: root.after(0, app.on_transcription_done, job))
+    app.retranscribe_worker = TranscriptionWorker(
+        on_done=lambda job: root.after(0, app.on_retranscribe_done, job))
+    for name in ("retranscribe", "on_retranscribe_done", "on_transcription_done"):
+        setattr(app, name, types.MethodType(getattr(VoiceApp, name), app))
+    return app, copied, history, metrics
+
+
+def test_retranscribe_does_not_wait_for_dictation(monkeypatch):
+    app, copied, history, metrics = make_app(monkeypatch)
+    release = threading.Event()
+    dictation = app.worker.submit(lambda job: release.wait(5) and "받아쓰기")
+    done = threading.Event()
+    app.retranscribe_worker.on_done = lambda job: (app.root.after(0, app.on_retranscribe_done, job), done.set())
+
+    app.retranscribe({"id": 7, "audio_file": "a.wav"}, "large-v3", "en")
+    assert done.wait(2)  # 받아쓰기 작업이 끝나지 않았어도 완료
+    assert not dictation.finished
+    app.root.run()
+    assert copied == ["large-v3:en"]
+    assert history[0][0] == "large-v3:en"
+    assert history[0][1]["retranscribed_from"] == 7
+    assert app.last_history_id == 1
+    assert app.status_label.text == "다시 변환 중... (large-v3)"  # 받아쓰기가 남아 있으면 상태는 그쪽에 맡김
+
+    release.set()
+    app.worker.stop()
+    app.retranscribe_worker.stop()
+
+
+def test_retranscribe_is_not_recorded_in_metrics(monkeypatch):
+    app, copied, history, metrics = make_app(monkeypatch)
+    done = threading.Event()
+    app.retranscribe_worker.on_done = lambda job: (app.root.after(0, app.on_retranscribe_done, job), done.set())
+    app.retranscribe({"id": 3, "audio_file": "b.wav"}, "medium", "ko")
+    assert done.wait(2)
+    app.root.run()
+    assert copied == ["medium:ko"]
+    assert metrics == []
+    assert app.status_label.text.startswith("다시 변환 완료")
+    app.worker.stop()
+    app.retranscribe_worker.stop()
@@ -0,0 +1,99 @@
+import json
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from voice_app import (SAMPLE_RATE, SERVICE_MAGIC, SERVICE_VERSION, TextSegment, TranscriptionService,
+                       decode_service_audio, recv_exact, recv_upto, request_transcription)
+
+
+class EchoEngine:
+    """오디오 길이를 세그먼트 하나로 돌려주는 가짜 엔진"""
+
+    def transcribe(self, audio, cancel_event=None, info=None, on_segment=None, language=None, profile=None):
+        duration = len(audio) / SAMPLE_RATE
+        on_segment(TextSegment(0.0, duration, f"{duration:g}s {language}"))
+        info["model"] = "echo"
+        return f"{duration:g}s {language}"
+
+
+def make_service(is_ready=True, legacy=None):
+    return TranscriptionService(EchoEngine(), lambda: is_ready, legacy_handler=legacy)
+
+
+def handle_in_thread(service, conn):
+    service.clients.acquire()  # serve()가 연결마다 잡는 자리
+    thread = threading.Thread(target=service._handle, args=(conn,), daemon=True)
+    thread.start()
+    return thread
+
+
+def read_frame(conn):
+    size, = struct.unpack(">I", recv_exact(conn, 4))
+    return json.loads(recv_exact(conn, size))
+
+
+def test_recv_upto_collects_split_sends_and_stops_at_eof():
+    a, b = socket.socketpair()
+    with a, b:
+        a.sendall(b"TN")
+        threading.Timer(0.05, lambda: (a.sendall(b"V"), a.shutdown(socket.SHUT_WR))).start()
+        assert recv_upto(b, 4) == b"TNV"
+
+
+def test_split_magic_prefix_is_not_legacy():
+    legacy_calls = []
+    service = make_service(is_ready=False, legacy=legacy_calls.append)
+    client, server = socket.socketpair()
+    with client:
+        thread = handle_in_thread(service, server)
+        client.sendall(SERVICE_MAGIC[:2])
+        time.sleep(0.05)
+        header = json.dumps({"cmd": "transcribe", "length": 2}).encode()
+        client.sendall(SERVICE_MAGIC[2:] + bytes([SERVICE_VERSION]) + struct.pack(">I", len(header)) + header)
+        assert read_frame(client) == {"type": "error", "message": "모델 준비 중"}
+        thread.join(2)
+    assert legacy_calls == []
+
+
+def test_split_legacy_message():
+    received = []
+    service = make_service(legacy=lambda data: received.append(data) or b"OK")
+    client, server = socket.socketpair()
+    with client:
+        thread = handle_in_thread(service, server)
+        client.sendall(b"ST")
+        time.sleep(0.05)
+        client.sendall(b"ATS")
+        client.shutdown(socket.SHUT_WR)
+        assert recv_upto(client, 16) == b"OK"
+        thread.join(2)
+    assert received == [b"STATS"]
+
+
+def test_request_round_trip():
+    service = make_service()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen()  # serve()도 listen하지만 스레드가 시작되기 전에 연결해도 되도록
+    port = server.getsockname()[1]
+    threading.Thread(target=service.serve, args=(server,), daemon=True).start()
+    try:
+        audio = np.zeros(SAMPLE_RATE, dtype="<i2").tobytes()
+        messages = list(request_transcription(audio, fmt="pcm_s16le", port=port, language="ko"))
+    finally:
+        server.close()
+    assert [m["type"] for m in messages] == ["queued", "segment", "done"]
+    assert messages[-1]["text"] == "1s ko"
+    assert messages[-1]["model"] == "echo"
+
+
+def test_decode_service_audio_downmixes_and_resamples():
+    stereo = np.zeros((8000, 2), dtype="<f4")
+    stereo[:, 0] = 0.5
+    audio = decode_service_audio({"format": "pcm_f32le", "channels": 2, "sample_rate": 8000}, stereo.tobytes())
+    assert len(audio) == SAMPLE_RATE
+    assert abs(float(audio[SAMPLE_RATE // 2]) - 0.25) < 1e-3
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import voice_app
+from voice_app import (SAMPLE_RATE, CaptureBuffer, StreamingTranscriber, find_silence_split,
+                       merge_overlap, split_at_silence)
+
+
+def tone(sec, amp=0.3):
+    t = np.arange(int(sec * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(sec):
+    return np.zeros(int(sec * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_merge_overlap_drops_longest_repeat():
+    assert merge_overlap("a b c d".split(), "c d e".split()) == ["e"]
+    assert merge_overlap("a b".split(), "x y".split()) == ["x", "y"]
+    assert merge_overlap([], "x".split()) == ["x"]
+
+
+def test_merge_overlap_limited_to_max_words():
+    assert merge_overlap("a b c".split(), "a b c d".split(), max_words=2) == ["a", "b", "c", "d"]
+
+
+def test_find_silence_split_centers_latest_pause():
+    audio = np.concatenate([tone(9), silence(1), tone(3)])
+    split = find_silence_split(audio)
+    assert split is not None
+    assert 9 * SAMPLE_RATE <= split <= 10 * SAMPLE_RATE
+
+
+def test_find_silence_split_too_short():
+    assert find_silence_split(np.concatenate([tone(3), silence(1), tone(2)])) is None
+
+
+def test_find_silence_split_forced_without_pause():
+    split = find_silence_split(tone(30))
+    assert split is not None
+    assert split <= voice_app.STREAM_MAX_CHUNK_SEC * SAMPLE_RATE
+
+
+def test_split_at_silence_covers_audio():
+    audio = np.concatenate([tone(20), silence(1), tone(20), silence(1), tone(20)])
+    chunks = split_at_silence(audio)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+    assert all(e - s <= voice_app.STREAM_MAX_CHUNK_SEC * SAMPLE_RATE for s, e in chunks)
+
+
+def make_buffer(audio):
+    buffer = CaptureBuffer(len(audio) / SAMPLE_RATE)
+    buffer.write(audio)
+    return buffer
+
+
+def test_streaming_failed_chunk_decoded_again_on_finish():
+    buffer = make_buffer(np.concatenate([tone(9), silence(1), tone(3)]))
+    calls = []
+
+    def transcribe(start, end, prompt, cancel_event, info):
+        calls.append((start, end))
+        if len(calls) == 1:
+            raise RuntimeError("decode failed")
+        return f"{start}-{end}"
+
+    streamer = StreamingTranscriber(transcribe)
+    streamer.start(buffer)
+    streamer.thread.join(5)  # 첫 청크에서 실패하면 스레드가 멈춤
+    assert streamer.committed == 0
+    assert streamer.finish() == f"0-{len(buffer)}"
+    assert calls[-1] == (0, len(buffer))
+
+
+def test_streaming_finish_raises_decode_error():
+    buffer = make_buffer(tone(3))
+
+    def transcribe(start, end, prompt, cancel_event, info):
+        raise RuntimeError("decode failed")
+
+    streamer = StreamingTranscriber(transcribe)
+    streamer.start(buffer)
+    with pytest.raises(RuntimeError):
+        streamer.finish()
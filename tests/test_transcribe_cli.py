@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import threading
+import types
+
+import numpy as np
+
+import voice_app
+from voice_app import calibrated_settings, load_calibrated_model
+
+
+class RecordingCache:
+    def __init__(self):
+        self.calls = []
+
+    def load(self, model_size, device, compute_type, cpu_threads=0):
+        self.calls.append((model_size, device, compute_type, cpu_threads))
+        return object(), True
+
+
+def test_import_needs_no_gui_or_audio_modules():
+    code = ("import sys, voice_app; "
+            "print(sorted(m for m in ('sounddevice', 'tkinter', 'pystray', 'keyboard') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=voice_app.APP_DIR)
+    assert out.stdout.strip() == "[]"
+
+
+def test_load_applies_calibration_on_cpu():
+    config = {"calibration": {voice_app.hardware_fingerprint(): {
+        "small": {"compute_type": "int8_float32", "cpu_threads": 4}}}}
+    cache = RecordingCache()
+    load_calibrated_model(cache, config, "small", "cpu", "int8")
+    load_calibrated_model(cache, config, "base", "cpu", "int8")
+    load_calibrated_model(cache, config, "small", "cuda", "float16")
+    assert cache.calls == [("small", "cpu", "int8_float32", 4), ("base", "cpu", "int8", 0),
+                           ("small", "cuda", "float16", 0)]
+
+
+def test_stale_fingerprint_is_ignored():
+    config = {"calibration": {"other-machine": {"small": {"compute_type": "float32", "cpu_threads": 2}}}}
+    assert calibrated_settings(config, "small", "cpu", "int8") == ("int8", 0)
+
+
+def make_calibrating_app(monkeypatch, config):
+    """maybe_calibrate만 묶은 앱 - 측정은 바로 끝나고 저장은 root.after로 넘어옴"""
+    measured = []
+    saved = threading.Event()
+
+    def fake_calibrate(model_size, should_stop=None, language="ko"):
+        measured.append(model_size)
+        return {"compute_type": "int8", "cpu_threads": 2, "rtf": 0.1}
+
+    monkeypatch.setattr(voice_app, "calibrate", fake_calibrate)
+    monkeypatch.setattr(voice_app, "save_config", lambda config: None)
+    root = types.SimpleNamespace(after=lambda ms, fn, *args: (fn(*args), saved.set()))
+    app = types.SimpleNamespace(config=config, device="cpu", root=root, recording=False,
+                                engine=types.SimpleNamespace(model_size="small"),
+                                worker=types.SimpleNamespace(pending_count=lambda: 0))
+    app.maybe_calibrate = types.MethodType(voice_app.VoiceApp.maybe_calibrate, app)
+    return app, measured, saved
+
+
+def test_stale_calibration_is_remeasured_and_replaced(monkeypatch):
+    config = {"auto_calibrate": False, "calibration": {
+        "other-machine": {"small": {"compute_type": "float32", "cpu_threads": 8},
+                          "medium": {"compute_type": "float32", "cpu_threads": 8}}}}
+    app, measured, saved = make_calibrating_app(monkeypatch, config)
+    app.maybe_calibrate()
+    assert saved.wait(2)
+    assert measured == ["small"]
+    fingerprint = voice_app.hardware_fingerprint()
+    assert config["calibration"] == {
+        "other-machine": {"medium": {"compute_type": "float32", "cpu_threads": 8}},  # 아직 안 쓴 모델은 그대로
+        fingerprint: {"small": {"compute_type": "int8", "cpu_threads": 2, "rtf": 0.1}}}
+    assert calibrated_settings(config, "small", "cpu", "float32") == ("int8", 2)
+
+
+def test_no_calibration_without_opt_in_or_stale_entry(monkeypatch):
+    app, measured, saved = make_calibrating_app(monkeypatch, {"auto_calibrate": False})
+    app.maybe_calibrate()
+    assert not saved.wait(0.2)
+    assert measured == []
+
+
+class NameEngine:
+    """파일 이름(오디오 길이로 전달)에 따라 변환 - 'bad'는 실패"""
+
+    def __init__(self):
+        self.seen = []
+
+    def transcribe(self, audio, info=None):
+        self.seen.append(len(audio))
+        if len(audio) == 3:
+            raise RuntimeError("디코딩 실패")
+        return f"텍스트 {len(audio)}"
+
+
+def make_clips(tmp_path, monkeypatch, names):
+    """빈 오디오 파일들 - load_audio_file은 이름 길이만큼의 오디오를 돌려줌 (PyAV 없이)"""
+    folder = tmp_path / "clips"
+    folder.mkdir()
+    for name in names:
+        (folder / name).write_bytes(b"")
+    (folder / "notes.txt").write_text("오디오 아님")
+    monkeypatch.setattr(voice_app, "load_audio_file",
+                        lambda path: np.zeros(len(os.path.splitext(os.path.basename(path))[0]), dtype=np.float32))
+    return folder
+
+
+def test_batch_resume_skips_done_files_and_retries_failures(tmp_path, monkeypatch):
+    folder = make_clips(tmp_path, monkeypatch, ["a.wav", "bad.mp3", "cc.wav", "dddd.m4a"])
+    files = voice_app.collect_audio_files([str(folder)])
+    assert [os.path.basename(f) for f in files] == ["a.wav", "bad.mp3", "cc.wav", "dddd.m4a"]
+    output = tmp_path / "out.jsonl"
+
+    # 첫 실행은 두 파일까지 하고 중단 - 마지막 줄은 쓰다 끊김
+    ok, failed, _ = voice_app.transcribe_files(NameEngine(), files[:2], str(output))
+    assert (ok, failed) == (1, 1)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"path": "' + files[2].replace("\\", "\\\\") + '", "te')
+    done = voice_app.load_done_paths(str(output))
+    assert done == {files[0]}  # 실패/잘린 줄은 다시 변환
+
+    engine = NameEngine()
+    todo = [f for f in files if f not in done]
+    ok, failed, audio_sec = voice_app.transcribe_files(engine, todo, str(output), txt_dir=str(tmp_path / "txt"),
+                                                       workers=2)
+    assert (ok, failed) == (2, 1)
+    assert sorted(engine.seen) == [2, 3, 4]
+    assert voice_app.load_done_paths(str(output)) == {files[0], files[2], files[3]}
+    assert (tmp_path / "txt" / "cc.txt").read_text(encoding="utf-8") == "텍스트 2\n"
+    assert not (tmp_path / "txt" / "bad.txt").exists()
+
+
+def test_missing_output_means_nothing_done(tmp_path):
+    assert voice_app.load_done_paths(str(tmp_path / "none.jsonl")) == set()
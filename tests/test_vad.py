@@ -0,0 +1,111 @@
+import numpy as np
+
+from voice_app import SAMPLE_RATE, TRIM_JOIN_SEC, TRIM_PAD_SEC, VAD_FRAME, CaptureBuffer, VADPipeline
+
+
+class RecordingVAD:
+    """상태를 가진 가짜 VAD - 받은 창 묶음과 초기화 시점을 기록"""
+
+    uses_gate = True
+
+    def __init__(self):
+        self.events = []
+
+    def reset(self):
+        self.events.append("reset")
+
+    def __call__(self, frames):
+        self.events.append(len(frames))
+        return np.ones(len(frames), dtype=np.float32)
+
+
+def frames_of(levels):
+    """창별 진폭 목록 → (n, VAD_FRAME) 창 배열 (0이면 게이트로 건너뛰는 침묵)"""
+    return np.concatenate([np.full(VAD_FRAME, level, dtype=np.float32) for level in levels]).reshape(-1, VAD_FRAME)
+
+
+def make_pipeline(vad, seconds=5):
+    return VADPipeline(vad, CaptureBuffer(seconds))
+
+
+def test_gated_windows_reset_state_between_runs():
+    vad = RecordingVAD()
+    pipeline = make_pipeline(vad)
+    pipeline._process(frames_of([0.1, 0.1, 0, 0, 0.1]))
+    assert vad.events == [2, "reset", 1]
+    assert pipeline.gated == 2
+    assert list(pipeline.speech_probs()) == [1, 1, 0, 0, 1]
+
+
+def test_gap_at_batch_end_resets_before_next_batch():
+    vad = RecordingVAD()
+    pipeline = make_pipeline(vad)
+    pipeline._process(frames_of([0.1, 0]))
+    pipeline._process(frames_of([0.1]))
+    pipeline._process(frames_of([0.1]))
+    assert vad.events == [1, "reset", 1, 1]
+
+
+def test_ungated_backend_sees_every_window():
+    vad = RecordingVAD()
+    vad.uses_gate = False
+    pipeline = make_pipeline(vad)
+    pipeline._process(frames_of([0.1, 0, 0.1]))
+    assert vad.events == [3]
+    assert pipeline.gated == 0
+
+
+def speech_pipeline(speech):
+    """창별 음성 여부(bool 목록)로 확률을 채운 파이프라인 - 버퍼에는 창 번호를 값으로 기록"""
+    buffer = CaptureBuffer(len(speech) * VAD_FRAME / SAMPLE_RATE)
+    buffer.write(np.repeat(np.arange(len(speech), dtype=np.float32), VAD_FRAME))
+    pipeline = VADPipeline(RecordingVAD(), buffer)
+    pipeline.probs[:len(speech)] = np.where(speech, 1.0, 0.0)
+    pipeline.n_frames = len(speech)
+    return pipeline
+
+
+def windows(sec):
+    return int(sec * SAMPLE_RATE) // VAD_FRAME
+
+
+def test_speech_regions_pads_and_merges_short_gaps():
+    n = windows(1)
+    speech = [True] * n + [False] * windows(0.5) + [True] * n + [False] * windows(3) + [True] * n
+    pipeline = speech_pipeline(speech)
+    end = len(speech) * VAD_FRAME
+    regions = pipeline.speech_regions(0, end)
+    assert len(regions) == 2  # 0.5초 쉼은 병합, 3초 침묵은 자름
+    pad = int(TRIM_PAD_SEC * SAMPLE_RATE)
+    assert regions[0][0] == 0
+    assert regions[0][1] == (2 * n + windows(0.5)) * VAD_FRAME + pad
+    assert regions[1] == ((2 * n + windows(0.5) + windows(3)) * VAD_FRAME - pad, end)
+
+
+def test_speech_regions_treats_unprocessed_tail_as_speech():
+    pipeline = speech_pipeline([False] * windows(2))
+    end = len(pipeline.buffer)
+    pipeline.n_frames = windows(1)
+    assert pipeline.speech_regions(0, end) == [(windows(1) * VAD_FRAME - int(TRIM_PAD_SEC * SAMPLE_RATE), end)]
+
+
+def test_trim_joins_regions_with_silence():
+    n = windows(1)
+    speech = [True] * n + [False] * windows(3) + [True] * n
+    pipeline = speech_pipeline(speech)
+    end = len(speech) * VAD_FRAME
+    (s0, e0), (s1, e1) = pipeline.speech_regions(0, end)
+    audio = pipeline.trim(0, end)
+    join = int(TRIM_JOIN_SEC * SAMPLE_RATE)
+    assert len(audio) == (e0 - s0) + join + (e1 - s1)
+    np.testing.assert_array_equal(audio[:e0 - s0], pipeline.buffer.view(s0, e0))
+    assert not audio[e0 - s0:e0 - s0 + join].any()
+    np.testing.assert_array_equal(audio[e0 - s0 + join:], pipeline.buffer.view(s1, e1))
+    assert pipeline.trimmed == end - len(audio)
+
+
+def test_trim_keeps_everything_without_speech():
+    pipeline = speech_pipeline([False] * windows(2))
+    end = len(pipeline.buffer)
+    assert len(pipeline.trim(0, end)) == end
+    assert pipeline.trimmed == 0
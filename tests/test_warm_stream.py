@@ -0,0 +1,68 @@
+import time
+import types
+
+import numpy as np
+
+from voice_app import SAMPLE_RATE, CallbackMonitor, CaptureBuffer, PreRollBuffer, VoiceApp
+
+
+def ramp(start, n):
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_preroll_keeps_latest_audio_in_order():
+    preroll = PreRollBuffer(0.01)  # 160샘플
+    size = len(preroll.data)
+    for i in range(0, 1000, 70):  # 여러 번 감아 돔
+        preroll.write(ramp(i, 70))
+    capture = CaptureBuffer(1)
+    preroll.drain_into(capture)
+    np.testing.assert_array_equal(capture.view(), ramp(1050 - size, size))
+    preroll.drain_into(capture)  # 비운 뒤에는 아무것도 쓰지 않음
+    assert len(capture) == size
+
+
+def test_preroll_block_larger_than_buffer():
+    preroll = PreRollBuffer(0.01)
+    size = len(preroll.data)
+    preroll.write(ramp(0, size * 2 + 5))
+    capture = CaptureBuffer(1)
+    preroll.drain_into(capture)
+    np.testing.assert_array_equal(capture.view(), ramp(size + 5, size))
+
+
+def make_warm_app():
+    """열어 둔 스트림의 콜백만 묶은 앱 (녹음 전 상태)"""
+    monitor = CallbackMonitor()
+    monitor.reset(SAMPLE_RATE)
+    app = types.SimpleNamespace(recording=False, capture=None, raw_ring=None, preroll=PreRollBuffer(0.05),
+                                preroll_pending=False, first_audio_time=None, current_volume=0, monitor=monitor)
+    app.audio_callback = types.MethodType(VoiceApp.audio_callback, app)
+    return app
+
+
+def feed(app, block):
+    app.audio_callback(block.reshape(-1, 1), len(block), None, None)
+
+
+def test_hotkey_includes_preroll_and_stamps_first_audio():
+    app = make_warm_app()
+    feed(app, ramp(0, 400))  # 녹음 전 - 프리롤에만
+    feed(app, ramp(400, 400))
+    assert app.capture is None and app.first_audio_time is None
+
+    trigger = time.perf_counter()  # 핫키
+    app.capture = CaptureBuffer(1)  # start_recording 순서대로
+    app.first_audio_time = None
+    app.preroll_pending = True
+    app.recording = True
+    feed(app, ramp(800, 400))
+    first = app.first_audio_time
+    feed(app, ramp(1200, 400))
+
+    preroll = len(app.preroll.data)
+    np.testing.assert_array_equal(app.capture.view(), ramp(800 - preroll, preroll + 800))
+    assert first is not None and first >= trigger
+    assert app.first_audio_time == first  # 첫 블록 시각만 기록 (hotkey_to_audio_sec)
+    assert not app.preroll_pending
+    assert app.monitor.callbacks == 4
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from voice_app import TranscriptionCancelled, TranscriptionWorker
+
+
+def collecting_worker(threads=1):
+    """완료 순서대로 작업을 모으는 워커 + n개가 모일 때까지 기다리는 함수"""
+    done = []
+    cond = threading.Condition()
+
+    def on_done(job):
+        with cond:
+            done.append(job)
+            cond.notify_all()
+
+    def wait_for(n):
+        with cond:
+            return cond.wait_for(lambda: len(done) >= n, timeout=2)
+    return TranscriptionWorker(on_done, threads=threads), done, wait_for
+
+
+def test_results_arrive_in_submit_order():
+    worker, done, wait_for = collecting_worker(threads=2)
+    slow_started, release = threading.Event(), threading.Event()
+
+    def slow(job):
+        slow_started.set()
+        release.wait(2)
+        return "첫 녹음"
+
+    first = worker.submit(slow)
+    assert slow_started.wait(2)
+    second = worker.submit(lambda job: "두 번째 녹음")  # 다른 스레드에서 먼저 끝남
+    deadline = time.monotonic() + 2
+    while not second.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert second.finished and done == []  # 앞 작업이 끝날 때까지 전달하지 않음
+    release.set()
+    assert wait_for(2)
+    assert [job.result for job in done] == ["첫 녹음", "두 번째 녹음"]
+    assert [job.id for job in done] == [first.id, second.id]
+    assert worker.pending_count() == 0
+    worker.stop()
+
+
+def test_cancel_skips_queued_jobs_and_stops_running_one():
+    worker, done, wait_for = collecting_worker()
+    started = threading.Event()
+    ran = []
+
+    def running(job):
+        started.set()
+        job.cancel_event.wait(2)
+        raise TranscriptionCancelled()
+
+    worker.submit(running)
+    worker.submit(lambda job: ran.append(1) or "대기 중")
+    assert started.wait(2)
+    worker.cancel_all()  # 다음 녹음을 시작하며 이전 변환 취소
+    assert wait_for(2)
+    assert all(job.cancelled and job.result is None and job.error is None for job in done)
+    assert ran == []
+    worker.stop()
+
+
+def test_error_is_delivered_and_queue_keeps_going():
+    worker, done, wait_for = collecting_worker()
+
+    def fail(job):
+        raise RuntimeError("디코딩 실패")
+
+    worker.submit(fail)
+    worker.submit(lambda job: "다음 녹음")
+    assert wait_for(2)
+    assert str(done[0].error) == "디코딩 실패"
+    assert done[1].result == "다음 녹음" and done[1].error is None
+    worker.stop()
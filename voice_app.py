@@ -3,25 +3,55 @@
 Ctrl+Win 누르면 녹음 시작, 다시 누르면 중지 후 클립보드에 복사
 """
 
+import time
+PROCESS_START = time.perf_counter()  # 시작 시간 측정 기준 (모듈 import 포함)
+
 import threading
+import gc
+import multiprocessing
+import weakref
 import numpy as np
-import sounddevice as sd
 from scipy.io.wavfile import write as write_wav
-from faster_whisper import WhisperModel
 import tempfile
 import os
 import sys
 import json
+import queue
+import sqlite3
+import collections
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import difflib
+import bisect
 import pyperclip
-import keyboard
-import tkinter as tk
-from tkinter import ttk, messagebox
-import pystray
-from PIL import Image, ImageDraw, ImageTk
+from PIL import Image, ImageDraw
 import socket
+import struct
+import io
+
+def load_gui_modules():
+    """창/트레이/단축키/마이크 모듈 import - 앱을 띄울 때만 (transcribe/bench 명령과 테스트는 PortAudio/디스플레이 없이 동작)"""
+    global sd, keyboard, tk, ttk, messagebox, pystray, ImageTk
+    import sounddevice as sd
+    import keyboard
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    import pystray
+    from PIL import ImageTk
 
 # 설정 파일 경로
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(APP_DIR, "config.json")
+DEBUG_AUDIO_DIR = os.path.join(APP_DIR, "debug_audio")  # debug_dump_wav 저장 위치
+STARTUP_LOG_FILE = os.path.join(APP_DIR, "startup_log.jsonl")  # 시작 단계별 소요 시간
+BENCH_RESULTS_DIR = os.path.join(APP_DIR, "bench_results")  # bench e2e 결과 JSON
+METRICS_FILE = os.path.join(APP_DIR, "metrics.jsonl")  # 녹음별 단계 소요 시간
+METRICS_MAX_BYTES = 1024 * 1024  # 넘으면 metrics.jsonl.1, .2 ...로 밀어냄
+METRICS_BACKUPS = 3
+HISTORY_DB = os.path.join(APP_DIR, "history.db")  # 변환 히스토리 (SQLite, 개수 제한 없음)
+HISTORY_PAGE = 100  # 히스토리 창에서 한 번에 불러오는 개수
+ARCHIVE_DIR = os.path.join(APP_DIR, "audio_archive")  # 녹음 보관 (archive_audio 설정 시)
+CONFIG_SAVE_DELAY_MS = 5000  # 측정값(RTF 등) 변경 후 config.json 저장까지 모으는 시간
 
 # 기본 설정
 DEFAULT_CONFIG = {
@@ -30,7 +60,29 @@ DEFAULT_CONFIG = {
     "max_record_sec": 60,
     "vad_enabled": True,
     "vad_silence_sec": 15,  # 침묵 후 자동 종료 (초)
-    "history": []
+    "vad_backend": "silero_onnx",  # silero_onnx (torch 불필요) / energy (모델 없음) / silero (torch)
+    "vad_onnx_path": "",  # 비우면 faster-whisper 내장 silero 모델 사용
+    "streaming_transcribe": True,  # 녹음 중 완성된 구간 미리 변환
+    "debug_dump_wav": False,  # 변환할 오디오를 WAV로 남김 (디버그용)
+    "capture_int16": False,  # 녹음 버퍼를 int16으로 저장 (메모리 절반)
+    "model_cache_mb": 4000,  # 전환용으로 메모리에 유지할 모델 총량 (MB)
+    "decode_profile": "auto",  # auto / fastest / balanced / accurate
+    "target_latency_sec": 3.0,  # auto: 청크 하나 디코딩 목표 시간 (초)
+    "archive_audio": False,  # 녹음을 보관해 히스토리에서 다시 변환 가능
+    "archive_budget_mb": 500,  # 보관 용량 상한 - 넘으면 오래된 녹음부터 삭제
+    "two_pass": False,  # 작은 모델로 초안 → model_size 모델로 다시 변환해 교체
+    "draft_model": "tiny",  # two_pass 초안 모델
+    "refine_clipboard": True,  # 다시 변환한 결과로 클립보드도 교체 (초안이 그대로 있을 때만)
+    "warm_stream": False,  # 마이크 입력을 계속 열어 두고 녹음 여부만 전환 (시작 지연 제거)
+    "preroll_sec": 0.3,  # warm_stream: 핫키 직전 오디오를 이만큼 녹음 앞에 붙임
+    "decode_workers": 0,  # 긴 오디오를 동시에 디코딩할 청크 수 (0 = CPU 코어 수로 자동)
+    "parallel_min_sec": 60,  # 이보다 긴 오디오만 침묵 지점에서 나눠 병렬 디코딩
+    "auto_calibrate": False,  # True면 CPU에서 처음 쓰는 모델/하드웨어일 때 백그라운드로 스레드 수/연산 타입 측정
+    "native_rate_capture": False,  # 장치 기본 샘플레이트로 열고 앱에서 16kHz로 변환 (USB/블루투스 헤드셋)
+    "idle_unload_min": 0,  # 이 시간(분) 동안 쓰지 않으면 모델을 메모리에서 내림 (0 = 계속 유지)
+    "inference_process": False,  # 모델을 별도 프로세스에서 실행 (앱/오디오 콜백과 GIL을 나눠 쓰지 않음)
+    "batch_decode": False,  # 동시에 대기 중인 클립을 묶어 한 번에 디코딩 (연달아 받아쓰기)
+    "batch_max_wait_ms": 50,  # 같이 묶을 클립을 기다리는 최대 시간
 }
 
 def load_config():
@@ -55,6 +107,14 @@ def save_config(config):
 
 LOCK_PORT = 47777
 
+# 로컬 변환 서비스 (LOCK_PORT 소켓) - 프레임: b"TNV" + 버전(1바이트) + 헤더 길이(4바이트) + JSON 헤더 + 오디오
+SERVICE_MAGIC = b"TNV"
+SERVICE_VERSION = 1
+SERVICE_QUEUE_MAX = 4        # 대기 가능한 요청 수 - 넘으면 busy 응답 (백프레셔)
+SERVICE_MAX_CLIENTS = 8      # 동시 연결 수
+SERVICE_MAX_AUDIO_SEC = 600  # 요청 하나의 최대 오디오 길이
+SERVICE_FORMATS = ("pcm_s16le", "pcm_f32le", "wav")
+
 def check_already_running():
     """이미 실행 중인지 확인 (포트 바인딩 방식)"""
     try:
@@ -64,6 +124,23 @@ def check_already_running():
     except socket.error:
         return None
 
+def query_existing_instance(command, timeout=2.0):
+    """실행 중인 인스턴스에 명령을 보내고 응답을 받음 (없으면 None)"""
+    try:
+        client = socket.create_connection(('127.0.0.1', LOCK_PORT), timeout=timeout)
+        client.sendall(command)
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            data = client.recv(4096)
+            if not data:
+                break
+            chunks.append(data)
+        client.close()
+        return b"".join(chunks)
+    except OSError:
+        return None
+
 def signal_existing_instance():
     """이미 실행 중인 인스턴스에 창 열기 신호 보내기"""
     try:
@@ -78,6 +155,69 @@ def signal_existing_instance():
 SAMPLE_RATE = 16000
 MAX_RECORD_SEC = 60  # 최대 녹음 시간 (초)
 
+# 스트리밍 변환 설정 (녹음 중 침묵 지점에서 청크 분할)
+STREAM_MIN_CHUNK_SEC = 8    # 이보다 짧은 구간은 분할하지 않음
+STREAM_MAX_CHUNK_SEC = 25   # Whisper 30초 창을 넘기 전에 강제 분할
+STREAM_SILENCE_SEC = 0.4    # 분할 기준 침묵 길이
+STREAM_POLL_SEC = 0.5       # 새 오디오 확인 주기
+
+# VAD 설정
+VAD_FRAME = 512             # silero 16kHz 고정 창 크기 (32ms)
+VAD_THRESHOLD = 0.5         # 음성 판정 확률
+VAD_ENERGY_GATE = 0.003     # 이 RMS 미만 창은 신경망 추론 없이 침묵 처리
+VAD_POLL_SEC = 0.03         # 새 창 확인 주기
+VAD_BACKENDS = ["silero_onnx", "energy", "silero"]
+TRIM_PAD_SEC = 0.2          # 잘라낼 때 음성 구간 앞뒤로 남길 여유
+TRIM_MIN_GAP_SEC = 1.0      # 이보다 짧은 침묵은 자르지 않음 (문장 사이 쉼)
+TRIM_JOIN_SEC = 0.5         # 잘라낸 자리에 남기는 침묵 (앞뒤 발화가 한 문장으로 붙지 않도록, TRIM_MIN_GAP_SEC보다 짧게)
+
+# 장치 기본 샘플레이트 녹음 (native_rate_capture)
+RESAMPLE_HALF_LEN = 10      # 필터 길이 = 2 × 10 × max(up, down) + 1 (scipy resample_poly와 같은 설계)
+RESAMPLE_RING_SEC = 2.0     # 콜백 → 변환 스레드 사이 원본 오디오 링 버퍼 길이
+RESAMPLE_POLL_SEC = 0.02    # 변환 스레드가 새 오디오를 확인하는 주기
+
+# CPU 보정 (calibrate) - 짧은 클립으로 연산 타입 × 스레드 수 조합을 측정
+CALIBRATION_COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+CALIBRATION_SEC = 10          # 측정용 클립 길이
+CALIBRATION_MAX_TOKENS = 48   # 디코딩 길이를 고정해 클립 내용과 상관없이 비교
+
+# 긴 오디오 병렬 디코딩
+PARALLEL_OVERLAP_SEC = 0.3  # 청크 경계 앞뒤로 겹쳐 넣는 길이 (경계 단어 잘림 방지)
+PARALLEL_DEDUP_WORDS = 6    # 겹친 부분에서 중복 제거할 최대 단어 수
+
+# 오디오 콜백 상태 감시
+CALLBACK_LOAD_BINS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5)  # 콜백 실행 시간 / 블록 길이 구간 경계
+CALLBACK_WARN_LOAD = 0.5    # 블록 길이의 이 비율을 넘는 콜백이 있으면 경고 (1.0 넘으면 이미 늦음)
+
+# 유휴 모델 해제
+IDLE_CHECK_SEC = 30  # 유휴 시간 확인 주기
+
+# 별도 추론 프로세스 (inference_process 설정)
+INFERENCE_LOAD_TIMEOUT_SEC = 600  # 모델 로드(첫 다운로드 포함) 대기 한도
+INFERENCE_STALL_SEC = 120         # 세그먼트 사이 응답이 이보다 없으면 멈춘 것으로 보고 재시작
+INFERENCE_SHM_MIN_BYTES = 1 << 20  # 공유 메모리 최소 크기 (짧은 녹음마다 새로 만들지 않도록)
+
+# 배치 디코딩 (batch_decode 설정)
+BATCH_MAX_SIZE = 8          # 한 배치의 최대 클립 수
+BATCH_MAX_CLIP_SEC = 30     # Whisper 창 하나 - 이보다 긴 클립은 배치 없이 바로 디코딩
+BATCH_LENGTH_RATIO = 2.0    # 같이 묶는 클립끼리 길이 차이 한도 (긴 것 / 짧은 것)
+
+# 모델 크기별 대략적인 메모리 사용량 (MB) - 모델 캐시 예산 계산용
+MODEL_MEMORY_MB = {"tiny": 150, "base": 250, "small": 600, "medium": 1600, "large-v3": 3200}
+
+# 디코딩 프로필 (model.transcribe 옵션)
+DECODE_PROFILES = {
+    # 그리디, 온도 폴백 없음
+    "fastest": {"beam_size": 1, "best_of": 1, "temperature": 0.0},
+    "balanced": {"beam_size": 2, "best_of": 2, "temperature": [0.0, 0.4, 0.8]},
+    # faster-whisper 기본값 (이전 beam_size=5 동작)
+    "accurate": {"beam_size": 5, "best_of": 5, "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]},
+}
+PROFILE_ORDER = ["accurate", "balanced", "fastest"]  # auto 선택 시 정확한 것부터 시도
+# 측정값이 없을 때 쓰는 RTF (디코딩 시간 / 오디오 길이) 추정치 - small, CPU int8 기준
+DEFAULT_RTF = {"fastest": 0.1, "balanced": 0.18, "accurate": 0.3}
+MODEL_RTF_SCALE = {"tiny": 0.25, "base": 0.5, "small": 1.0, "medium": 2.5, "large-v3": 5.0}
+
 # 플랫폼별 단축키 설정
 if sys.platform == "darwin":  # Mac
     HOTKEY = "ctrl+cmd"
@@ -202,26 +342,2203 @@ def create_icon_image(color="gray"):
     draw.rectangle([48, 16, 52, 48], fill=fill_color)
     draw.rectangle([56, 24, 60, 40], fill=fill_color)
 
-    return image
+    return image
+
+def find_silence_split(audio, min_sec=STREAM_MIN_CHUNK_SEC, max_sec=STREAM_MAX_CHUNK_SEC,
+                       silence_sec=STREAM_SILENCE_SEC):
+    """청크 분할 위치 찾기 - 침묵 구간 가운데 샘플 인덱스 반환 (분할 불가 시 None)"""
+    frame = int(SAMPLE_RATE * 0.03)  # 30ms 프레임
+    n_frames = len(audio) // frame
+    min_frame = int(min_sec * SAMPLE_RATE) // frame
+    max_frame = min(int(max_sec * SAMPLE_RATE) // frame, n_frames)
+    if n_frames <= min_frame:
+        return None
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    # 배경 소음 기준 상대 임계값
+    threshold = np.clip(np.percentile(rms, 10) * 2.5, 0.005, 0.03)
+    silent = np.concatenate(([0], (rms < threshold).astype(np.int8), [0]))
+    edges = np.diff(silent)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # 최소 길이 이후, 최대 길이 이전의 충분히 긴 침묵 중 가장 늦은 것
+    min_run = max(int(silence_sec * SAMPLE_RATE) // frame, 1)
+    centers = (starts + ends) // 2
+    ok = ((ends - starts) >= min_run) & (centers >= min_frame) & (centers < max_frame)
+    if ok.any():
+        return int(centers[ok][-1]) * frame
+
+    # 최대 길이를 넘었는데 침묵이 없으면 가장 조용한 프레임에서 자름
+    if n_frames >= max_frame and max_frame > min_frame:
+        return int(min_frame + np.argmin(rms[min_frame:max_frame])) * frame
+    return None
+
+def split_at_silence(audio, min_sec=STREAM_MIN_CHUNK_SEC, max_sec=STREAM_MAX_CHUNK_SEC):
+    """긴 오디오를 침묵 지점에서 [start, end) 청크 목록으로 나눔 (각 청크는 max_sec 이하)"""
+    chunks = []
+    pos = 0
+    max_len = int(max_sec * SAMPLE_RATE)
+    while len(audio) - pos > max_len:
+        split = find_silence_split(audio[pos:pos + max_len], min_sec, max_sec)
+        if split is None:
+            split = max_len
+        chunks.append((pos, pos + split))
+        pos += split
+    if pos < len(audio):
+        chunks.append((pos, len(audio)))
+    return chunks
+
+def merge_overlap(prev_words, words, max_words=PARALLEL_DEDUP_WORDS):
+    """앞 청크 끝과 겹친 단어를 뒤 청크 앞에서 제거 - 가장 긴 일치부터"""
+    for k in range(min(max_words, len(prev_words), len(words)), 0, -1):
+        if prev_words[-k:] == words[:k]:
+            return words[k:]
+    return words
+
+def decode_workers(config):
+    """병렬 디코딩 수 - 자동이면 코어 4개당 1개 (최대 4)"""
+    workers = config.get("decode_workers", 0)
+    if workers <= 0:
+        workers = min(4, max(1, (os.cpu_count() or 1) // 4))
+    return workers
+
+def dump_debug_wav(audio):
+    """디버그용 WAV 저장 (debug_dump_wav 설정 시에만)"""
+    try:
+        os.makedirs(DEBUG_AUDIO_DIR, exist_ok=True)
+        path = os.path.join(DEBUG_AUDIO_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{len(audio)}.wav")
+        write_wav(path, SAMPLE_RATE, (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16))
+        print(f"[Voice App] 디버그 오디오 저장: {path}")
+    except Exception as e:
+        print(f"[Voice App] 디버그 오디오 저장 실패: {e}")
+
+def load_audio_file(path):
+    """오디오 파일 로드 - 어떤 형식이든 16kHz 모노 float32로 (faster-whisper 내장 PyAV 사용)"""
+    from faster_whisper.audio import decode_audio
+    return decode_audio(path, sampling_rate=SAMPLE_RATE)
+
+def make_synthetic_audio(seconds, seed=0):
+    """합성 오디오 (발화/휴지가 반복되는 톤 + 잡음, 항상 같은 결과) - warm-up/벤치마크용"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 0.3 * t) > -0.3).astype(np.float32)  # 말하기/쉬기 반복
+    voice = 0.2 * np.sin(2 * np.pi * 180 * t) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t))
+    audio = voice * envelope + rng.normal(0, 0.003, n)
+    return audio.astype(np.float32)
+
+def choose_decode_profile(config, model_size, duration):
+    """디코딩 프로필 선택 - auto면 목표 지연 안에 끝날 것으로 보이는 가장 정확한 프로필"""
+    profile = config.get("decode_profile", "auto")
+    if profile in DECODE_PROFILES:
+        return profile
+    target = config.get("target_latency_sec", 3.0)
+    measured = config.get("rtf_stats", {}).get(model_size, {})
+    for name in PROFILE_ORDER:
+        rtf = measured.get(name, DEFAULT_RTF[name] * MODEL_RTF_SCALE.get(model_size, 1.0))
+        if duration * rtf <= target:
+            return name
+    return PROFILE_ORDER[-1]
+
+def record_rtf(config, model_size, profile, audio_sec, decode_sec):
+    """측정한 RTF를 모델/프로필별 지수 이동 평균으로 기록 (config의 rtf_stats)"""
+    if audio_sec < 1.0:
+        return  # 너무 짧은 오디오는 고정 비용 때문에 RTF가 부정확
+    rtf = decode_sec / audio_sec
+    stats = config.setdefault("rtf_stats", {}).setdefault(model_size, {})
+    old = stats.get(profile)
+    stats[profile] = round(rtf if old is None else old * 0.7 + rtf * 0.3, 4)
+
+def hardware_fingerprint():
+    """보정 결과를 구분하는 하드웨어 식별값 - CPU 모델/코어 수/OS/CTranslate2 버전이 바뀌면 달라짐"""
+    import platform
+    import hashlib
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:  # 리눅스는 processor()가 비어 있음
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    try:
+        import ctranslate2
+        ct2_version = ctranslate2.__version__
+    except ImportError:
+        ct2_version = "?"
+    parts = [platform.system(), platform.machine(), cpu, str(os.cpu_count()), ct2_version]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+def get_calibration(config, model_size):
+    """이 하드웨어에서 model_size로 측정한 보정 결과 (없으면 None)"""
+    return config.get("calibration", {}).get(hardware_fingerprint(), {}).get(model_size)
+
+def stale_calibration(config, model_size):
+    """다른 하드웨어 식별값에서 model_size를 보정한 적이 있는지 (CPU/CTranslate2가 바뀌어 더는 맞지 않는 결과)"""
+    fingerprint = hardware_fingerprint()
+    return any(model_size in results for key, results in config.get("calibration", {}).items()
+               if key != fingerprint)
+
+def calibrated_settings(config, model_size, device, compute_type):
+    """보정 결과가 있으면 (연산 타입, 스레드 수), 없으면 (기본 연산 타입, 0 = CTranslate2 기본값)"""
+    if device != "cpu":
+        return compute_type, 0
+    result = get_calibration(config, model_size)
+    if not result:
+        return compute_type, 0
+    return result["compute_type"], result["cpu_threads"]
+
+def load_calibrated_model(cache, config, model_size, device, compute_type):
+    """모델 캐시에서 로드 - CPU면 이 하드웨어에서 측정한 연산 타입/스레드 수 사용 (앱과 일괄 변환 공용)
+
+    반환값: (모델, 새로 로드했는지)
+    """
+    compute_type, cpu_threads = calibrated_settings(config, model_size, device, compute_type)
+    return cache.load(model_size, device, compute_type, cpu_threads)
+
+def save_calibration(config, model_size, result):
+    """보정 결과를 하드웨어 식별값 + 모델별로 저장 (설정을 소유한 스레드에서 호출)
+
+    다른 식별값에 남아 있던 같은 모델의 결과는 지움 (빈 식별값도).
+    """
+    fingerprint = hardware_fingerprint()
+    calibration = config.setdefault("calibration", {})
+    for key in list(calibration):
+        if key != fingerprint:
+            calibration[key].pop(model_size, None)
+            if not calibration[key]:
+                del calibration[key]
+    calibration.setdefault(fingerprint, {})[model_size] = result
+    save_config(config)
+
+def calibrate(model_size, audio=None, should_stop=None, language="ko"):
+    """CPU 연산 타입 × 스레드 수 측정 - 가장 빠른 조합 반환 (should_stop()이 참이 되면 None)
+
+    모든 조합을 다 재면 모델을 수십 번 로드해야 하므로, 전체 코어로 연산 타입을 먼저 고르고
+    그 타입으로 스레드 수를 줄여 가며 잰다. 디코딩은 토큰 수를 고정해 내용의 영향을 줄인다.
+    """
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    cores = os.cpu_count() or 1
+    supported = ctranslate2.get_supported_compute_types("cpu")
+    compute_types = [t for t in CALIBRATION_COMPUTE_TYPES if t in supported]
+    thread_counts = sorted({t for t in (1, 2, 4, 8, 16, cores // 2) if 1 <= t < cores}, reverse=True)
+    if audio is None:
+        audio = make_synthetic_audio(CALIBRATION_SEC)
+    duration = len(audio) / SAMPLE_RATE
+
+    def trial(compute_type, threads):
+        model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=threads)
+        times = []
+        for _ in range(3):  # 첫 번째는 warm-up
+            start = time.perf_counter()
+            segments, _ = model.transcribe(audio, language=language, beam_size=1, temperature=0.0,
+                                           condition_on_previous_text=False, without_timestamps=True,
+                                           max_new_tokens=CALIBRATION_MAX_TOKENS)
+            for _ in segments:
+                pass
+            times.append(time.perf_counter() - start)
+        best = min(times[1:])
+        del model
+        print(f"[Calibrate] {model_size} {compute_type:<13} threads={threads:<3} {best:6.2f}s (RTF {best / duration:.3f})")
+        return {"compute_type": compute_type, "cpu_threads": threads, "sec": round(best, 3)}
+
+    trials = []
+    for compute_type in compute_types:
+        if should_stop and should_stop():
+            return None
+        trials.append(trial(compute_type, cores))
+    best_type = min(trials, key=lambda t: t["sec"])["compute_type"]
+    for threads in thread_counts:
+        if should_stop and should_stop():
+            return None
+        trials.append(trial(best_type, threads))
+        if trials[-1]["sec"] > min(t["sec"] for t in trials) * 1.5:
+            break  # 스레드를 더 줄이면 느려지기만 함
+
+    best = min(trials, key=lambda t: t["sec"])
+    return {"compute_type": best["compute_type"], "cpu_threads": best["cpu_threads"],
+            "rtf": round(best["sec"] / duration, 4), "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "trials": [[t["compute_type"], t["cpu_threads"], t["sec"]] for t in trials]}
+
+def is_model_downloaded(model_size):
+    """모델이 이미 다운로드되어 있는지 확인"""
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "huggingface", "hub")
+    if not os.path.exists(cache_dir):
+        return False
+    # faster-whisper 모델 캐시 확인
+    for item in os.listdir(cache_dir):
+        if f"whisper-{model_size}" in item.lower():
+            return True
+    return False
+
+class HistoryStore:
+    """변환 히스토리 저장소 - SQLite 추가 전용 테이블 + FTS5 전문 검색
+
+    config.json에서 분리해 개수 제한 없이 쌓고, 창에서는 페이지 단위로만 읽는다.
+    FTS5가 없는 SQLite면 LIKE 검색으로 대체한다.
+    """
+
+    COLUMNS = ("id", "time", "text", "duration", "model", "latency_sec", "info")
+
+    def __init__(self, path=HISTORY_DB):
+        self.lock = threading.Lock()  # 워커/서비스 스레드와 UI 스레드가 같이 사용
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            time TEXT NOT NULL,
+            text TEXT NOT NULL,
+            duration REAL,
+            model TEXT,
+            latency_sec REAL,
+            info TEXT)""")
+        self.fts = self._create_fts()
+        self.db.commit()
+
+    def _create_fts(self):
+        """전문 검색 색인 - 한국어는 조사가 붙으므로 부분 문자열 검색이 되는 trigram 우선"""
+        for tokenize in ("trigram", "unicode61"):
+            try:
+                self.db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                                f"text, content='history', content_rowid='id', tokenize='{tokenize}')")
+                return tokenize
+            except sqlite3.OperationalError:
+                continue
+        return None
+
+    def add(self, text, **info):
+        """항목 추가 - 반환값: id"""
+        entry_time = info.pop("time", None) or time.strftime("%Y-%m-%d %H:%M:%S")
+        row = (entry_time, text, info.get("duration"), info.get("model"), info.get("latency_sec"),
+               json.dumps(info, ensure_ascii=False))
+        with self.lock:
+            cur = self.db.execute("INSERT INTO history (time, text, duration, model, latency_sec, info) "
+                                  "VALUES (?, ?, ?, ?, ?, ?)", row)
+            if self.fts:
+                self.db.execute("INSERT INTO history_fts (rowid, text) VALUES (?, ?)", (cur.lastrowid, text))
+            self.db.commit()
+            return cur.lastrowid
+
+    def _where(self, query):
+        """검색 조건 - trigram은 3글자 이상부터 색인 사용, 그보다 짧으면 LIKE"""
+        if not query:
+            return "", ()
+        if self.fts and (self.fts != "trigram" or len(query) >= 3):
+            phrase = '"' + query.replace('"', '""') + '"'
+            return "WHERE id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)", (phrase,)
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "WHERE text LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+
+    def page(self, offset=0, limit=HISTORY_PAGE, query=None):
+        """최신순으로 [offset, offset+limit) 항목 - dict 목록"""
+        where, params = self._where(query)
+        with self.lock:
+            rows = self.db.execute(f"SELECT {', '.join(self.COLUMNS)} FROM history {where} "
+                                   "ORDER BY id DESC LIMIT ? OFFSET ?", params + (limit, offset)).fetchall()
+        entries = []
+        for row in rows:
+            entry = json.loads(row[-1] or "{}")
+            entry.update(zip(self.COLUMNS[:-1], row[:-1]))
+            entries.append(entry)
+        return entries
+
+    def count(self, query=None):
+        where, params = self._where(query)
+        with self.lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+
+    def update(self, entry_id, text, **info):
+        """항목의 텍스트 교체 + info 병합 (2단계 변환 결과 반영)"""
+        with self.lock:
+            row = self.db.execute("SELECT text, info FROM history WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return False
+            merged = json.loads(row[1] or "{}")
+            merged.update(info)
+            self.db.execute("UPDATE history SET text = ?, model = COALESCE(?, model), info = ? WHERE id = ?",
+                            (text, info.get("model"), json.dumps(merged, ensure_ascii=False), entry_id))
+            if self.fts:
+                # content 테이블 방식이라 색인은 이전 텍스트로 지우고 다시 넣음
+                self.db.execute("INSERT INTO history_fts (history_fts, rowid, text) VALUES ('delete', ?, ?)",
+                                (entry_id, row[0]))
+                self.db.execute("INSERT INTO history_fts (rowid, text) VALUES (?, ?)", (entry_id, text))
+            self.db.commit()
+            return True
+
+    def get_text(self, entry_id):
+        with self.lock:
+            row = self.db.execute("SELECT text FROM history WHERE id = ?", (entry_id,)).fetchone()
+        return row[0] if row else None
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM history")
+            if self.fts:
+                self.db.execute("INSERT INTO history_fts (history_fts) VALUES ('delete-all')")
+            self.db.commit()
+
+    def migrate_from_config(self, config):
+        """예전 config.json의 history 목록을 옮기고 config에서 제거 (한 번만)"""
+        history = config.pop("history", None)
+        if history is None:
+            return 0
+        for item in history:
+            if isinstance(item, str):
+                item = {"text": item}  # 예전 형식은 문자열
+            item = dict(item)
+            text = item.pop("text", "")
+            if text:
+                self.add(text, **item)
+        save_config(config)
+        print(f"[Voice App] 히스토리 {len(history)}개를 {os.path.basename(HISTORY_DB)}로 옮김")
+        return len(history)
+
+class AudioArchive:
+    """녹음 보관소 - 녹음마다 int16 .npy 파일 하나 (float32의 절반, np.load로 메모리 매핑 가능)
+
+    용량 상한(budget_mb)을 넘으면 오래된 파일부터 지운다. 히스토리에는 파일 이름만 남긴다.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, budget_mb=500):
+        self.directory = directory
+        self.budget_mb = budget_mb
+        self.lock = threading.Lock()
+
+    def save(self, audio):
+        """float32 오디오 저장 - 반환값: 파일 이름 (히스토리 info["audio_file"])"""
+        os.makedirs(self.directory, exist_ok=True)
+        name = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}.npy"
+        pcm = np.empty(len(audio), dtype=np.int16)
+        np.multiply(np.clip(audio, -1.0, 32767 / 32768), 32768, out=pcm, casting="unsafe")
+        with self.lock:
+            np.save(os.path.join(self.directory, name), pcm)
+            self._enforce_budget()
+        return name
+
+    def path(self, name):
+        return os.path.join(self.directory, os.path.basename(name))
+
+    def exists(self, name):
+        return bool(name) and os.path.exists(self.path(name))
+
+    def load(self, name):
+        """보관된 녹음 → float32 (파일은 메모리 매핑으로 읽음)"""
+        pcm = np.load(self.path(name), mmap_mode="r")
+        return pcm.astype(np.float32) / 32768.0
+
+    def files(self):
+        """(이름, 크기) 목록 - 오래된 것부터 (이름이 시간순)"""
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.endswith(".npy"))
+        except OSError:
+            return []
+        return [(n, os.path.getsize(os.path.join(self.directory, n))) for n in names]
+
+    def total_mb(self):
+        return sum(size for _, size in self.files()) / 1024 / 1024
+
+    def _enforce_budget(self):
+        files = self.files()
+        total = sum(size for _, size in files)
+        budget = self.budget_mb * 1024 * 1024
+        for name, size in files[:-1]:  # 방금 저장한 파일은 남김
+            if total <= budget:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+def text_diff_rate(draft, refined):
+    """초안 대비 바뀐 단어 비율 (0 = 같음, 1 = 전부 다름)"""
+    a, b = draft.split(), refined.split()
+    if not a and not b:
+        return 0.0
+    return round(1.0 - difflib.SequenceMatcher(None, a, b, autojunk=False).ratio(), 3)
+
+def detect_device():
+    """GPU 자동 감지 - torch 없이 CTranslate2로 확인"""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            print("[Voice App] GPU 사용 (CUDA)")
+            return "cuda", "float16"
+    except Exception:
+        pass
+    print("[Voice App] CPU 사용")
+    return "cpu", "int8"
+
+def attach_shared_memory(name):
+    """다른 프로세스가 만든 공유 메모리에 연결 - 정리(unlink)는 만든 쪽이 하므로 추적하지 않음
+
+    3.13 미만은 track 인자가 없지만, spawn으로 띄운 자식은 부모의 resource tracker를 같이 쓰므로
+    같은 이름이 한 번 더 등록될 뿐 부모가 unlink할 때 함께 정리된다.
+    """
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def inference_worker_main(conn, model_size, device, compute_type, cpu_threads, num_workers):
+    """추론 프로세스 본체 - 모델을 로드한 뒤 파이프로 받은 요청을 하나씩 변환
+
+    요청: ("transcribe", id, 공유 메모리 이름, 샘플 수, transcribe 인자) / ("cancel", id, None) / ("stop", None, None)
+    응답: ("ready", None, pid) / ("segment", id, (start, end, text)) / ("done", id, None) / ("error", id, 메시지)
+    """
+    from faster_whisper import WhisperModel
+    try:
+        model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                             cpu_threads=cpu_threads, num_workers=num_workers)
+    except Exception as e:
+        conn.send(("error", None, f"모델 로드 실패: {e}"))
+        return
+    conn.send(("ready", None, os.getpid()))
+    shm = None
+    pending = collections.deque()  # 세그먼트 사이 취소 확인 중에 먼저 받은 다른 메시지
+    while True:
+        try:
+            kind, req_id, *args = pending.popleft() if pending else conn.recv()
+        except EOFError:
+            break  # 앱이 종료됨
+        if kind == "stop":
+            break
+        if kind != "transcribe":
+            continue  # 이미 끝난 요청의 취소
+        shm_name, samples, kwargs = args
+        if shm is None or shm.name != shm_name:
+            if shm is not None:
+                shm.close()
+            shm = attach_shared_memory(shm_name)
+        audio = np.ndarray((samples,), dtype=np.float32, buffer=shm.buf)  # 복사 없이 공유 메모리를 그대로 사용
+        segments = None
+        try:
+            segments, _ = model.transcribe(audio, **kwargs)
+            cancelled = False
+            for seg in segments:
+                conn.send(("segment", req_id, (seg.start, seg.end, seg.text)))
+                while conn.poll():
+                    message = conn.recv()
+                    if message[:2] == ("cancel", req_id):
+                        cancelled = True
+                    elif message[0] != "cancel":
+                        pending.append(message)  # 다음 요청/종료는 이 요청이 끝난 뒤 처리
+                if cancelled:
+                    break
+            conn.send(("done", req_id, None))
+        except Exception as e:
+            conn.send(("error", req_id, str(e)))
+        finally:
+            del segments, audio  # 공유 메모리 버퍼 참조 해제 (다음 요청에서 close 가능하도록)
+    if shm is not None:
+        shm.close()
+
+class RemoteWhisperModel:
+    """별도 프로세스에서 도는 WhisperModel 대리 객체 - transcribe()를 같은 모양으로 제공
+
+    오디오는 공유 메모리로 넘기고(피클 복사 없음) 세그먼트는 파이프로 받는다. 공유 메모리가 하나라 요청은 하나씩 처리.
+    응답은 읽기 스레드가 요청별 큐로 나눠 주므로, 세그먼트를 받는 쪽이 중간에 멈춰도 다음 요청은
+    추론 프로세스가 앞 요청을 끝내는 대로 진행된다 (잠금은 보내는 동안에만 잡음).
+    프로세스가 죽거나 멈추면 진행 중인 요청만 실패하고 바로 새 프로세스를 띄운다 (앱은 계속 동작).
+    마지막 참조가 사라지면 (모델 캐시에서 제거, 유휴 해제) 프로세스도 종료된다.
+    """
+
+    def __init__(self, model_size, device="cpu", compute_type="int8", cpu_threads=0, num_workers=1):
+        self.args = (model_size, device, compute_type, cpu_threads, num_workers)
+        self.lock = threading.Condition()  # 프로세스/공유 메모리 상태와 보내기 보호, 앞 요청 종료 알림
+        self.seq = 0
+        self.restarts = 0
+        # finalize와 읽기 스레드가 self 없이 쓸 수 있도록 상태는 dict로
+        # inflight: 추론 프로세스가 처리 중인 요청 id, last_reply: 마지막 응답 시각 (멈춤 감지)
+        self.state = {"process": None, "conn": None, "shm": None, "replies": None,
+                      "inflight": None, "last_reply": 0.0}
+        self._finalizer = weakref.finalize(self, RemoteWhisperModel._shutdown, self.state)
+        self._start()
+        with self.lock:
+            self._wait_ready()  # WhisperModel처럼 생성 시점에 로드 (실패하면 여기서 예외)
+
+    def _launch(self, child_conn):
+        """추론 프로세스 시작 - child_conn은 자식에게 넘긴 파이프 끝"""
+        ctx = multiprocessing.get_context("spawn")
+        process = ctx.Process(target=inference_worker_main, args=(child_conn,) + self.args,
+                              name=f"inference-{self.args[0]}", daemon=True)
+        process.start()
+        child_conn.close()
+        return process
+
+    def _start(self):
+        conn, child_conn = multiprocessing.Pipe()
+        process = self._launch(child_conn)
+        replies = {None: queue.Queue()}  # 요청 id → 응답 큐 (None: 준비/로드 실패), 연결마다 새로
+        self.state.update(process=process, conn=conn, replies=replies, inflight=None,
+                          last_reply=time.monotonic())
+        threading.Thread(target=RemoteWhisperModel._read_replies, args=(conn, replies, self.state, self.lock),
+                         name=f"inference-reader-{self.args[0]}", daemon=True).start()
+        self.ready = False
+
+    @staticmethod
+    def _read_replies(conn, replies, state, lock):
+        """응답을 요청별 큐로 전달 - 처리 중인 요청이 끝나면 다음 요청을 깨움, 연결이 끊기면 모두 실패 처리"""
+        while True:
+            try:
+                kind, rid, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            state["last_reply"] = time.monotonic()
+            target = replies.get(rid)
+            if target is not None:
+                target.put((kind, payload))
+            if rid is not None and kind in ("done", "error"):
+                with lock:
+                    if state["inflight"] == rid:
+                        state["inflight"] = None
+                        lock.notify_all()
+        for target in list(replies.values()):
+            target.put(("lost", None))
+        with lock:
+            if state["conn"] is conn:
+                state["inflight"] = None
+                lock.notify_all()
+
+    def _wait_ready(self):
+        try:
+            kind, payload = self.state["replies"][None].get(timeout=INFERENCE_LOAD_TIMEOUT_SEC)
+        except queue.Empty:
+            raise RuntimeError(f"추론 프로세스 시작 실패: {INFERENCE_LOAD_TIMEOUT_SEC}초 동안 응답 없음")
+        if kind == "lost":
+            raise RuntimeError("추론 프로세스 시작 실패: 프로세스 종료됨")
+        if kind != "ready":
+            raise RuntimeError(payload)
+        self.ready = True
+        print(f"[Voice App] 추론 프로세스 준비됨: {self.args[0]} (pid {payload})")
+
+    def _restart(self, reason):
+        """프로세스 강제 종료 후 새로 시작 - 모델 로드는 다음 요청 전까지 백그라운드에서 진행"""
+        print(f"[Voice App] 추론 프로세스 재시작 ({reason})")
+        RemoteWhisperModel._shutdown(self.state, keep_shm=True)
+        self.restarts += 1
+        self._start()
+
+    def _buffer(self, nbytes):
+        """요청 오디오를 담을 공유 메모리 - 모자랄 때만 더 크게 새로 만듦"""
+        from multiprocessing import shared_memory
+        shm = self.state["shm"]
+        if shm is None or shm.size < nbytes:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            shm = shared_memory.SharedMemory(create=True, size=max(nbytes, INFERENCE_SHM_MIN_BYTES))
+            self.state["shm"] = shm
+        return shm
+
+    def transcribe(self, audio, **kwargs):
+        """WhisperModel.transcribe와 같은 (세그먼트 제너레이터, info) - info는 제공하지 않음 (None)"""
+        return self._segments(np.ascontiguousarray(audio, dtype=np.float32), kwargs), None
+
+    def _send(self, audio, kwargs):
+        """앞 요청이 추론 프로세스에서 끝나면 (공유 메모리를 덮어쓰지 않도록) 요청 전송 - 잠금 안에서 호출"""
+        while self.state["inflight"] is not None:
+            if not self.lock.wait(timeout=1.0) and \
+                    time.monotonic() - self.state["last_reply"] > INFERENCE_STALL_SEC:
+                self._restart(f"{INFERENCE_STALL_SEC}초 동안 응답 없음")
+        if not self.state["process"].is_alive():
+            self._restart("프로세스 종료됨")
+        if not self.ready:
+            self._wait_ready()
+        shm = self._buffer(audio.nbytes)
+        np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+        self.seq += 1
+        req_id = self.seq
+        replies, conn = self.state["replies"], self.state["conn"]
+        replies[req_id] = queue.Queue()
+        self.state["inflight"] = req_id
+        try:
+            conn.send(("transcribe", req_id, shm.name, len(audio), kwargs))
+        except OSError as e:
+            replies.pop(req_id)
+            self._restart(str(e) or "프로세스 종료됨")
+            raise RuntimeError(f"추론 프로세스 오류: {e}") from e
+        return req_id, conn, replies
+
+    def _segments(self, audio, kwargs):
+        with self.lock:
+            req_id, conn, replies = self._send(audio, kwargs)
+        finished = False
+        try:
+            while True:
+                try:
+                    kind, payload = replies[req_id].get(timeout=INFERENCE_STALL_SEC)
+                except queue.Empty:
+                    raise TimeoutError(f"{INFERENCE_STALL_SEC}초 동안 응답 없음")
+                if kind == "segment":
+                    yield TextSegment(*payload)  # 잠금 없이 - 소비자가 멈춰도 다른 요청을 막지 않음
+                elif kind == "done":
+                    finished = True
+                    return
+                elif kind == "lost":
+                    raise EOFError("프로세스 종료됨")
+                else:
+                    finished = True
+                    raise RuntimeError(payload)
+        except (EOFError, OSError, TimeoutError) as e:
+            finished = True
+            reason = str(e) or "프로세스 종료됨"
+            with self.lock:
+                if self.state["conn"] is conn:  # 다른 요청이 이미 재시작했으면 그대로
+                    self._restart(reason)
+            raise RuntimeError(f"추론 프로세스 오류: {reason}") from e
+        finally:
+            replies.pop(req_id, None)
+            if not finished:
+                # 소비자가 중간에 멈춤 (변환 취소) - 남은 세그먼트는 건너뛰도록 알림
+                with self.lock:
+                    try:
+                        conn.send(("cancel", req_id, None))
+                    except OSError:
+                        pass
+
+    @staticmethod
+    def _shutdown(state, keep_shm=False):
+        process, conn = state["process"], state["conn"]
+        if conn is not None:
+            try:
+                conn.send(("stop", None, None))
+            except OSError:
+                pass
+            conn.close()
+        if process is not None:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=1)
+        state.update(process=None, conn=None)
+        if not keep_shm and state["shm"] is not None:
+            state["shm"].close()
+            state["shm"].unlink()
+            state["shm"] = None
+
+class BatchScheduler:
+    """모델 앞의 배치 스케줄러 - 동시에 들어온 클립 중 설정/길이가 비슷한 것을 묶어 한 번에 디코딩
+
+    transcribe()는 WhisperModel과 같은 모양. 첫 클립이 들어온 뒤 max_wait 동안 함께 묶을 클립을 모으고,
+    두 개 이상이면 이어 붙인 오디오를 BatchedInferencePipeline에 클립 경계(clip_timestamps)와 함께 넘긴다.
+    결과 세그먼트는 시작 시각으로 원래 클립을 찾아 클립 기준 시각으로 돌려준다.
+    처리 스레드는 대기 중인 클립이 있을 때만 돌아서 모델 참조를 붙잡고 있지 않는다 (캐시 제거/유휴 해제 가능).
+    묶지 않는 긴 클립과 배치를 합쳐 모델을 동시에 쓰는 디코딩은 decode_slots개까지 (모델 작업자 수) -
+    작업 큐가 배치를 위해 여러 클립을 동시에 넘겨도 각자 전체 스레드로 디코딩하며 CPU를 나눠 먹지 않게.
+    """
+
+    def __init__(self, model, max_wait=0.05, max_batch=BATCH_MAX_SIZE, pipeline=None, decode_slots=1):
+        self.model = model
+        if pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            pipeline = BatchedInferencePipeline(model)
+        self.pipeline = pipeline
+        self.slots = threading.BoundedSemaphore(decode_slots)
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.pending = []
+        self.cond = threading.Condition()
+        self.running = False
+        self.batches = 0  # 두 개 이상 묶어 디코딩한 횟수
+        self.batched_clips = 0
+
+    def transcribe(self, audio, **kwargs):
+        if len(audio) > BATCH_MAX_CLIP_SEC * SAMPLE_RATE:
+            return self._direct(audio, kwargs), None  # 긴 오디오는 창 여러 개라 묶지 않음
+        request = {"audio": audio, "kwargs": kwargs, "time": time.monotonic(), "done": threading.Event(),
+                   "key": json.dumps(kwargs, sort_keys=True, default=str), "segments": None, "error": None}
+        with self.cond:
+            self.pending.append(request)
+            if not self.running:
+                self.running = True
+                threading.Thread(target=self._run, daemon=True).start()
+            self.cond.notify()
+        return self._results(request), None
+
+    def _direct(self, audio, kwargs):
+        """배치 없이 디코딩 - 빈 디코딩 자리가 날 때까지 기다림 (세그먼트를 다 꺼낼 때까지 자리 차지)"""
+        with self.slots:
+            segments, _ = self.model.transcribe(audio, **kwargs)
+            yield from segments
+
+    @staticmethod
+    def _results(request):
+        request["done"].wait()
+        if request["error"] is not None:
+            raise request["error"]
+        yield from request["segments"]
+
+    def _group(self, first):
+        """first와 같은 디코딩 설정이고 길이가 비슷한 대기 클립들 (first 포함, 도착 순)"""
+        n = len(first["audio"])
+        return [r for r in self.pending
+                if r["key"] == first["key"]
+                and max(n, len(r["audio"])) <= BATCH_LENGTH_RATIO * max(min(n, len(r["audio"])), 1)
+                ][:self.max_batch]
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self.pending:
+                    self.running = False
+                    return
+                first = self.pending[0]
+                deadline = first["time"] + self.max_wait
+                while True:
+                    group = self._group(first)
+                    remaining = deadline - time.monotonic()
+                    if len(group) >= self.max_batch or remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                for r in group:
+                    self.pending.remove(r)
+            with self.slots:
+                self._decode(group)
+
+    def _decode(self, group):
+        try:
+            if len(group) == 1:
+                segments, _ = self.model.transcribe(group[0]["audio"], **group[0]["kwargs"])
+                group[0]["segments"] = list(segments)
+                return
+            audio = np.concatenate([r["audio"] for r in group])
+            starts = np.cumsum([0] + [len(r["audio"]) for r in group]).tolist()
+            offsets = [start / SAMPLE_RATE for start in starts[:-1]]
+            # clip_timestamps와 결과 세그먼트 시각은 초 (faster-whisper 1.2부터 - 안에서 샘플로 바꿈)
+            clips = [{"start": start / SAMPLE_RATE, "end": end / SAMPLE_RATE} for start, end in zip(starts, starts[1:])]
+            for r in group:
+                r["segments"] = []
+            segments, _ = self.pipeline.transcribe(audio, clip_timestamps=clips, batch_size=len(group),
+                                                   **group[0]["kwargs"])
+            for seg in segments:
+                i = max(bisect.bisect_right(offsets, seg.start + 1e-3) - 1, 0)
+                group[i]["segments"].append(TextSegment(seg.start - offsets[i], seg.end - offsets[i], seg.text))
+            self.batches += 1
+            self.batched_clips += len(group)
+        except Exception as e:
+            for r in group:
+                r["error"] = e
+        finally:
+            for r in group:
+                r["done"].set()
+
+class ModelCache:
+    """로드된 WhisperModel LRU 캐시 - (크기, 장치, 연산 타입)별, 메모리 예산 안에서 유지"""
+
+    def __init__(self, budget_mb, num_workers=1, remote=False, batch_wait=None):
+        self.budget_mb = budget_mb
+        self.num_workers = num_workers  # 모델 하나를 동시에 쓸 수 있는 스레드 수 (병렬 디코딩)
+        self.remote = remote  # True: 모델마다 별도 추론 프로세스 (RemoteWhisperModel)
+        self.batch_wait = batch_wait  # 초 단위면 모델 앞에 BatchScheduler (별도 프로세스 모델에는 적용 안 됨)
+        self.models = OrderedDict()  # key → 모델 (뒤쪽이 최근 사용)
+        self.loading = {}  # key → Event (같은 모델 중복 로드 방지)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def estimate_mb(key):
+        model_size, device, compute_type = key
+        mb = MODEL_MEMORY_MB.get(model_size, 1000)
+        return mb * 2 if compute_type in ("float32", "float16") and device == "cpu" else mb
+
+    def get(self, model_size, device, compute_type):
+        """캐시에 있으면 모델 반환 (없으면 None)"""
+        key = (model_size, device, compute_type)
+        with self.lock:
+            model = self.models.get(key)
+            if model is not None:
+                self.models.move_to_end(key)
+            return model
+
+    def load(self, model_size, device, compute_type, cpu_threads=0):
+        """캐시에서 꺼내거나 새로 로드 - 반환값: (모델, 새로 로드했는지)
+
+        cpu_threads: 디코딩 하나가 쓸 스레드 수 (0 = 전체 코어), 병렬 워커끼리 나눠 씀
+        """
+        key = (model_size, device, compute_type)
+        while True:
+            with self.lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    return self.models[key], False
+                event = self.loading.get(key)
+                if event is None:
+                    event = self.loading[key] = threading.Event()
+                    break
+            event.wait()  # 다른 스레드가 같은 모델 로드 중
+
+        try:
+            # 코어를 워커끼리 나눠 씀 (워커 하나면 보정값 또는 CTranslate2 기본값)
+            if self.num_workers > 1:
+                cpu_threads = max(1, (cpu_threads or os.cpu_count() or 1) // self.num_workers)
+            if self.remote:
+                factory = RemoteWhisperModel
+            else:
+                from faster_whisper import WhisperModel as factory
+            model = factory(model_size, device=device, compute_type=compute_type,
+                            cpu_threads=cpu_threads, num_workers=self.num_workers)
+            if self.batch_wait is not None and not self.remote:
+                model = BatchScheduler(model, self.batch_wait, decode_slots=self.num_workers)
+            with self.lock:
+                self.models[key] = model
+                self._evict(keep=key)
+            return model, True
+        finally:
+            with self.lock:
+                del self.loading[key]
+            event.set()
+
+    def _evict(self, keep):
+        """예산 초과 시 오래된 모델부터 제거 (사용 중인 작업은 참조를 가지고 있어 안전)"""
+        while len(self.models) > 1 and sum(map(self.estimate_mb, self.models)) > self.budget_mb:
+            oldest = next(k for k in self.models if k != keep)
+            del self.models[oldest]
+            print(f"[Voice App] 모델 캐시에서 제거: {oldest[0]}")
+
+    def keys(self):
+        with self.lock:
+            return list(self.models)
+
+    def clear(self):
+        """캐시 비우기 (유휴 해제) - 사용 중인 작업은 참조를 가지고 있어 끝날 때 해제됨"""
+        with self.lock:
+            self.models.clear()
+
+class TextSegment:
+    """변환 결과 구간 (faster-whisper Segment의 start/end/text만)"""
+
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+class Transcriber:
+    """변환 엔진 - 모델 + 디코딩 프로필 (UI 없음, 앱과 벤치마크가 같이 사용)"""
+
+    def __init__(self, config, post=None):
+        self.config = config
+        self.model = None
+        self.model_size = None  # 현재 model의 크기
+        # 설정(config) 변경을 설정 소유 스레드로 넘기는 함수 - 앱은 root.after, 헤드리스는 바로 실행
+        self.post = post or (lambda fn, *args: fn(*args))
+        # 유휴 해제 후 다시 로드하는 함수 () → (모델, 크기). 없으면 해제된 모델로 변환할 수 없음
+        self.loader = None
+        self.load_lock = threading.Lock()  # 로드/해제/사용 시작을 직렬화
+        self.in_use = 0  # 진행 중인 transcribe 수 (사용 중에는 해제하지 않음)
+        self.last_used = time.monotonic()
+
+    def ensure_model(self, info=None):
+        """모델이 해제됐으면 다시 로드 - 여러 스레드가 불러도 한 번만 로드하고 나머지는 기다림"""
+        if self.model is not None:
+            return
+        start = time.perf_counter()
+        with self.load_lock:
+            if self.model is None:
+                if self.loader is None:
+                    raise RuntimeError("모델이 로드되지 않음")
+                self.model, self.model_size = self.loader()
+        if info is not None:
+            info["model_wait_sec"] = round(time.perf_counter() - start, 3)
+
+    def acquire(self, info=None):
+        """변환 시작 - 필요하면 모델을 다시 로드하고 (모델, 크기) 반환. release()와 짝"""
+        while True:
+            self.ensure_model(info)
+            with self.load_lock:
+                if self.model is not None:  # 확인과 사용 표시 사이에 해제되지 않도록 같은 잠금 안에서
+                    self.in_use += 1
+                    return self.model, self.model_size
+
+    def release(self):
+        with self.load_lock:
+            self.in_use -= 1
+            self.last_used = time.monotonic()
+
+    def set_model(self, model, model_size):
+        """모델 교체 - 유휴 해제/재로드와 같은 잠금 안에서 (진행 중인 변환은 잡아 둔 이전 모델로 끝까지 진행)"""
+        with self.load_lock:
+            self.model, self.model_size = model, model_size
+
+    def unload(self):
+        """모델 참조 해제 - 사용 중이면 하지 않음. 반환값: 해제했는지"""
+        with self.load_lock:
+            if self.in_use or self.model is None:
+                return False
+            self.model = None
+            return True
+
+    def transcribe_range(self, capture, vad, start, end, initial_prompt=None, cancel_event=None, info=None,
+                         count_trimmed=True):
+        """녹음 버퍼의 [start, end) 구간 변환 - VAD가 있으면 침묵을 잘라내고 음성만 디코딩
+
+        count_trimmed=False면 잘라낸 침묵을 vad.trimmed에 더하지 않음 (같은 녹음을 다시 변환할 때).
+        """
+        assemble_start = time.perf_counter()
+        audio = vad.trim(start, end, count=count_trimmed) if vad else capture.view(start, end)
+        if info is not None:
+            info["assemble_sec"] = round(info.get("assemble_sec", 0) + time.perf_counter() - assemble_start, 4)
+        if len(audio) == 0:
+            return ""
+        return self.transcribe(audio, initial_prompt, cancel_event, info)
+
+    def transcribe(self, audio: np.ndarray, initial_prompt=None, cancel_event=None, info=None,
+                   on_segment=None, language=None, profile=None) -> str:
+        """음성을 텍스트로 변환 (float32 버퍼를 파일 없이 모델에 직접 전달)
+
+        info를 넘기면 사용한 프로필, 디코딩 시간, 오디오 길이를 누적한다.
+        on_segment(seg)는 세그먼트가 디코딩될 때마다 호출된다. language/profile은 설정 대신 사용할 값.
+        """
+        # 이미 float32 연속 배열이면 복사 없이 그대로 사용
+        audio = np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        if self.config.get("debug_dump_wav", False):
+            dump_debug_wav(audio)
+
+        language = language or self.config.get("language", "ko")
+        # 변환 도중 모델이 교체/해제되어도 같은 모델 사용 (유휴 해제된 상태면 여기서 다시 로드)
+        model, model_size = self.acquire(info)
+        try:
+            duration = len(audio) / SAMPLE_RATE
+            workers = decode_workers(self.config)
+            parallel = workers > 1 and duration >= self.config.get("parallel_min_sec", 60)
+            if profile not in DECODE_PROFILES:
+                # 병렬이면 청크들이 동시에 끝나므로 워커 하나가 맡는 길이 기준으로 선택
+                profile = choose_decode_profile(self.config, model_size, duration / workers if parallel else duration)
+
+            start = time.perf_counter()
+            if parallel:
+                text = self.transcribe_parallel(model, audio, language, initial_prompt, profile, workers,
+                                                cancel_event, on_segment)
+            else:
+                texts = []
+                for seg in self.decode_segments(model, audio, language, initial_prompt, profile, cancel_event):
+                    texts.append(seg.text)
+                    if on_segment is not None:
+                        on_segment(seg)
+                text = " ".join(texts).strip()
+            decode_sec = time.perf_counter() - start
+
+            # 측정한 RTF는 설정을 소유한 스레드에서 반영 (다음 auto 선택에 사용)
+            # 병렬 디코딩 시간은 청크끼리 CPU를 나눠 쓴 값이라 순차 RTF 표에는 넣지 않음
+            if not parallel:
+                self.post(record_rtf, self.config, model_size, profile, duration, decode_sec)
+            if info is not None:
+                profiles = info.get("profile", "").split("/") if info.get("profile") else []
+                if profile not in profiles:
+                    profiles.append(profile)
+                info["profile"] = "/".join(profiles)
+                info["model"] = model_size
+                info["decode_sec"] = round(info.get("decode_sec", 0) + decode_sec, 2)
+                if parallel:
+                    info["parallel_workers"] = workers
+            return text
+        finally:
+            self.release()
+
+    def decode_segments(self, model, audio, language, initial_prompt, profile, cancel_event):
+        """모델 한 번 호출 - 세그먼트 단위로 디코딩되므로 사이사이 취소 확인"""
+        segments, _ = model.transcribe(audio, language=language, initial_prompt=initial_prompt,
+                                       **DECODE_PROFILES[profile])
+        for seg in segments:
+            if cancel_event is not None and cancel_event.is_set():
+                raise TranscriptionCancelled()
+            yield seg
+
+    def transcribe_parallel(self, model, audio, language, initial_prompt, profile, workers,
+                            cancel_event=None, on_segment=None):
+        """긴 오디오를 침묵 지점에서 나눠 동시에 디코딩 후 순서대로 이어 붙임
+
+        청크마다 경계 앞뒤를 조금씩 겹쳐 넣고, 겹친 부분에서 두 번 나온 단어는 뒤 청크에서 뺀다.
+        앞 청크 결과를 프롬프트로 쓸 수 없으므로 initial_prompt는 첫 청크에만 준다.
+        """
+        stop = threading.Event()  # 취소/오류 시 남은 청크 중단 (호출자의 cancel_event는 건드리지 않음)
+        overlap = int(PARALLEL_OVERLAP_SEC * SAMPLE_RATE)
+        chunks = split_at_silence(audio)
+
+        def decode(index):
+            start, end = chunks[index]
+            start = max(0, start - overlap) if index else start
+            end = min(len(audio), end + overlap)
+            prompt = initial_prompt if index == 0 else None
+            offset = start / SAMPLE_RATE
+            return [TextSegment(seg.start + offset, seg.end + offset, seg.text)
+                    for seg in self.decode_segments(model, audio[start:end], language, prompt, profile, stop)]
+
+        def wait(future):
+            while True:
+                try:
+                    return future.result(timeout=0.1)
+                except FutureTimeout:
+                    if cancel_event is not None and cancel_event.is_set():
+                        stop.set()
+
+        words = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(decode, i) for i in range(len(chunks))]
+            try:
+                for future in futures:  # 제출 순서대로 이어 붙임
+                    segments = wait(future)
+                    chunk_words = merge_overlap(words, " ".join(seg.text for seg in segments).split())
+                    words.extend(chunk_words)
+                    if on_segment is not None:
+                        for seg in segments:
+                            on_segment(seg)
+            except BaseException:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+        return " ".join(words)
+
+    def warm_up(self, model):
+        """짧은 합성 오디오로 한 번 변환 - 첫 실제 받아쓰기의 콜드 스타트 비용을 미리 냄"""
+        language = self.config.get("language", "ko")
+        segments, _ = model.transcribe(make_synthetic_audio(1.0), language=language, beam_size=5)
+        for _ in segments:  # 제너레이터라 끝까지 돌아야 디코딩됨
+            pass
+
+def finish_recording(engine, capture, vad, streamer, info, cancel_event=None):
+    """녹음 종료 후 변환 - 남은 VAD 창 처리 → 변환 (스트리밍이면 마지막 청크만). 앱과 벤치마크 공용"""
+    start = time.perf_counter()
+    if vad:
+        vad.stop()
+    vad_done = time.perf_counter()
+    if streamer:
+        # 이미 변환된 청크 + 마지막 청크만 변환
+        text = streamer.finish()
+        info.update(streamer.info)
+    else:
+        text = engine.transcribe_range(capture, vad, 0, len(capture), cancel_event=cancel_event, info=info)
+    end = time.perf_counter()
+    info["duration"] = round(len(capture) / SAMPLE_RATE, 2)
+    info["vad_flush_sec"] = round(vad_done - start, 3)
+    info["final_decode_sec"] = round(end - vad_done, 3)
+    info["latency_sec"] = round(end - start, 2)  # 작업 시작 → 결과
+    if vad:
+        info["trimmed_sec"] = round(vad.trimmed / SAMPLE_RATE, 2)
+        print(f"[Voice App] 침묵 제외: {info['trimmed_sec']}s / {info['duration']}s")
+    return text
+
+class StartupTimeline:
+    """시작 단계별 소요 시간 기록 - 준비 완료까지 걸린 시간의 회귀 확인용"""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.last = origin
+        self.stages = []
+
+    def mark(self, stage):
+        """직전 mark 이후 걸린 시간을 stage 이름으로 기록"""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def log(self, **extra):
+        """콘솔 출력 + startup_log.jsonl에 한 줄 추가"""
+        total = self.last - self.origin
+        summary = ", ".join(f"{name} {sec:.2f}s" for name, sec in self.stages)
+        print(f"[Voice App] 준비 완료 {total:.2f}s ({summary})")
+        entry = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "total_sec": round(total, 3),
+                 "stages": {name: round(sec, 3) for name, sec in self.stages}}
+        entry.update(extra)
+        try:
+            with open(STARTUP_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+METRIC_STAGES = ["hotkey_to_audio_sec", "stream_open_sec", "capture_sec", "queue_wait_sec", "vad_flush_sec", "assemble_sec",
+                 "decode_sec", "final_decode_sec", "clipboard_sec", "history_sec", "latency_sec",
+                 "refine_sec", "refine_diff", "callback_max_ms", "lost_audio_sec", "model_wait_sec"]
+
+def percentile(values, q):
+    """values의 q 백분위수 (표본이 없으면 None)"""
+    if not values:
+        return None
+    return float(np.percentile(np.asarray(values, dtype=np.float64), q))
+
+class MetricsLog:
+    """녹음별 단계 소요 시간 기록 - 회전하는 JSONL 파일 + 최근 기록으로 p50/p95 계산
+
+    "오늘 느리다"는 제보를 나중에 숫자로 확인하기 위한 용도 (파일은 앱 폴더에만 남음).
+    """
+
+    def __init__(self, path=METRICS_FILE, max_bytes=METRICS_MAX_BYTES, backups=METRICS_BACKUPS, window=200):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.window = window
+        self.lock = threading.Lock()
+        self.recent = self._load_recent()
+
+    def _load_recent(self):
+        """직전 실행 기록까지 포함해 최근 window개 로드 (현재 파일 → 백업 순)"""
+        entries = []
+        for path in [self.path] + [f"{self.path}.{i}" for i in range(1, self.backups + 1)]:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in reversed(lines):
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # 쓰다 끊긴 줄
+                if len(entries) >= self.window:
+                    return entries[::-1]
+        return entries[::-1]
+
+    def _rotate(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def record(self, entry):
+        """한 녹음의 기록 추가 (어느 스레드에서든 호출 가능)"""
+        entry = dict(entry, time=time.strftime("%Y-%m-%d %H:%M:%S"))
+        with self.lock:
+            self.recent.append(entry)
+            del self.recent[:-self.window]
+            try:
+                self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+    def summary(self):
+        """단계별 p50/p95 (초) + 처리량"""
+        with self.lock:
+            entries = list(self.recent)
+        stages = {}
+        for stage in METRIC_STAGES:
+            values = [e[stage] for e in entries if isinstance(e.get(stage), (int, float))]
+            if values:
+                stages[stage] = {"n": len(values), "p50": round(percentile(values, 50), 3),
+                                 "p95": round(percentile(values, 95), 3)}
+        audio_sec = sum(e.get("duration", 0) for e in entries)
+        decode_sec = sum(e.get("decode_sec", 0) for e in entries)
+        refined = [e for e in entries if "refine_diff" in e]
+        lossy = sum(1 for e in entries if e.get("lost_audio_sec") or e.get("input_overflows"))
+        return {
+            "recordings": len(entries) - len(refined),
+            "since": entries[0]["time"] if entries else None,
+            "audio_sec": round(audio_sec, 1),
+            "chars_out": sum(e.get("chars_out", 0) for e in entries),
+            "rtf": round(decode_sec / audio_sec, 3) if audio_sec else None,
+            # 2단계 변환에서 결과가 초안과 달라진 비율
+            "refine_changed": round(sum(e["refine_diff"] > 0 for e in refined) / len(refined), 3) if refined else None,
+            "lossy_recordings": lossy,  # 오디오 손실(overflow)이 있었던 녹음 수
+            "stages": stages,
+        }
+
+    def format_summary(self):
+        """summary()를 사람이 읽는 표로"""
+        summary = self.summary()
+        if not summary["recordings"]:
+            return "(기록 없음)"
+        lines = [f"최근 녹음 {summary['recordings']}개 ({summary['since']} 이후)",
+                 f"오디오 {summary['audio_sec']}s → {summary['chars_out']}자, RTF {summary['rtf']}",
+                 f"2단계 변환: 초안과 달라진 비율 {summary['refine_changed']:.0%}"
+                 if summary["refine_changed"] is not None else "",
+                 f"오디오 손실이 있었던 녹음: {summary['lossy_recordings']}개" if summary["lossy_recordings"] else "",
+                 "",
+                 f"{'단계':<18}{'p50':>8}{'p95':>8}{'n':>6}"]
+        for stage, stat in summary["stages"].items():
+            lines.append(f"{stage:<18}{stat['p50']:>8.3f}{stat['p95']:>8.3f}{stat['n']:>6}")
+        return "\n".join(lines)
+
+class TranscriptionCancelled(Exception):
+    """변환 작업이 취소됨"""
+
+class TranscriptionJob:
+    """변환 작업 하나 (취소 가능)"""
+
+    def __init__(self, job_id, fn, cancel_event=None):
+        self.id = job_id
+        self.fn = fn  # (job) -> text
+        self.cancel_event = cancel_event or threading.Event()
+        self.result = None
+        self.error = None
+        self.info = {}  # 히스토리에 함께 남길 정보 (길이, 제외한 침묵 등)
+        self.followup = None  # 완료 처리 후 이어서 호출할 함수 (2단계 변환 등)
+        self.finished = False  # fn 실행이 끝남 (전달은 앞 작업이 끝난 뒤)
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+class TranscriptionWorker:
+    """변환 작업 큐 - 백그라운드 스레드가 처리하고 결과는 제출 순서대로 전달
+
+    threads > 1이면 대기 중인 작업을 동시에 시작한다 (배치 디코딩에서 연달아 녹음한 클립을 함께 묶도록).
+    """
+
+    def __init__(self, on_done, threads=1):
+        self.on_done = on_done  # 작업 완료/취소/실패 시 호출 (워커 스레드)
+        self.queue = queue.Queue()
+        self.jobs = []  # 대기 + 진행 중 + 앞 작업을 기다리는 완료 작업 (제출 순)
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn, cancel_event=None):
+        """작업 추가 - 결과는 제출 순서대로 on_done으로 전달"""
+        with self.lock:
+            job = TranscriptionJob(self.next_id, fn, cancel_event)
+            self.next_id += 1
+            self.jobs.append(job)
+        self.queue.put(job)
+        return job
+
+    def cancel_all(self):
+        """대기 중/진행 중인 모든 작업 취소"""
+        with self.lock:
+            for job in self.jobs:
+                job.cancel()
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.jobs)
+
+    def stop(self):
+        self.cancel_all()
+        for _ in self.threads:
+            self.queue.put(None)
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            if not job.cancelled:
+                try:
+                    job.result = job.fn(job)
+                except TranscriptionCancelled:
+                    pass
+                except Exception as e:
+                    job.error = e
+                    print(f"[Voice App] 변환 오류: {e}")
+            with self.lock:
+                job.finished = True
+                # 앞선 작업이 모두 끝난 것까지만 순서대로 전달 (잠금 안에서 - 스레드 사이 순서 유지)
+                while self.jobs and self.jobs[0].finished:
+                    self.on_done(self.jobs.pop(0))
+
+def send_frame(conn, message):
+    """응답 프레임 하나 전송 - 길이(4바이트) + JSON"""
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    conn.sendall(struct.pack(">I", len(body)) + body)
+
+def recv_exact(conn, size):
+    """정확히 size바이트 수신 (연결이 끊기면 ConnectionError)"""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    got = 0
+    while got < size:
+        n = conn.recv_into(view[got:], size - got)
+        if n == 0:
+            raise ConnectionError("연결 끊김")
+        got += n
+    return bytes(buf)
+
+def recv_upto(conn, size):
+    """size바이트가 모이거나 상대가 보내기를 끝낼 때까지 수신 (recv 한 번은 일부만 줄 수 있음)"""
+    chunks = []
+    got = 0
+    while got < size:
+        data = conn.recv(size - got)
+        if not data:
+            break
+        chunks.append(data)
+        got += len(data)
+    return b"".join(chunks)
+
+def decode_service_audio(header, payload):
+    """요청 오디오 → 16kHz 모노 float32"""
+    fmt = header.get("format", "pcm_s16le")
+    if fmt == "wav":
+        return load_audio_file(io.BytesIO(payload))  # 샘플레이트/채널 변환 포함
+    channels = int(header.get("channels", 1))
+    rate = int(header.get("sample_rate", SAMPLE_RATE))
+    if fmt == "pcm_s16le":
+        audio = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+    else:
+        audio = np.frombuffer(payload, dtype="<f4").astype(np.float32)
+    if channels > 1:
+        audio = audio[:len(audio) // channels * channels].reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        from scipy.signal import resample_poly
+        from math import gcd
+        g = gcd(rate, SAMPLE_RATE)
+        audio = resample_poly(audio, SAMPLE_RATE // g, rate // g).astype(np.float32)
+    return audio
+
+class TranscriptionService:
+    """로컬 변환 서비스 - 다른 프로그램이 이미 로드된 모델을 소켓으로 빌려 씀
+
+    요청 (클라이언트 → 앱): b"TNV" + 버전 + 헤더 길이(>I) + JSON 헤더 + 오디오 (header["length"]바이트)
+        헤더: {"cmd": "transcribe", "format": "pcm_s16le"|"pcm_f32le"|"wav", "length": N,
+               "sample_rate": 16000, "channels": 1, "language": "ko", "profile": "auto"}
+    응답 (앱 → 클라이언트): 길이(>I) + JSON 프레임 반복
+        {"type": "queued", "position": n} → {"type": "segment", ...}* → {"type": "done", ...}
+        또는 {"type": "error", "message": ...} / {"type": "busy"} (큐가 찼음 - 잠시 후 재시도)
+    접두어 없는 SHOW, STATS 메시지는 예전 방식 그대로 처리한다.
+    """
+
+    def __init__(self, engine, is_ready, legacy_handler=None):
+        self.engine = engine
+        self.is_ready = is_ready  # () -> 모델 준비됐는지
+        self.legacy_handler = legacy_handler  # (bytes) -> 응답 bytes 또는 None
+        self.requests = queue.Queue()
+        self.slots = threading.BoundedSemaphore(SERVICE_QUEUE_MAX)  # 대기 + 처리 중 요청 수 상한
+        self.clients = threading.BoundedSemaphore(SERVICE_MAX_CLIENTS)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def serve(self, server_socket):
+        """accept 루프 (소켓이 닫힐 때까지) - 연결마다 스레드 하나"""
+        server_socket.listen(SERVICE_MAX_CLIENTS)
+        while True:
+            try:
+                conn, _ = server_socket.accept()
+            except OSError:
+                break
+            if not self.clients.acquire(blocking=False):
+                self._reject(conn, {"type": "busy"})
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _reject(self, conn, message):
+        try:
+            conn.settimeout(2)
+            if recv_exact(conn, 3) == SERVICE_MAGIC:
+                send_frame(conn, message)
+        except OSError:
+            pass
+        conn.close()
+
+    def _handle(self, conn):
+        try:
+            conn.settimeout(30)  # 느린/멈춘 클라이언트가 연결을 붙잡지 않게
+            prefix = recv_upto(conn, 4)  # 접두어가 나뉘어 와도 예전 방식으로 오인하지 않게
+            if prefix[:3] != SERVICE_MAGIC:
+                data = prefix + recv_upto(conn, 1024)  # 예전 클라이언트는 보낸 뒤 쓰기를 닫음
+                reply = self.legacy_handler(data) if self.legacy_handler else None
+                if reply:
+                    conn.sendall(reply)
+                return
+            if len(prefix) < 4:
+                raise ConnectionError("버전 전에 연결 끊김")
+            self._handle_request(conn, prefix[3:])
+        except (OSError, ValueError) as e:
+            print(f"[Voice App] 서비스 요청 처리 실패: {e}")
+        finally:
+            conn.close()
+            self.clients.release()
+
+    def _handle_request(self, conn, version):
+        if version[0] != SERVICE_VERSION:
+            send_frame(conn, {"type": "error", "message": f"지원하지 않는 버전: {version[0]}"})
+            return
+        header_len, = struct.unpack(">I", recv_exact(conn, 4))
+        if header_len > 64 * 1024:
+            send_frame(conn, {"type": "error", "message": "헤더가 너무 큼"})
+            return
+        header = json.loads(recv_exact(conn, header_len))
+        if header.get("cmd", "transcribe") != "transcribe":
+            send_frame(conn, {"type": "error", "message": f"알 수 없는 명령: {header.get('cmd')}"})
+            return
+        if header.get("format", "pcm_s16le") not in SERVICE_FORMATS:
+            send_frame(conn, {"type": "error", "message": f"지원 형식: {', '.join(SERVICE_FORMATS)}"})
+            return
+        length = int(header.get("length", 0))
+        rate = int(header.get("sample_rate", SAMPLE_RATE))
+        if length <= 0 or length > SERVICE_MAX_AUDIO_SEC * max(rate, SAMPLE_RATE) * 4 * int(header.get("channels", 1)):
+            send_frame(conn, {"type": "error", "message": f"오디오 길이 오류 (최대 {SERVICE_MAX_AUDIO_SEC}초)"})
+            return
+        if not self.is_ready():
+            send_frame(conn, {"type": "error", "message": "모델 준비 중"})
+            return
+
+        # 자리를 먼저 잡고 나서 오디오를 받음 - 꽉 차 있으면 오디오를 받지 않고 busy
+        if not self.slots.acquire(blocking=False):
+            send_frame(conn, {"type": "busy"})
+            return
+        try:
+            payload = recv_exact(conn, length)
+            try:
+                audio = decode_service_audio(header, payload)
+            except Exception as e:
+                send_frame(conn, {"type": "error", "message": f"오디오 해석 실패: {e}"})
+                return
+            request = {"conn": conn, "header": header, "audio": audio,
+                       "done": threading.Event(), "cancel": threading.Event()}
+            send_frame(conn, {"type": "queued", "position": self.requests.qsize() + 1})
+            self.requests.put(request)  # 이후로는 처리 스레드만 이 연결에 씀
+            request["done"].wait()
+        finally:
+            self.slots.release()
+
+    def _run(self):
+        """요청을 하나씩 변환 (모델 하나를 순서대로 사용) - 세그먼트는 나오는 대로 전송"""
+        while True:
+            request = self.requests.get()
+            conn, header, cancel = request["conn"], request["header"], request["cancel"]
+
+            def on_segment(seg):
+                try:
+                    send_frame(conn, {"type": "segment", "start": round(seg.start, 2),
+                                      "end": round(seg.end, 2), "text": seg.text})
+                except OSError:
+                    cancel.set()  # 클라이언트가 끊김 - 다음 세그먼트 전에 중단
+
+            info = {}
+            try:
+                text = self.engine.transcribe(request["audio"], cancel_event=cancel, info=info,
+                                              on_segment=on_segment, language=header.get("language"),
+                                              profile=header.get("profile"))
+                send_frame(conn, {"type": "done", "text": text,
+                                  "duration": round(len(request["audio"]) / SAMPLE_RATE, 2),
+                                  "decode_sec": info.get("decode_sec"), "model": info.get("model"),
+                                  "profile": info.get("profile")})
+            except TranscriptionCancelled:
+                pass
+            except Exception as e:
+                try:
+                    send_frame(conn, {"type": "error", "message": str(e)})
+                except OSError:
+                    pass
+            finally:
+                request["done"].set()
+
+def request_transcription(audio_bytes, fmt="wav", port=LOCK_PORT, **options):
+    """서비스 클라이언트 - 응답 프레임을 하나씩 yield (done/error/busy에서 끝)"""
+    header = dict(options, cmd="transcribe", format=fmt, length=len(audio_bytes))
+    body = json.dumps(header).encode("utf-8")
+    with socket.create_connection(("127.0.0.1", port)) as conn:
+        conn.sendall(SERVICE_MAGIC + bytes([SERVICE_VERSION]) + struct.pack(">I", len(body)) + body)
+        conn.sendall(audio_bytes)
+        while True:
+            size, = struct.unpack(">I", recv_exact(conn, 4))
+            message = json.loads(recv_exact(conn, size))
+            yield message
+            if message["type"] in ("done", "error", "busy"):
+                return
+
+class CaptureBuffer:
+    """녹음 버퍼 - 최대 녹음 길이만큼 미리 할당, 콜백은 할당 없이 쓰고 변환기는 복사 없이 읽음"""
+
+    def __init__(self, max_sec, compact=False):
+        self.capacity = int((max_sec + 1) * SAMPLE_RATE)  # 타임아웃 처리 여유 1초
+        self.compact = compact  # True: int16 저장 (메모리 절반)
+        self.data = np.empty(self.capacity, dtype=np.int16 if compact else np.float32)
+        self.scratch = np.empty(4096, dtype=np.float32)  # int16 변환용 임시 공간
+        self.length = 0  # 기록된 샘플 수 (콜백 스레드만 증가)
+        self.dropped = 0  # 버퍼가 가득 차서 버린 샘플 수
+
+    def __len__(self):
+        return self.length
+
+    def write(self, block):
+        """블록 기록 (오디오 콜백에서 호출 - 새 배열을 만들지 않음)"""
+        start = self.length
+        n = min(len(block), self.capacity - start)
+        if n < len(block):
+            self.dropped += len(block) - n
+        if n <= 0:
+            return
+        dst = self.data[start:start + n]
+        if self.compact:
+            if n > len(self.scratch):
+                self.scratch = np.empty(n, dtype=np.float32)  # 블록 크기가 바뀐 경우에만
+            tmp = self.scratch[:n]
+            np.clip(block[:n], -1.0, 1.0, out=tmp)
+            np.multiply(tmp, 32767.0, out=dst, casting="unsafe")
+        else:
+            dst[:] = block[:n]
+        # 데이터를 다 쓴 뒤에 길이 갱신 (읽는 쪽은 length까지만 봄)
+        self.length = start + n
+
+    def view(self, start=0, end=None):
+        """float32 오디오 - float32 저장이면 복사 없는 뷰, int16 저장이면 변환본"""
+        end = self.length if end is None else end
+        chunk = self.data[start:end]
+        if self.compact:
+            return chunk.astype(np.float32) / 32768.0
+        return chunk
+
+class PreRollBuffer:
+    """녹음 직전 오디오 링 버퍼 - 열어 둔 입력 스트림의 콜백만 씀 (할당 없음)"""
+
+    def __init__(self, seconds, rate=SAMPLE_RATE):
+        self.data = np.zeros(max(int(seconds * rate), 1), dtype=np.float32)
+        self.pos = 0  # 다음에 쓸 위치
+        self.filled = 0
+
+    def write(self, block):
+        n = len(block)
+        size = len(self.data)
+        if n >= size:
+            self.data[:] = block[n - size:]
+            self.pos, self.filled = 0, size
+            return
+        first = min(n, size - self.pos)
+        self.data[self.pos:self.pos + first] = block[:first]
+        self.data[:n - first] = block[first:]
+        self.pos = (self.pos + n) % size
+        self.filled = min(self.filled + n, size)
+
+    def drain_into(self, capture):
+        """쌓인 오디오를 시간순으로 capture에 쓰고 비움 (콜백 스레드에서 호출)"""
+        if self.filled:
+            start = (self.pos - self.filled) % len(self.data)
+            if start + self.filled <= len(self.data):
+                capture.write(self.data[start:start + self.filled])
+            else:
+                capture.write(self.data[start:])
+                capture.write(self.data[:self.pos])
+        self.filled = 0
+
+class AudioRing:
+    """단일 생산자/단일 소비자 링 버퍼 - 콜백이 쓰고(할당 없음) 변환 스레드가 읽음
+
+    written(누적 샘플 수)은 데이터를 다 쓴 뒤에 갱신되므로 읽는 쪽은 잠금 없이 그 앞까지 읽는다.
+    읽는 쪽이 capacity 이상 뒤처지면 덮어쓴 만큼은 잃는다 (lost에 누적).
+    """
+
+    def __init__(self, capacity):
+        self.data = np.zeros(capacity, dtype=np.float32)
+        self.written = 0
+        self.lost = 0
+
+    def write(self, block):
+        n = len(block)
+        size = len(self.data)
+        if n > size:
+            self.written += n - size  # 앞부분은 바로 덮어써지므로 건너뜀
+            block = block[n - size:]
+            n = size
+        pos = self.written % size
+        first = min(n, size - pos)
+        self.data[pos:pos + first] = block[:first]
+        self.data[:n - first] = block[first:]
+        self.written += n
+
+    def read(self, start):
+        """[start, written) 복사본과 다음 읽을 위치 - 덮어써진 부분은 건너뜀"""
+        end = self.written
+        size = len(self.data)
+        if end - start > size:
+            self.lost += end - size - start
+            start = end - size
+        a, b = start % size, end % size
+        if end == start:
+            return self.data[:0].copy(), end
+        if a < b:
+            return self.data[a:b].copy(), end
+        return np.concatenate((self.data[a:], self.data[:b])), end
+
+class StreamResampler:
+    """블록 단위 다상(polyphase) FIR 리샘플러 - 블록 경계를 넘어 필터 상태를 이어감
+
+    출력 n번째 샘플은 업샘플 좌표 u = n × down 에서 계산: 입력 i = u // up, 위상 p = u % up,
+    y[n] = Σ_k h[p + k × up] × x[i - k]. 한 블록의 출력 전체를 (출력 수 × 탭 수) 행렬 곱 한 번으로 계산한다.
+    """
+
+    def __init__(self, in_rate, out_rate=SAMPLE_RATE):
+        from math import gcd
+        from scipy.signal import firwin
+        g = gcd(int(in_rate), int(out_rate))
+        self.up, self.down = int(out_rate) // g, int(in_rate) // g
+        max_rate = max(self.up, self.down)
+        if max_rate == 1:
+            taps, h = 1, np.ones(1)  # 같은 레이트 - 그대로 통과
+        else:
+            taps = 2 * RESAMPLE_HALF_LEN * max_rate + 1
+            h = firwin(taps, 1.0 / max_rate, window=("kaiser", 5.0)) * self.up
+        self.h = h
+        # 위상별 필터 (up × K), k번째 탭이 x[i - k]에 곱해짐
+        self.taps_per_phase = -(-taps // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up)
+        padded[:taps] = h
+        self.phases = padded.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+        self.offsets = np.arange(self.taps_per_phase)
+        self.history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self.u = 0  # 다음 출력의 업샘플 좌표 (현재 블록 시작 기준)
+
+    def process(self, block):
+        """입력 블록 → 16kHz 출력 (길이는 블록마다 다를 수 있음)"""
+        n_in = len(block)
+        ext = np.concatenate((self.history, block.astype(np.float32, copy=False)))
+        total = n_in * self.up
+        if self.u >= total:
+            n_out = 0
+        else:
+            n_out = -(-(total - self.u) // self.down)
+        u = self.u + np.arange(n_out) * self.down
+        i = u // self.up + len(self.history)  # ext 기준 입력 위치
+        frames = ext[i[:, None] - self.offsets[None, :]]  # (출력 수, K)
+        out = np.einsum("nk,nk->n", frames, self.phases[u % self.up])
+        self.u += n_out * self.down - total
+        self.history = ext[len(ext) - len(self.history):]
+        return out
+
+class ResampleWorker:
+    """원본 레이트 링 버퍼 → 16kHz 녹음 버퍼 변환 스레드 (오디오 콜백 밖에서 리샘플링)"""
+
+    def __init__(self, ring, resampler, capture):
+        self.ring = ring
+        self.resampler = resampler
+        self.capture = capture
+        self.pos = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """남은 오디오까지 변환하고 종료 (VAD/변환기가 마지막 부분까지 보도록)"""
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            stopping = self.stop_event.is_set()
+            if self.ring.written > self.pos:
+                block, self.pos = self.ring.read(self.pos)
+                self.capture.write(self.resampler.process(block))
+            if stopping:
+                break
+            time.sleep(RESAMPLE_POLL_SEC)
+
+class CallbackMonitor:
+    """오디오 콜백 상태 감시 - 녹음별 overflow/underflow, 콜백 실행 시간 분포, 손실 오디오 추정
+
+    콜백 안에서는 정수/실수 갱신만 함 (할당 없음). 실행 시간은 블록 길이(마감 시간) 대비 비율로
+    CALLBACK_LOAD_BINS 구간에 누적하고, 손실은 입력 ADC 시각의 빈틈과 overflow 횟수로 추정한다.
+    """
+
+    def __init__(self, rate=SAMPLE_RATE):
+        self.rate = rate
+        self.reset()
+
+    def reset(self, rate=None):
+        """새 녹음 시작 - 카운터 초기화"""
+        if rate:
+            self.rate = rate
+        self.callbacks = 0
+        self.overflows = 0
+        self.underflows = 0
+        self.late = 0  # 블록 길이보다 오래 걸린 콜백 수
+        self.max_elapsed = 0.0
+        self.max_load = 0.0
+        self.hist = [0] * (len(CALLBACK_LOAD_BINS) + 1)
+        self.block_sec = 0.0
+        self.gap_sec = 0.0  # ADC 시각이 끊긴 길이 합
+        self.next_adc = None
+
+    def record(self, frames, time_info, status, elapsed):
+        """콜백 한 번 기록 (오디오 콜백에서 호출)"""
+        self.callbacks += 1
+        if status:
+            if status.input_overflow:
+                self.overflows += 1
+            if status.input_underflow:
+                self.underflows += 1
+        block_sec = frames / self.rate
+        self.block_sec = block_sec
+        load = elapsed / block_sec if block_sec else 0.0
+        i = 0
+        while i < len(CALLBACK_LOAD_BINS) and load > CALLBACK_LOAD_BINS[i]:
+            i += 1
+        self.hist[i] += 1
+        if load > 1.0:
+            self.late += 1
+        if elapsed > self.max_elapsed:
+            self.max_elapsed = elapsed
+            self.max_load = load
+        # 블록 시작 ADC 시각이 예상보다 한 블록 이상 늦으면 그만큼 빠진 것 (호스트 API가 0을 주면 건너뜀)
+        adc = getattr(time_info, "inputBufferAdcTime", 0) or 0
+        if adc and self.next_adc is not None:
+            gap = adc - self.next_adc
+            if gap > block_sec:
+                self.gap_sec += gap
+        self.next_adc = adc + block_sec if adc else None
+
+    def falling_behind(self):
+        return bool(self.overflows or self.late or self.max_load > CALLBACK_WARN_LOAD)
+
+    def load_percentile(self, q):
+        """콜백 부하(실행 시간 / 블록 길이)의 q 백분위수 - 해당 구간의 상한값"""
+        if not self.callbacks:
+            return None
+        target = self.callbacks * q / 100
+        seen = 0
+        for count, edge in zip(self.hist, CALLBACK_LOAD_BINS):
+            seen += count
+            if seen >= target:
+                return edge
+        return self.max_load
+
+    def lost_sec(self, dropped_samples=0):
+        """손실 오디오 추정 (초) - ADC 빈틈과 overflow당 한 블록 중 큰 쪽 + 버퍼 부족으로 버린 샘플"""
+        return max(self.gap_sec, self.overflows * self.block_sec) + dropped_samples / SAMPLE_RATE
+
+    def summary(self, dropped_samples=0):
+        """녹음 정보에 넣을 요약"""
+        return {
+            "callbacks": self.callbacks,
+            "input_overflows": self.overflows,
+            "input_underflows": self.underflows,
+            "late_callbacks": self.late,
+            "callback_max_ms": round(self.max_elapsed * 1000, 3),
+            "callback_p95_load": self.load_percentile(95),
+            "lost_audio_sec": round(self.lost_sec(dropped_samples), 3),
+        }
+
+    def format_hist(self):
+        """콜백 부하 분포 한 줄 (로그용)"""
+        edges = ["≤%g" % e for e in CALLBACK_LOAD_BINS] + [">%g" % CALLBACK_LOAD_BINS[-1]]
+        return " ".join(f"{e}:{n}" for e, n in zip(edges, self.hist) if n)
+
+def native_input_rate():
+    """기본 입력 장치의 기본 샘플레이트 (알 수 없으면 16kHz)"""
+    try:
+        return int(sd.query_devices(kind="input")["default_samplerate"])
+    except Exception:
+        return SAMPLE_RATE
+
+class SileroTorchVAD:
+    """silero-vad (torch) 래퍼 - 512샘플 창을 순서대로 넣어 RNN 상태를 이어감"""
+
+    def __init__(self, model):
+        import torch
+        self.torch = torch
+        self.model = model
+
+    def reset(self):
+        """녹음 시작 시 RNN 상태 초기화"""
+        if hasattr(self.model, "reset_states"):
+            self.model.reset_states()
+
+    def __call__(self, frames):
+        """frames: (n, VAD_FRAME) float32 → 창별 음성 확률 (n,)"""
+        probs = np.empty(len(frames), dtype=np.float32)
+        with self.torch.no_grad():
+            for i, frame in enumerate(frames):
+                probs[i] = self.model(self.torch.from_numpy(frame), SAMPLE_RATE).item()
+        return probs
+
+class SileroOnnxVAD:
+    """silero-vad ONNX (onnxruntime) - torch/네트워크 불필요, faster-whisper 내장 모델 사용"""
+
+    CONTEXT = 64  # 16kHz에서 창 앞에 붙이는 직전 샘플 수
+
+    def __init__(self, path=None):
+        import onnxruntime
+        if not path:
+            from faster_whisper.vad import get_assets_path
+            path = os.path.join(get_assets_path(), "silero_vad_v6.onnx")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"silero ONNX 모델 없음: {path} (vad_onnx_path 설정 필요)")
+
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        opts.log_severity_level = 4
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"],
+                                                    sess_options=opts)
+        # 다른 faster-whisper 버전의 모델은 입력이 다름 (v5: 인코더/디코더 분리) - 로드 단계에서 실패시켜 대체
+        inputs = sorted(i.name for i in self.session.get_inputs())
+        if inputs != ["c", "h", "input"]:
+            raise ValueError(f"지원하지 않는 silero ONNX 모델 (입력 {inputs}): {path}")
+        self.reset()
+
+    def reset(self):
+        self.h = np.zeros((1, 1, 128), dtype=np.float32)
+        self.c = np.zeros((1, 1, 128), dtype=np.float32)
+        self.context = np.zeros(self.CONTEXT, dtype=np.float32)
+
+    def __call__(self, frames):
+        """frames: (n, VAD_FRAME) → (n,) - 창마다 직전 64샘플을 붙여 한 번에 추론, 상태는 이어감"""
+        batch = np.empty((len(frames), self.CONTEXT + VAD_FRAME), dtype=np.float32)
+        batch[:, self.CONTEXT:] = frames
+        batch[0, :self.CONTEXT] = self.context
+        batch[1:, :self.CONTEXT] = frames[:-1, -self.CONTEXT:]
+        self.context = frames[-1, -self.CONTEXT:].copy()
+        probs, self.h, self.c = self.session.run(None, {"input": batch, "h": self.h, "c": self.c})
+        return probs.reshape(-1)
+
+class EnergyVAD:
+    """NumPy 에너지/스펙트럼 VAD - 모델 없이 창 묶음을 한 번에 계산 (가장 가벼움)"""
+
+    uses_gate = False  # 잡음 바닥 추정에 조용한 창도 필요
+
+    def __init__(self):
+        freqs = np.fft.rfftfreq(VAD_FRAME, 1 / SAMPLE_RATE)
+        self.band = (freqs >= 100) & (freqs <= 4000)  # 음성 주파수 대역
+        self.window = np.hanning(VAD_FRAME).astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        self.noise_db = None  # 잡음 바닥 (dB)
+
+    def __call__(self, frames):
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        spec = np.abs(np.fft.rfft(frames * self.window, axis=1)) ** 2
+        band = spec[:, self.band] + 1e-12
+        # 스펙트럼 평탄도: 잡음은 1에 가깝고(백색잡음 ~0.56), 유성음은 배음 때문에 낮음
+        flatness = np.exp(np.mean(np.log(band), axis=1)) / np.mean(band, axis=1)
+
+        # 잡음 바닥: 조용한 창이 오면 바로 내려가고, 없으면 천천히 (창당 0.02dB) 올라감
+        lowest = max(float(energy_db.min()), -70.0)
+        if self.noise_db is None:
+            self.noise_db = lowest
+        else:
+            self.noise_db = min(lowest, self.noise_db + 0.02 * len(frames))
+
+        snr = energy_db - self.noise_db
+        loud = 1 / (1 + np.exp(-(snr - 10) / 2))  # 잡음 바닥보다 10dB 위에서 0.5
+        tonal = np.clip((0.4 - flatness) / 0.3, 0, 1)
+        # 평탄한 큰 소리(잡음)는 최대 0.5 - 음성 판정(> 0.5)에는 배음 구조가 필요
+        return (loud * (0.5 + 0.5 * tonal)).astype(np.float32)
+
+def create_vad(backend, onnx_path=None):
+    """VAD 백엔드 생성 - silero_onnx / energy / silero(torch)"""
+    if backend == "silero_onnx":
+        return SileroOnnxVAD(onnx_path)
+    if backend == "energy":
+        return EnergyVAD()
+    if backend == "silero":
+        import torch
+        model, _ = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad', trust_repo=True)
+        return SileroTorchVAD(model)
+    raise ValueError(f"알 수 없는 VAD 백엔드: {backend}")
+
+def get_rss_mb():
+    """현재 프로세스 상주 메모리 (MB) - psutil이 없으면 OS 기능 사용"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + \
+                           [(name, ctypes.c_size_t) for name in (
+                               "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                               "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                               "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                     ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize / 1024 / 1024
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except Exception:
+        return 0.0
+
+class VADPipeline:
+    """VAD 단계 - 녹음 버퍼를 정확히 512샘플 창으로 나눠 별도 스레드에서 음성 확률 계산
+
+    오디오 콜백은 CaptureBuffer에 쓰고 length만 올리며, 이 스레드는 length까지만 읽는다
+    (단일 생산자/단일 소비자라 잠금 없음). 확실한 침묵 창은 RMS 게이트로 추론을 건너뛴다.
+    """
+
+    def __init__(self, vad, buffer, silence_sec=None, on_silence_timeout=None):
+        self.vad = vad  # 창 배열 → 확률 배열
+        self.buffer = buffer
+        self.silence_sec = silence_sec  # 음성 후 이만큼 침묵하면 on_silence_timeout 호출
+        self.on_silence_timeout = on_silence_timeout
+        self.probs = np.zeros(buffer.capacity // VAD_FRAME, dtype=np.float32)  # 창별 음성 확률
+        self.n_frames = 0  # 처리한 창 수
+        self.gated = 0  # 에너지 게이트로 추론을 건너뛴 창 수
+        self.after_gap = False  # 마지막 창을 게이트로 건너뜀 - 다음 추론 전에 상태 초기화
+        self.trimmed = 0  # trim()으로 변환에서 제외한 샘플 수
+        self.speech_detected = False
+        self.silence_frames = 0
+        self.timed_out = False
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.vad.reset()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """중지 - 이미 녹음된 창까지 처리하고 종료"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+
+    def _run(self):
+        while True:
+            stopped = self.stop_event.wait(VAD_POLL_SEC)
+            available = min(len(self.buffer) // VAD_FRAME, len(self.probs))
+            if available > self.n_frames:
+                frames = self.buffer.view(self.n_frames * VAD_FRAME, available * VAD_FRAME)
+                try:
+                    self._process(frames.reshape(-1, VAD_FRAME))
+                except Exception as e:
+                    print(f"[Voice App] VAD 오류: {e}")
+                    break
+            if stopped:
+                break
+
+    def _process(self, frames):
+        # 에너지 게이트 - 확실한 침묵은 확률 0
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        voiced = rms >= VAD_ENERGY_GATE
+        if not getattr(self.vad, "uses_gate", True):
+            voiced[:] = True
+        probs = np.zeros(len(frames), dtype=np.float32)
+        # 연속된 음성 창 묶음마다 추론 - 건너뛴 창 뒤에서는 RNN 상태를 초기화 (못 본 구간을 잇지 않도록)
+        edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+        for s, e in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            if s > 0 or self.after_gap:
+                self.vad.reset()
+            probs[s:e] = self.vad(frames[s:e])
+        self.after_gap = not voiced[-1]
+        self.gated += int(len(frames) - voiced.sum())
+        self.probs[self.n_frames:self.n_frames + len(frames)] = probs
+        self.n_frames += len(frames)
+        self._track_silence(probs)
+
+    def _track_silence(self, probs):
+        """음성 이후 침묵 길이 추적 - 오디오 샘플 기준 (벽시계 아님)"""
+        if self.silence_sec is None or self.timed_out:
+            return
+        speech = np.flatnonzero(probs > VAD_THRESHOLD)
+        if len(speech):
+            self.speech_detected = True
+            self.silence_frames = len(probs) - 1 - speech[-1]
+        elif self.speech_detected:
+            self.silence_frames += len(probs)
+        if self.speech_detected and self.silence_frames * VAD_FRAME >= self.silence_sec * SAMPLE_RATE:
+            self.timed_out = True
+            if self.on_silence_timeout:
+                self.on_silence_timeout()
+
+    def speech_probs(self):
+        """지금까지의 창별 음성 확률 (창 i = 샘플 i*VAD_FRAME부터)"""
+        return self.probs[:self.n_frames]
+
+    def speech_regions(self, start, end, pad_sec=TRIM_PAD_SEC, min_gap_sec=TRIM_MIN_GAP_SEC):
+        """[start, end) 샘플 범위 안의 음성 구간 [(s, e), ...] - 앞뒤 여유 포함, 짧은 틈은 병합
+
+        아직 VAD가 처리하지 못한 끝부분은 음성으로 간주한다.
+        """
+        n_frames = self.n_frames
+        f0 = start // VAD_FRAME
+        f1 = min(-(-end // VAD_FRAME), n_frames)
+        regions = []
+        if f1 > f0:
+            speech = np.concatenate(([0], (self.probs[f0:f1] > VAD_THRESHOLD).astype(np.int8), [0]))
+            edges = np.diff(speech)
+            for s, e in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+                regions.append([int(f0 + s) * VAD_FRAME, int(f0 + e) * VAD_FRAME])
+        covered = max(n_frames * VAD_FRAME, start)
+        if covered < end:
+            regions.append([covered, end])
+
+        pad = int(pad_sec * SAMPLE_RATE)
+        min_gap = int(min_gap_sec * SAMPLE_RATE)
+        merged = []
+        for s, e in regions:
+            s, e = max(s - pad, start), min(e + pad, end)
+            if merged and s - merged[-1][1] < min_gap:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        return [(s, e) for s, e in merged]
+
+    def trim(self, start, end, count=True):
+        """[start, end) 구간에서 음성 부분만 float32로 반환 - 건너뛴 샘플 수는 trimmed에 누적
+
+        이미 변환한 구간을 다시 자를 때(2단계 변환)는 count=False로 - 같은 침묵을 두 번 세지 않게.
+
+        음성 구간 사이에는 TRIM_JOIN_SEC 길이의 침묵을 넣어 잇는다 (긴 쉼이 있었음을 모델이 알도록).
+        음성을 전혀 찾지 못하면 (VAD 오검출 대비) 구간 전체를 그대로 반환한다.
+        """
+        regions = self.speech_regions(start, end)
+        kept = sum(e - s for s, e in regions)
+        if not regions or kept == end - start:
+            return self.buffer.view(start, end)
+        if len(regions) == 1:
+            audio = self.buffer.view(*regions[0])
+        else:
+            join = np.zeros(int(TRIM_JOIN_SEC * SAMPLE_RATE), dtype=np.float32)
+            parts = [join] * (2 * len(regions) - 1)
+            parts[::2] = [self.buffer.view(s, e) for s, e in regions]
+            audio = np.concatenate(parts)
+        if count:
+            self.trimmed += (end - start) - len(audio)
+        return audio
+
+class StreamingTranscriber:
+    """녹음 중 완성된 청크를 백그라운드에서 미리 변환 (종료 시 마지막 청크만 남음)"""
+
+    def __init__(self, transcribe_fn, on_partial=None):
+        self.transcribe_fn = transcribe_fn  # (start, end, initial_prompt, cancel_event, info) -> text
+        self.on_partial = on_partial  # 누적 텍스트 갱신 시 호출 (백그라운드 스레드)
+        self.buffer = None
+        self.committed = 0  # 변환에 넘긴 마지막 샘플 위치
+        self.texts = []
+        self.info = {}  # 청크 변환 정보 누적 (프로필, 디코딩 시간)
+        self.stop_event = threading.Event()
+        self.cancel_event = threading.Event()  # 진행 중인 청크 변환까지 중단
+        self.thread = None
+
+    def start(self, buffer):
+        """녹음 버퍼 감시 시작 (오디오 콜백이 쓰는 CaptureBuffer)"""
+        self.buffer = buffer
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(STREAM_POLL_SEC):
+            if self.cancel_event.is_set():
+                break
+            split = find_silence_split(self.buffer.view(self.committed, len(self.buffer)))
+            if split is None:
+                continue
+            try:
+                self._decode(self.committed, self.committed + split)
+            except TranscriptionCancelled:
+                break
+            except Exception as e:
+                # committed를 넘기지 않고 중단 - finish()가 남은 구간 전체를 다시 변환
+                print(f"[Voice App] 스트리밍 변환 오류 (종료 시 다시 변환): {e}")
+                break
+            self.committed += split
+
+    def _decode(self, start, end):
+        """[start, end) 청크 변환 - 이전 텍스트를 프롬프트로 넘겨 문맥 유지 (오류는 호출자에게)"""
+        prompt = " ".join(self.texts)[-200:] or None
+        text = self.transcribe_fn(start, end, prompt, self.cancel_event, self.info)
+        if text:
+            self.texts.append(text)
+            if self.on_partial:
+                self.on_partial(self.text)
+
+    @property
+    def text(self):
+        return " ".join(self.texts).strip()
+
+    def wait_idle(self):
+        """지금까지 들어온 오디오에서 자를 수 있는 청크를 모두 변환할 때까지 대기 (벤치마크용)"""
+        while not self.cancel_event.is_set() and self.thread.is_alive() and \
+                find_silence_split(self.buffer.view(self.committed, len(self.buffer))) is not None:
+            time.sleep(STREAM_POLL_SEC / 5)
+
+    def finish(self):
+        """녹음 종료 - 남은 구간만 변환하고 전체 텍스트 반환 (변환 오류는 그대로 전달)"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        if self.cancel_event.is_set():
+            raise TranscriptionCancelled()
+        end = len(self.buffer)
+        if end > self.committed:
+            self._decode(self.committed, end)
+            self.committed = end
+        if self.cancel_event.is_set():
+            raise TranscriptionCancelled()
+        return self.text
+
+    def cancel(self):
+        """취소 - 진행 중인 청크 변환도 중단"""
+        self.stop_event.set()
+        self.cancel_event.set()
 
 class VoiceApp:
     def __init__(self):
+        self.timeline = StartupTimeline(PROCESS_START)
+        load_gui_modules()
+        self.timeline.mark("imports")
         self.config = load_config()
-        self.model = None
+        self.history = HistoryStore()
+        self.history.migrate_from_config(self.config)
+        self.archive = AudioArchive(budget_mb=self.config.get("archive_budget_mb", 500))
+        self.config_save_id = None  # 예약된 config.json 저장 (측정값 변경을 모아서 저장)
+        self.engine = Transcriber(self.config, post=self.post_config_change)
+        self.draft_engine = Transcriber(self.config, post=self.engine.post)  # two_pass 초안용 작은 모델
+        self.active_engine = self.engine  # 현재 녹음을 변환하는 엔진
+        self.last_history_id = None  # 결과 창에 표시 중인 히스토리 항목
+        batch = self.config.get("batch_decode", False)
+        self.model_cache = ModelCache(self.config.get("model_cache_mb", 4000), decode_workers(self.config),
+                                      remote=self.config.get("inference_process", False),
+                                      batch_wait=self.config.get("batch_max_wait_ms", 50) / 1000 if batch else None)
+        self.device, self.compute_type = "cpu", "int8"
+        self.switch_seq = 0  # 마지막 모델 전환 요청 번호
         self.recording = False
-        self.audio_data = []
+        self.capture = None  # 현재 녹음 버퍼 (CaptureBuffer)
         self.stream = None
         self.timeout_id = None
         self.tray_icon = None
         self.model_loaded = False
+        self.load_state = "idle"  # idle → loading/downloading → vad → warmup → ready (또는 error)
         self.lock_socket = None
+        self.service = None  # 로컬 변환 서비스 (소켓 리스너 시작 시 생성)
         self.hotkey_pressed = False
         self.timer_id = None
         self.record_seconds = 0
         self.current_volume = 0  # 음성 레벨
         self.vad_model = None
-        self.silence_start = None  # 침묵 시작 시간
-        self.speech_detected = False  # 음성 감지 여부
+        self.vad = None  # 현재 녹음의 VAD 파이프라인
+        self.last_vad = None  # 마지막으로 시작한 VAD 파이프라인 (종료 후에도 남은 창을 처리 중일 수 있음)
+        self.streamer = None  # 녹음 중 스트리밍 변환기
+        self.metrics = MetricsLog()
+        self.stream_open_sec = 0  # 현재 녹음의 입력 스트림 여는 데 걸린 시간
+        self.record_started = 0
+        self.trigger_time = None  # 핫키/버튼을 누른 시각
+        self.first_audio_time = None  # 녹음 시작 후 첫 오디오 블록이 도착한 시각
+        self.warm_stream = False  # self.stream이 녹음과 상관없이 계속 열려 있는지
+        self.preroll = None  # warm_stream일 때 PreRollBuffer
+        self.preroll_pending = False  # 다음 콜백에서 프리롤을 녹음 앞에 붙임
+        self.stream_rate = SAMPLE_RATE  # 입력 스트림 샘플레이트 (native_rate_capture면 장치 기본값)
+        self.raw_ring = None  # native_rate_capture: 콜백이 쓰는 원본 오디오
+        self.resampler = None  # native_rate_capture: ResampleWorker
+        self.monitor = CallbackMonitor()  # 현재 녹음의 오디오 콜백 상태
+        self.monitor_warned = False  # 이번 녹음에서 캡처 지연 경고를 했는지
+        self.models_unloaded = False  # 유휴 시간이 지나 모델을 내린 상태
+        self.last_recording = time.monotonic()  # 마지막 녹음 시작 시각 (유휴 판단)
+        self.vad_unloaded = False  # torch VAD를 내리고 EnergyVAD로 대체 중
+        # 변환 작업 큐 (결과는 UI 스레드로 전달) - 배치 디코딩이면 연달아 녹음한 클립을 함께 넘김
+        # (모델을 동시에 쓰는 디코딩 수는 BatchScheduler가 모델 작업자 수로 제한)
+        self.worker = TranscriptionWorker(
+            on_done=lambda job: self.root.after(0, self.on_transcription_done, job),
+            threads=BATCH_MAX_SIZE if batch else 1)
+        # 2단계 변환의 큰 모델 작업은 별도 큐 - 다음 녹음의 초안이 기다리지 않게
+        self.refine_worker = TranscriptionWorker(
+            on_done=lambda job: self.root.after(0, self.on_refine_done, job))
+        # 보관된 녹음 다시 변환도 별도 큐 - 큰 모델 변환 중에도 받아쓰기가 기다리지 않게
+        self.retranscribe_worker = TranscriptionWorker(
+            on_done=lambda job: self.root.after(0, self.on_retranscribe_done, job))
 
         # UI 설정
         self.root = tk.Tk()
@@ -302,11 +2619,14 @@ class VoiceApp:
 
         # 창 닫기 버튼 동작 변경 (숨기기)
         self.root.protocol("WM_DELETE_WINDOW", self.hide_window)
+        self.timeline.mark("ui")
 
     def on_escape(self, event=None):
-        """ESC 키 처리 - 녹음 중이면 취소, 아니면 창 숨김"""
+        """ESC 키 처리 - 녹음 중이면 취소, 변환 중이면 변환 취소, 아니면 창 숨김"""
         if self.recording:
             self.cancel_recording()
+        elif self.worker.pending_count():
+            self.cancel_transcription()
         else:
             self.hide_window()
 
@@ -314,7 +2634,7 @@ class VoiceApp:
         """설정 창 표시"""
         settings_win = tk.Toplevel(self.root)
         settings_win.title("설정")
-        settings_win.geometry("300x350")
+        settings_win.geometry("300x630")
         settings_win.attributes("-topmost", True)
         settings_win.resizable(False, False)
         settings_win.transient(self.root)
@@ -368,15 +2688,76 @@ class VoiceApp:
         silence_combo = ttk.Combobox(frame, textvariable=silence_var, values=list(silence_options.keys()), state="readonly", width=15)
         silence_combo.grid(row=4, column=1, pady=5, padx=10)
 
+        # VAD 방식
+        ttk.Label(frame, text="VAD 방식:", font=("맑은 고딕", 10)).grid(row=5, column=0, sticky="w", pady=5)
+        vad_backend_var = tk.StringVar(value=self.config.get("vad_backend", "silero_onnx"))
+        vad_backend_combo = ttk.Combobox(frame, textvariable=vad_backend_var, values=VAD_BACKENDS, state="readonly", width=15)
+        vad_backend_combo.grid(row=5, column=1, pady=5, padx=10)
+
+        # 디코딩 프로필
+        ttk.Label(frame, text="디코딩:", font=("맑은 고딕", 10)).grid(row=6, column=0, sticky="w", pady=5)
+        profile_var = tk.StringVar(value=self.config.get("decode_profile", "auto"))
+        profile_combo = ttk.Combobox(frame, textvariable=profile_var, values=["auto"] + list(DECODE_PROFILES), state="readonly", width=15)
+        profile_combo.grid(row=6, column=1, pady=5, padx=10)
+
+        # 녹음 중 미리 변환
+        streaming_var = tk.BooleanVar(value=self.config.get("streaming_transcribe", True))
+        streaming_check = ttk.Checkbutton(frame, text="녹음 중 미리 변환 (긴 녹음 빠르게 완료)",
+                                          variable=streaming_var)
+        streaming_check.grid(row=7, column=0, columnspan=2, sticky="w", pady=5)
+
         # 시작 시 자동 실행
         autostart_var = tk.BooleanVar(value=get_autostart_enabled())
         autostart_check = ttk.Checkbutton(frame, text="Windows 시작 시 자동 실행" if sys.platform == "win32" else "로그인 시 자동 실행",
                                           variable=autostart_var)
-        autostart_check.grid(row=5, column=0, columnspan=2, sticky="w", pady=8)
+        autostart_check.grid(row=8, column=0, columnspan=2, sticky="w", pady=8)
+
+        # 녹음 보관
+        archive_var = tk.BooleanVar(value=self.config.get("archive_audio", False))
+        archive_check = ttk.Checkbutton(frame, text=f"녹음 보관 (다시 변환용, 최대 {self.archive.budget_mb}MB)",
+                                        variable=archive_var)
+        archive_check.grid(row=9, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 2단계 변환
+        two_pass_var = tk.BooleanVar(value=self.config.get("two_pass", False))
+        two_pass_check = ttk.Checkbutton(frame, text=f"2단계 변환 ({self.config.get('draft_model', 'tiny')} 초안 → 모델 결과로 교체)",
+                                         variable=two_pass_var)
+        two_pass_check.grid(row=10, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 입력 스트림 유지
+        warm_var = tk.BooleanVar(value=self.config.get("warm_stream", False))
+        warm_check = ttk.Checkbutton(frame, text="마이크 계속 열어 두기 (첫 음절 잘림 방지)",
+                                     variable=warm_var)
+        warm_check.grid(row=11, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 장치 기본 샘플레이트로 녹음
+        native_var = tk.BooleanVar(value=self.config.get("native_rate_capture", False))
+        native_check = ttk.Checkbutton(frame, text="장치 샘플레이트로 녹음 (헤드셋 녹음 오류 시)",
+                                       variable=native_var)
+        native_check.grid(row=12, column=0, columnspan=2, sticky="w", pady=5)
+
+        # CPU 자동 보정
+        calibrate_var = tk.BooleanVar(value=self.config.get("auto_calibrate", False))
+        calibrate_check = ttk.Checkbutton(frame, text="CPU 자동 보정 (처음 쓰는 모델이면 백그라운드 측정)",
+                                          variable=calibrate_var)
+        calibrate_check.grid(row=13, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 유휴 시 모델 해제
+        ttk.Label(frame, text="모델 해제:", font=("맑은 고딕", 10)).grid(row=14, column=0, sticky="w", pady=5)
+        idle_options = {"안 함": 0, "5분 유휴": 5, "15분 유휴": 15, "30분 유휴": 30, "1시간 유휴": 60}
+        current_idle_text = "안 함"
+        for label, val in idle_options.items():
+            if val == self.config.get("idle_unload_min", 0):
+                current_idle_text = label
+                break
+        idle_var = tk.StringVar(value=current_idle_text)
+        idle_combo = ttk.Combobox(frame, textvariable=idle_var, values=list(idle_options.keys()), state="readonly", width=15)
+        idle_combo.grid(row=14, column=1, pady=5, padx=10)
 
         # 현재 모델 표시
-        current_label = ttk.Label(frame, text=f"현재 로드됨: {self.config.get('model_size', 'small')}", font=("맑은 고딕", 9), foreground="gray")
-        current_label.grid(row=6, column=0, columnspan=2, pady=5)
+        cached = ", ".join(key[0] for key in self.model_cache.keys())
+        current_label = ttk.Label(frame, text=f"현재 로드됨: {self.engine.model_size or '-'} (캐시: {cached or '-'})", font=("맑은 고딕", 9), foreground="gray")
+        current_label.grid(row=15, column=0, columnspan=2, pady=5)
 
         def save_and_close():
             new_model = model_var.get()
@@ -385,33 +2766,81 @@ class VoiceApp:
             new_vad = vad_var.get()
             new_silence = silence_options.get(silence_var.get(), 5)
             model_changed = new_model != self.config.get("model_size")
+            vad_changed = (new_vad != self.config.get("vad_enabled", True) or
+                           vad_backend_var.get() != self.config.get("vad_backend", "silero_onnx"))
 
             self.config["model_size"] = new_model
             self.config["language"] = new_lang
             self.config["max_record_sec"] = new_max_sec
             self.config["vad_enabled"] = new_vad
             self.config["vad_silence_sec"] = new_silence
+            self.config["vad_backend"] = vad_backend_var.get()
+            self.config["decode_profile"] = profile_var.get()
+            self.config["streaming_transcribe"] = streaming_var.get()
+            self.config["archive_audio"] = archive_var.get()
+            two_pass_on = two_pass_var.get() and not self.config.get("two_pass", False)
+            self.config["two_pass"] = two_pass_var.get()
+            self.config["warm_stream"] = warm_var.get()
+            native_changed = native_var.get() != self.config.get("native_rate_capture", False)
+            self.config["native_rate_capture"] = native_var.get()
+            self.config["idle_unload_min"] = idle_options.get(idle_var.get(), 0)
+            calibrate_on = calibrate_var.get() and not self.config.get("auto_calibrate", False)
+            self.config["auto_calibrate"] = calibrate_var.get()
             save_config(self.config)
 
             # 자동 시작 설정
             set_autostart_enabled(autostart_var.get())
 
-            if model_changed:
-                messagebox.showinfo("설정", f"모델이 '{new_model}'로 변경됩니다.\n앱을 재시작해주세요.", parent=settings_win)
+            # VAD 다시 로드 (다음 녹음부터 적용)
+            if vad_changed and self.model_loaded:
+                threading.Thread(target=self.load_vad, daemon=True).start()
+
+            # 입력 스트림 유지 전환 (녹음 중이면 녹음이 끝난 뒤 다음 녹음부터)
+            if not self.recording:
+                if native_changed:
+                    self.close_warm_stream()  # 새 샘플레이트로 다시 엶
+                if warm_var.get():
+                    if self.model_loaded:
+                        self.open_warm_stream()
+                else:
+                    self.close_warm_stream()
+                    self.preroll = None
+
+            # 2단계 변환을 켰으면 초안 모델 로드 (로드 전까지는 한 번만 변환)
+            if two_pass_on and self.model_loaded and self.draft_engine.model is None:
+                threading.Thread(target=self.load_draft_model, daemon=True).start()
+
+            # 자동 보정을 켰으면 지금 모델부터 측정 (모델을 바꾸면 새 모델 로드 후)
+            if calibrate_on and self.model_loaded and not model_changed:
+                self.maybe_calibrate()
+
             settings_win.destroy()
 
+            # 모델 교체 (재시작 없이 백그라운드 로드 후 교체)
+            if model_changed and self.model_loaded:
+                self.switch_model(new_model)
+
         # 저장 버튼
-        ttk.Button(frame, text="저장", width=10, command=save_and_close).grid(row=7, column=0, columnspan=2, pady=15)
+        ttk.Button(frame, text="저장", width=10, command=save_and_close).grid(row=16, column=0, columnspan=2, pady=15)
 
     def show_history(self):
         """히스토리 창 표시"""
         history_win = tk.Toplevel(self.root)
         history_win.title("히스토리")
-        history_win.geometry("400x300")
+        history_win.geometry("400x340")
         history_win.attributes("-topmost", True)
         history_win.resizable(False, False)
         history_win.transient(self.root)
 
+        # 검색창
+        search_var = tk.StringVar()
+        search_frame = ttk.Frame(history_win, padding=(10, 10, 10, 0))
+        search_frame.pack(fill="x")
+        ttk.Label(search_frame, text="검색").pack(side="left")
+        ttk.Entry(search_frame, textvariable=search_var).pack(side="left", fill="x", expand=True, padx=(5, 0))
+        count_label = ttk.Label(search_frame, text="", foreground="gray")
+        count_label.pack(side="left", padx=(5, 0))
+
         frame = ttk.Frame(history_win, padding=10)
         frame.pack(fill="both", expand=True)
 
@@ -419,47 +2848,173 @@ class VoiceApp:
         scrollbar = ttk.Scrollbar(frame)
         scrollbar.pack(side="right", fill="y")
 
-        listbox = tk.Listbox(frame, yscrollcommand=scrollbar.set, font=("맑은 고딕", 10), height=12)
+        listbox = tk.Listbox(frame, font=("맑은 고딕", 10), height=12)
         listbox.pack(fill="both", expand=True)
         scrollbar.config(command=listbox.yview)
 
-        # 히스토리 로드
-        history = self.config.get("history", [])
-        for item in reversed(history):  # 최신 먼저
-            listbox.insert("end", item[:60] + "..." if len(item) > 60 else item)
+        # 히스토리는 페이지 단위로 로드 - 스크롤이 끝에 가까워지면 다음 페이지
+        ids = []  # 리스트박스 줄 → 히스토리 id
+        entries = {}  # id → 항목 (다시 변환할 때 녹음 파일 확인)
+        state = {"query": "", "total": 0, "search_id": None}
+
+        def load_more():
+            if len(ids) >= state["total"]:
+                return
+            for item in self.history.page(len(ids), HISTORY_PAGE, state["query"]):
+                text = item["text"]
+                line = text[:60] + "..." if len(text) > 60 else text
+                if item.get("profile"):
+                    line = f"[{item['profile']} {item.get('latency_sec') or 0}s] {line}"  # 디코딩 프로필과 걸린 시간
+                if self.archive.exists(item.get("audio_file")):
+                    line = "♪ " + line  # 다시 변환 가능
+                if item.get("lost_audio_sec"):
+                    line = "⚠ " + line  # 녹음 중 오디오 손실
+                listbox.insert("end", line)
+                ids.append(item["id"])
+                entries[item["id"]] = item
 
-        if not history:
-            listbox.insert("end", "(히스토리 없음)")
+        def reload():
+            state["query"] = search_var.get().strip()
+            state["total"] = self.history.count(state["query"])
+            listbox.delete(0, "end")
+            ids.clear()
+            load_more()
+            count_label.config(text=f"{state['total']}개")
+            if not ids:
+                listbox.insert("end", "(검색 결과 없음)" if state["query"] else "(히스토리 없음)")
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9:
+                load_more()
+        listbox.config(yscrollcommand=on_scroll)
+
+        def on_search(*args):
+            # 입력이 멈추면 검색 (타이핑 중 매번 조회하지 않음)
+            if state["search_id"]:
+                history_win.after_cancel(state["search_id"])
+            state["search_id"] = history_win.after(250, reload)
+        search_var.trace_add("write", on_search)
+
+        reload()
 
         def copy_selected():
             selection = listbox.curselection()
-            if selection and history:
-                idx = len(history) - 1 - selection[0]  # reversed 순서 보정
-                pyperclip.copy(history[idx])
-                messagebox.showinfo("복사됨", "클립보드에 복사되었습니다.", parent=history_win)
+            if selection and selection[0] < len(ids):
+                text = self.history.get_text(ids[selection[0]])
+                if text:
+                    pyperclip.copy(text)
+                    messagebox.showinfo("복사됨", "클립보드에 복사되었습니다.", parent=history_win)
 
         def clear_history():
             if messagebox.askyesno("확인", "히스토리를 모두 삭제하시겠습니까?", parent=history_win):
-                self.config["history"] = []
-                save_config(self.config)
-                listbox.delete(0, "end")
-                listbox.insert("end", "(히스토리 없음)")
+                self.history.clear()
+                reload()
+
+        def retranscribe_selected():
+            selection = listbox.curselection()
+            item = entries.get(ids[selection[0]]) if selection and selection[0] < len(ids) else None
+            if item is None or not self.archive.exists(item.get("audio_file")):
+                messagebox.showinfo("다시 변환", "보관된 녹음이 없는 항목입니다.\n(설정에서 녹음 보관을 켜면 이후 녹음부터 보관됩니다)",
+                                    parent=history_win)
+                return
+            self.show_retranscribe(item, history_win)
 
         btn_frame = ttk.Frame(history_win)
         btn_frame.pack(pady=5)
         ttk.Button(btn_frame, text="복사", width=10, command=copy_selected).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="전체 삭제", width=10, command=clear_history).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="다시 변환", width=9, command=retranscribe_selected).pack(side="left", padx=3)
+        ttk.Button(btn_frame, text="전체 삭제", width=9, command=clear_history).pack(side="left", padx=3)
+        ttk.Button(btn_frame, text="통계", width=6, command=self.show_stats).pack(side="left", padx=3)
+
+    def show_retranscribe(self, item, parent):
+        """보관된 녹음을 다른 모델/언어로 다시 변환 - 결과는 새 히스토리 항목 + 클립보드"""
+        win = tk.Toplevel(parent)
+        win.title("다시 변환")
+        win.geometry("260x150")
+        win.attributes("-topmost", True)
+        win.resizable(False, False)
+        win.transient(parent)
+
+        frame = ttk.Frame(win, padding=15)
+        frame.pack(fill="both", expand=True)
 
-    def add_to_history(self, text):
-        """히스토리에 추가"""
+        ttk.Label(frame, text="모델 크기:", font=("맑은 고딕", 10)).grid(row=0, column=0, sticky="w", pady=5)
+        model_var = tk.StringVar(value="large-v3" if item.get("model") != "large-v3" else "medium")
+        ttk.Combobox(frame, textvariable=model_var, values=list(MODEL_MEMORY_MB), state="readonly",
+                     width=12).grid(row=0, column=1, pady=5, padx=10)
+
+        ttk.Label(frame, text="언어:", font=("맑은 고딕", 10)).grid(row=1, column=0, sticky="w", pady=5)
+        lang_var = tk.StringVar(value=self.config.get("language", "ko"))
+        ttk.Combobox(frame, textvariable=lang_var, values=["ko", "en", "ja", "zh"], state="readonly",
+                     width=12).grid(row=1, column=1, pady=5, padx=10)
+
+        def start():
+            self.retranscribe(item, model_var.get(), lang_var.get())
+            win.destroy()
+        ttk.Button(frame, text="변환", width=10, command=start).grid(row=2, column=0, columnspan=2, pady=10)
+
+    def retranscribe(self, item, model_size, language):
+        """다시 변환 작업 제출 - 별도 큐에서 (모델은 캐시에서 꺼내거나 새로 로드)"""
+        audio_file = item["audio_file"]
+
+        def run(job):
+            audio = self.archive.load(audio_file)
+            model, _ = self.load_cached_model(model_size)
+            engine = Transcriber(self.config, post=self.engine.post)
+            engine.model, engine.model_size = model, model_size
+            start = time.perf_counter()
+            text = engine.transcribe(audio, cancel_event=job.cancel_event, info=job.info, language=language)
+            job.info.update(duration=round(len(audio) / SAMPLE_RATE, 2), language=language,
+                            latency_sec=round(time.perf_counter() - start, 2),
+                            audio_file=audio_file, retranscribed_from=item["id"])
+            return text
+
+        self.retranscribe_worker.submit(run)
+        self.status_label.config(text=f"다시 변환 중... ({model_size})", foreground="orange")
+        self.update_tray_icon("orange")
+
+    def on_retranscribe_done(self, job):
+        """다시 변환 완료 (UI 스레드) - 새 히스토리 항목 + 클립보드 (받아쓰기 통계에는 넣지 않음)"""
+        if job.cancelled:
+            return
+        text = job.result
         if text:
-            history = self.config.get("history", [])
-            history.append(text)
-            # 최대 50개 유지
-            if len(history) > 50:
-                history = history[-50:]
-            self.config["history"] = history
-            save_config(self.config)
+            pyperclip.copy(text)
+            self.last_history_id = self.add_to_history(text, **job.info)
+        # 녹음/받아쓰기 중이면 그쪽 상태 표시를 덮지 않음
+        if self.recording or self.worker.pending_count():
+            return
+        if text:
+            self.set_result_text(text)
+            self.status_label.config(text="다시 변환 완료 - 클립보드에 복사됨!", foreground="green")
+            self.update_tray_icon("green")
+        else:
+            self.status_label.config(text="다시 변환 실패", foreground="gray")
+            self.update_tray_icon("gray")
+        self.root.after(3000, self.reset_status)
+
+    def show_stats(self):
+        """성능 통계 창 - 최근 녹음들의 단계별 p50/p95"""
+        stats_win = tk.Toplevel(self.root)
+        stats_win.title("통계")
+        stats_win.geometry("420x340")
+        stats_win.attributes("-topmost", True)
+        stats_win.transient(self.root)
+
+        text = tk.Text(stats_win, font=("Consolas", 10), wrap="none")
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        text.insert("1.0", self.metrics.format_summary())
+        text.config(state="disabled")
+
+    def add_to_history(self, text, **info):
+        """히스토리에 추가 - 텍스트와 녹음 정보 (녹음 길이, 제외한 침묵 길이 등)"""
+        if text:
+            try:
+                return self.history.add(text, **info)
+            except sqlite3.Error as e:
+                print(f"[Voice App] 히스토리 저장 실패: {e}")
+        return None
 
     def set_result_text(self, text):
         """결과 텍스트 설정 (선택/복사 가능)"""
@@ -469,74 +3024,238 @@ class VoiceApp:
             self.result_text.insert("1.0", text)
         self.result_text.config(state="disabled")
 
-    def is_model_downloaded(self, model_size):
-        """모델이 이미 다운로드되어 있는지 확인"""
-        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "huggingface", "hub")
-        if not os.path.exists(cache_dir):
-            return False
-        # faster-whisper 모델 캐시 확인
-        for item in os.listdir(cache_dir):
-            if f"whisper-{model_size}" in item.lower():
-                return True
-        return False
+    def set_load_state(self, state, text):
+        """모델 로드 진행 상태 갱신 (백그라운드 스레드에서 호출)"""
+        self.load_state = state
+        self.root.after(0, lambda: self.status_label.config(text=text))
 
     def load_model(self):
-        """모델 로드"""
+        """모델 로드 (백그라운드 스레드) - import → 모델 생성 → VAD → warm-up"""
         model_size = self.config.get("model_size", "small")
 
         # 첫 다운로드 여부 확인
-        is_first_download = not self.is_model_downloaded(model_size)
+        is_first_download = not is_model_downloaded(model_size)
 
         if is_first_download:
-            self.status_label.config(text=f"모델 다운로드 중... ({model_size})")
-            self.result_text.config(state="normal")
-            self.result_text.delete("1.0", "end")
-            self.result_text.insert("1.0", "처음 실행 시 모델을 다운로드합니다.\n인터넷 연결이 필요하며, 약 1~2분 소요됩니다.")
-            self.result_text.config(state="disabled")
+            self.set_load_state("downloading", f"모델 다운로드 중... ({model_size})")
+            self.root.after(0, self.set_result_text,
+                            "처음 실행 시 모델을 다운로드합니다.\n인터넷 연결이 필요하며, 약 1~2분 소요됩니다.")
         else:
-            self.status_label.config(text=f"모델 로딩 중... ({model_size})")
-        self.root.update()
+            self.set_load_state("loading", f"모델 로딩 중... ({model_size})")
 
-        # GPU 자동 감지
         try:
-            import torch
-            if torch.cuda.is_available():
-                device = "cuda"
-                compute_type = "float16"
-                print(f"[Voice App] GPU 사용: {torch.cuda.get_device_name(0)}")
-            else:
-                device = "cpu"
-                compute_type = "int8"
-                print("[Voice App] CPU 사용")
-        except ImportError:
-            device = "cpu"
-            compute_type = "int8"
-            print("[Voice App] CPU 사용 (torch 없음)")
-
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
-
-        # VAD 모델 로드 (silero-vad)
-        if self.config.get("vad_enabled", True):
+            import faster_whisper  # noqa: F401 - import 시간만 따로 측정 (모델 생성과 분리)
+            self.timeline.mark("import_whisper")
+
+            # GPU 자동 감지
+            self.device, self.compute_type = detect_device()
+            model, _ = self.load_cached_model(model_size)
+            self.engine.set_model(model, model_size)
+            self.timeline.mark("model")
+
+            # VAD 모델 로드
+            self.set_load_state("vad", "VAD 로딩 중...")
+            self.load_vad()
+            self.timeline.mark("vad")
+
+            # 첫 변환 지연 제거
+            self.set_load_state("warmup", "준비 중...")
+            self.engine.warm_up(model)
+            self.timeline.mark("warmup")
+
+            if self.config.get("two_pass", False):
+                self.set_load_state("warmup", "초안 모델 준비 중...")
+                self.load_draft_model()
+                self.timeline.mark("draft_model")
+        except Exception as e:
+            print(f"[Voice App] 모델 로드 실패: {e}")
+            self.set_load_state("error", "모델 로드 실패")
+            self.root.after(0, self.set_result_text, str(e))
+            self.root.after(0, self.update_tray_icon, "gray")
+            return
+
+        self.timeline.log(model_size=model_size, device=self.device,
+                          compute_type=calibrated_settings(self.config, model_size, self.device, self.compute_type)[0],
+                          vad_backend=self.config.get("vad_backend") if self.vad_model else None)
+        self.root.after(0, self.on_model_ready, is_first_download)
+
+    def load_cached_model(self, model_size):
+        """모델 캐시에서 로드 - CPU면 이 하드웨어에서 측정한 연산 타입/스레드 수 사용"""
+        return load_calibrated_model(self.model_cache, self.config, model_size, self.device, self.compute_type)
+
+    def maybe_calibrate(self):
+        """CPU에서 보정 결과가 없는 모델/하드웨어면 백그라운드에서 측정 (다음 로드부터 적용)
+
+        auto_calibrate가 꺼져 있어도 예전에 보정했던 모델인데 하드웨어 식별값이 바뀌었으면 다시 측정
+        (오래된 결과는 무시되므로 그대로 두면 보정 전 설정으로 돌아감).
+        """
+        model_size = self.engine.model_size
+        if self.device != "cpu" or get_calibration(self.config, model_size):
+            return
+        stale = stale_calibration(self.config, model_size)
+        if not (self.config.get("auto_calibrate", False) or stale):
+            return
+
+        def run():
+            reason = "하드웨어가 바뀌어 다시 측정" if stale else "이 하드웨어에서 처음 실행"
+            print(f"[Voice App] CPU 보정 시작 ({model_size}) - {reason}")
+            try:
+                result = calibrate(model_size, should_stop=lambda: self.recording or self.worker.pending_count(),
+                                   language=self.config.get("language", "ko"))
+            except Exception as e:
+                print(f"[Voice App] CPU 보정 실패: {e}")
+                return
+            if result is None:
+                print("[Voice App] 녹음이 시작되어 CPU 보정 중단 - 다음 실행 때 다시 측정")
+                return
+            print(f"[Voice App] CPU 보정 완료: {result['compute_type']}, {result['cpu_threads']} 스레드 "
+                  f"(RTF {result['rtf']}) - 다음 모델 로드부터 적용")
+            self.root.after(0, save_calibration, self.config, model_size, result)
+        threading.Thread(target=run, daemon=True).start()
+
+    def load_draft_model(self):
+        """2단계 변환의 초안 모델 로드 (백그라운드 스레드) - 실패하면 한 번만 변환"""
+        draft_size = self.config.get("draft_model", "tiny")
+        try:
+            model, fresh = self.load_cached_model(draft_size)
+            if fresh:
+                self.engine.warm_up(model)
+        except Exception as e:
+            print(f"[Voice App] 초안 모델 로드 실패 ({draft_size}): {e}")
+            return
+        self.draft_engine.set_model(model, draft_size)
+        print(f"[Voice App] 2단계 변환: {draft_size} 초안 → {self.engine.model_size}")
+
+    def use_two_pass(self):
+        """이번 녹음을 2단계로 변환할지 - 초안 모델이 준비됐고 본 모델과 다를 때만"""
+        return (self.config.get("two_pass", False) and self.draft_engine.model is not None
+                and self.draft_engine.model_size != self.engine.model_size)
+
+    def switch_model(self, model_size):
+        """모델 교체 - 새 모델은 백그라운드에서 로드, 그동안 기존 모델이 계속 변환"""
+        self.switch_seq += 1
+        seq = self.switch_seq
+
+        def load():
             try:
-                import torch
-                self.vad_model, _ = torch.hub.load(
-                    repo_or_dir='snakers4/silero-vad',
-                    model='silero_vad',
-                    trust_repo=True
-                )
-                print("[Voice App] VAD 모델 로드됨")
+                start = time.perf_counter()
+                model, fresh = self.load_cached_model(model_size)
+                if fresh:
+                    self.engine.warm_up(model)
+                print(f"[Voice App] 모델 준비됨: {model_size} ({time.perf_counter() - start:.2f}s"
+                      f"{', 캐시' if not fresh else ''})")
             except Exception as e:
-                print(f"[Voice App] VAD 로드 실패: {e}")
-                self.vad_model = None
+                print(f"[Voice App] 모델 전환 실패: {e}")
+                self.root.after(0, self.on_model_switched, seq, None, model_size)
+                return
+            self.root.after(0, self.on_model_switched, seq, model, model_size)
+
+        if not self.recording:
+            self.status_label.config(text=f"모델 전환 중... ({model_size})", foreground="orange")
+        threading.Thread(target=load, daemon=True).start()
+
+    def on_model_switched(self, seq, model, model_size):
+        """모델 교체 완료 (UI 스레드) - 마지막 요청만 반영"""
+        if seq != self.switch_seq:
+            return
+        if model is None:
+            if not self.recording:
+                self.status_label.config(text=f"모델 전환 실패 ({model_size})", foreground="gray")
+            return
+        # 진행 중인 변환은 이전 모델로 끝까지 진행 (Transcriber.acquire가 model/model_size를 함께 잡음)
+        self.engine.set_model(model, model_size)
+        self.models_unloaded = False
+        self.maybe_calibrate()
+        if not self.recording and not self.worker.pending_count():
+            self.status_label.config(text=f"모델 전환됨: {model_size}", foreground="green")
+            self.root.after(1500, self.show_idle_status)
 
+    def on_model_ready(self, is_first_download):
+        """모델 준비 완료 (UI 스레드)"""
         # 다운로드 완료 메시지 초기화
         if is_first_download:
-            self.result_text.config(state="normal")
-            self.result_text.delete("1.0", "end")
-            self.result_text.config(state="disabled")
+            self.set_result_text("")
         self.model_loaded = True
+        self.load_state = "ready"
         self.status_label.config(text=f"[{HOTKEY}] 녹음 시작")
         self.update_tray_icon("gray")
+        self.open_warm_stream()
+        self.maybe_calibrate()
+        self.engine.loader = self.reload_model
+        self.root.after(IDLE_CHECK_SEC * 1000, self.check_idle)
+        # 로드 중에 설정에서 모델을 바꾼 경우
+        if self.config.get("model_size", "small") != self.engine.model_size:
+            self.switch_model(self.config.get("model_size", "small"))
+
+    def check_idle(self):
+        """주기적으로 유휴 시간 확인 - idle_unload_min 동안 쓰지 않았으면 모델 해제"""
+        self.root.after(IDLE_CHECK_SEC * 1000, self.check_idle)
+        idle_min = self.config.get("idle_unload_min", 0)
+        if (not idle_min or self.models_unloaded or self.recording
+                or self.worker.pending_count() or self.refine_worker.pending_count()
+                or self.retranscribe_worker.pending_count()):
+            return
+        last_used = max(self.engine.last_used, self.draft_engine.last_used, self.last_recording)
+        if time.monotonic() - last_used >= idle_min * 60:
+            self.unload_models(idle_min)
+
+    def unload_models(self, idle_min):
+        """모델(+ torch VAD)을 메모리에서 내림 - 다음 변환에서 다시 로드"""
+        rss_before = get_rss_mb()
+        if not self.engine.unload():
+            return  # 로컬 서비스 요청 등이 변환 중
+        self.draft_engine.unload()
+        self.model_cache.clear()
+        if isinstance(self.vad_model, SileroTorchVAD):
+            self.vad_model = EnergyVAD()  # 다시 로드될 때까지 모델 없는 방식으로 대체
+            self.vad_unloaded = True
+        gc.collect()
+        self.models_unloaded = True
+        rss_after = get_rss_mb()
+        print(f"[Voice App] {idle_min}분 동안 사용 안 함 - 모델 해제 "
+              f"(메모리 {rss_before:.0f}MB → {rss_after:.0f}MB, {rss_before - rss_after:.0f}MB 절약)")
+
+    def reload_model(self):
+        """유휴 해제된 모델 다시 로드 (Transcriber.loader) - 반환값: (모델, 크기)"""
+        model_size = self.engine.model_size or self.config.get("model_size", "small")
+        start = time.perf_counter()
+        model, fresh = self.load_cached_model(model_size)
+        if fresh:
+            self.engine.warm_up(model)
+        self.models_unloaded = False
+        print(f"[Voice App] 모델 다시 로드: {model_size} ({time.perf_counter() - start:.2f}s)")
+        threading.Thread(target=self.reload_extras, daemon=True).start()
+        return model, model_size
+
+    def reload_extras(self):
+        """본 모델 다음에 torch VAD/초안 모델도 다시 로드 (변환을 기다리게 하지 않도록 별도 스레드)"""
+        if self.vad_unloaded:
+            self.vad_unloaded = False
+            self.load_vad()
+        if self.config.get("two_pass", False) and self.draft_engine.model is None:
+            self.load_draft_model()
+
+    def reload_in_background(self):
+        """녹음을 시작하면서 해제된 모델을 같이 로드 - 녹음이 끝날 때쯤엔 준비됨"""
+        def run():
+            try:
+                self.engine.ensure_model()
+            except Exception as e:
+                print(f"[Voice App] 모델 다시 로드 실패: {e}")
+        threading.Thread(target=run, daemon=True).start()
+
+    def load_vad(self):
+        """VAD 백엔드 로드 - 실패하면 모델 없는 energy 방식으로 대체"""
+        if not self.config.get("vad_enabled", True):
+            self.vad_model = None
+            return
+        backend = self.config.get("vad_backend", "silero_onnx")
+        try:
+            self.vad_model = create_vad(backend, self.config.get("vad_onnx_path"))
+            print(f"[Voice App] VAD 로드됨 ({backend})")
+        except Exception as e:
+            print(f"[Voice App] VAD 로드 실패 ({backend}): {e} - energy 방식 사용")
+            self.vad_model = EnergyVAD()
 
     def show_window(self):
         """창 표시"""
@@ -560,61 +3279,174 @@ class VoiceApp:
     def start_recording_if_ready(self):
         """녹음 시작 (모델 로드 완료 시)"""
         if self.model_loaded and not self.recording:
+            self.trigger_time = time.perf_counter()
             self.start_recording()
 
+    def post_config_change(self, fn, *args):
+        """변환 스레드의 설정 변경 (측정한 RTF 등)을 설정을 소유한 UI 스레드로 넘김"""
+        self.root.after(0, self.apply_config_change, fn, args)
+
+    def apply_config_change(self, fn, args):
+        """설정 변경 반영 후 저장 예약 - 녹음마다 파일을 쓰지 않도록 마지막 변경 후 한 번만"""
+        fn(*args)
+        if self.config_save_id:
+            self.root.after_cancel(self.config_save_id)
+        self.config_save_id = self.root.after(CONFIG_SAVE_DELAY_MS, self.flush_config)
+
+    def flush_config(self):
+        """예약된 설정 저장 실행 (종료 시에도 호출)"""
+        if self.config_save_id:
+            self.root.after_cancel(self.config_save_id)
+            self.config_save_id = None
+        try:
+            save_config(self.config)
+        except OSError as e:
+            print(f"[Voice App] 설정 저장 실패: {e}")
+
     def quit_app(self):
         """앱 종료"""
+        if self.config_save_id:
+            self.flush_config()
+        self.worker.stop()
+        self.refine_worker.stop()
+        self.retranscribe_worker.stop()
+        self.close_warm_stream()
         if self.tray_icon:
             self.tray_icon.stop()
         self.root.quit()
 
+    def open_input_stream(self):
+        # native_rate_capture: 장치 기본 레이트로 열고 16kHz 변환은 ResampleWorker가 담당
+        self.stream_rate = native_input_rate() if self.config.get("native_rate_capture", False) else SAMPLE_RATE
+        return sd.InputStream(
+            samplerate=self.stream_rate,
+            channels=1,
+            dtype=np.float32,
+            callback=self.audio_callback
+        )
+
+    def open_warm_stream(self):
+        """계속 열어 두는 입력 스트림 시작 (warm_stream 설정) - 녹음 시작 시 스트림 생성 지연 없음"""
+        if self.warm_stream or not self.config.get("warm_stream", False) or self.recording:
+            return
+        try:
+            self.stream = self.open_input_stream()
+            self.preroll = PreRollBuffer(self.config.get("preroll_sec", 0.3), self.stream_rate)
+            self.stream.start()
+            self.warm_stream = True
+            print("[Voice App] 입력 스트림 유지 중 (warm_stream)")
+        except Exception as e:
+            print(f"[Voice App] 입력 스트림 유지 실패: {e} - 녹음마다 새로 엶")
+            self.stream = None
+
+    def close_warm_stream(self):
+        if self.warm_stream and self.stream:
+            self.warm_stream = False
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def close_record_stream(self):
+        """녹음 종료 시 스트림 정리 - 유지 중인 스트림은 닫지 않음 (녹음 중 설정이 바뀌었으면 여기서 반영)"""
+        if self.warm_stream and not self.config.get("warm_stream", False):
+            self.close_warm_stream()
+            self.preroll = None
+        if self.stream and not self.warm_stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        self.open_warm_stream()
+
+    def stop_resampler(self):
+        """native_rate_capture 변환 스레드 종료 (남은 오디오 변환 후) - 반환값: 지연으로 잃은 샘플 수 (16kHz 기준)"""
+        resampler, self.resampler = self.resampler, None
+        self.raw_ring = None  # 이후 콜백은 녹음에 쓰지 않음
+        if resampler:
+            resampler.stop()
+            if resampler.ring.lost:
+                print(f"[Voice App] 리샘플링 지연으로 {resampler.ring.lost / self.stream_rate:.2f}s 손실")
+                return resampler.ring.lost * SAMPLE_RATE // self.stream_rate
+        return 0
+
     def audio_callback(self, indata, frames, time_info, status):
         """오디오 스트림 콜백"""
-        if self.recording:
-            self.audio_data.append(indata.copy())
-            # 볼륨 레벨 계산 (RMS)
-            self.current_volume = np.sqrt(np.mean(indata**2)) * 5  # 0~1 범위로 스케일링
+        started = time.perf_counter()
+        capture = self.capture
+        block = indata[:, 0]
+        if self.recording and capture is not None:
+            if self.first_audio_time is None:
+                self.first_audio_time = time.perf_counter()
+            target = self.raw_ring if self.raw_ring is not None else capture
+            if self.preroll_pending:
+                self.preroll_pending = False
+                self.preroll.drain_into(target)  # 핫키 직전 오디오를 앞에 붙임
+            target.write(block)
+            # 볼륨 레벨 계산 (RMS) - 임시 배열 없이
+            self.current_volume = np.sqrt(np.dot(block, block) / max(len(block), 1)) * 5  # 0~1 범위로 스케일링
 
-            # VAD 체크
-            if self.vad_model is not None and self.config.get("vad_enabled", True):
-                try:
-                    import torch
-                    import time as time_module
-                    audio_tensor = torch.from_numpy(indata.flatten()).float()
-                    speech_prob = self.vad_model(audio_tensor, SAMPLE_RATE).item()
-
-                    if speech_prob > 0.5:
-                        # 음성 감지됨
-                        self.speech_detected = True
-                        self.silence_start = None
-                    else:
-                        # 침묵
-                        if self.speech_detected and self.silence_start is None:
-                            self.silence_start = time_module.time()
-                        elif self.silence_start is not None:
-                            silence_duration = time_module.time() - self.silence_start
-                            silence_threshold = self.config.get("vad_silence_sec", 5)
-                            if silence_duration >= silence_threshold:
-                                # 자동 종료 예약
-                                self.root.after(0, self.stop_recording)
-                except Exception as e:
-                    pass  # VAD 오류 무시
+            # VAD는 VADPipeline 스레드가 버퍼에서 직접 읽음 (콜백에서는 실행 안 함)
+        elif self.preroll is not None:
+            self.preroll.write(block)
+        self.monitor.record(frames, time_info, status, time.perf_counter() - started)
 
     def start_recording(self):
         """녹음 시작"""
-        self.audio_data = []
+        open_start = time.perf_counter()
+        if self.warm_stream and not self.stream.active:
+            # 장치가 빠지는 등으로 유지하던 스트림이 멈춤 - 이번 녹음은 새로 엶
+            print("[Voice App] 유지 중인 입력 스트림이 멈춤 - 다시 엶")
+            self.warm_stream = False
+            self.stream.close()
+            self.stream = None
+        if not self.warm_stream:
+            self.stream = self.open_input_stream()
+        self.capture = CaptureBuffer(self.config.get("max_record_sec", 60),
+                                     compact=self.config.get("capture_int16", False))
+        if self.stream_rate != SAMPLE_RATE:
+            # 콜백은 원본 레이트 링 버퍼에만 쓰고 변환은 별도 스레드에서
+            ring = AudioRing(int(RESAMPLE_RING_SEC * self.stream_rate))
+            self.resampler = ResampleWorker(ring, StreamResampler(self.stream_rate), self.capture).start()
+            self.raw_ring = ring
+        self.first_audio_time = None
+        self.last_recording = time.monotonic()
+        if self.engine.model is None and self.engine.loader is not None:
+            self.reload_in_background()  # 녹음은 바로 시작, 모델은 그동안 로드
+        self.monitor.reset(self.stream_rate)
+        self.monitor_warned = False
+        # 아래는 recording보다 먼저 - 첫 블록부터 프리롤/링 버퍼로 가도록
+        self.preroll_pending = self.warm_stream
         self.recording = True
         self.record_seconds = 0
         self.current_volume = 0
-        self.silence_start = None
-        self.speech_detected = False
-        self.stream = sd.InputStream(
-            samplerate=SAMPLE_RATE,
-            channels=1,
-            dtype=np.float32,
-            callback=self.audio_callback
-        )
-        self.stream.start()
+        if not self.warm_stream:
+            self.stream.start()
+        self.record_started = time.perf_counter()
+        self.stream_open_sec = self.record_started - open_start
+
+        # VAD 시작 (별도 스레드에서 침묵 후 자동 종료 판단)
+        if self.vad_model is not None and self.config.get("vad_enabled", True):
+            if self.last_vad is not None:
+                # 모델(RNN 상태)은 녹음끼리 공유 - 이전 녹음의 남은 창 처리가 끝난 뒤에 초기화
+                self.last_vad.stop()
+            vad = VADPipeline(self.vad_model, self.capture,
+                              silence_sec=self.config.get("vad_silence_sec", 15))
+            vad.on_silence_timeout = lambda: self.root.after(0, self.on_vad_timeout, vad)
+            self.vad = self.last_vad = vad.start()
+
+        # 2단계 변환이면 녹음 중/종료 직후 변환은 초안 모델로
+        engine = self.active_engine = self.draft_engine if self.use_two_pass() else self.engine
+
+        # 스트리밍 변환 시작 (완성된 구간을 녹음 중에 미리 변환)
+        if self.config.get("streaming_transcribe", True):
+            capture, vad = self.capture, self.vad
+            self.streamer = StreamingTranscriber(
+                lambda start, end, prompt, cancel, info: engine.transcribe_range(
+                    capture, vad, start, end, prompt, cancel, info),
+                on_partial=self.on_partial_text)
+            self.streamer.start(self.capture)
+        else:
+            self.streamer = None
+
         self.status_label.config(text="● 녹음 중...", foreground="red")
         self.set_result_text(f"[{HOTKEY}] 다시 누르면 완료")
         self.update_tray_icon("red")
@@ -651,8 +3483,22 @@ class VoiceApp:
             else:
                 self.volume_canvas.itemconfig(self.volume_bar, fill="#4CAF50")  # 초록
 
+            # 캡처가 밀리면 (overflow/늦은 콜백) 녹음 중에 바로 알림
+            monitor = self.monitor
+            if monitor.falling_behind() and not self.monitor_warned:
+                self.monitor_warned = True
+                print(f"[Voice App] 오디오 캡처 지연 - overflow {monitor.overflows}회, "
+                      f"늦은 콜백 {monitor.late}회, 최대 {monitor.max_elapsed * 1000:.1f}ms "
+                      f"(블록 {monitor.block_sec * 1000:.1f}ms)")
+                self.status_label.config(text="● 녹음 중... ⚠ 오디오 끊김", foreground="red")
+
             self.timer_id = self.root.after(1000, self.update_timer)
 
+    def on_vad_timeout(self, vad):
+        """VAD 침묵 감지 - 같은 녹음일 때만 자동 종료"""
+        if self.recording and self.vad is vad:
+            self.stop_recording()
+
     def auto_stop(self):
         """자동 녹음 종료"""
         if self.recording:
@@ -667,10 +3513,15 @@ class VoiceApp:
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
             self.timer_id = None
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-        self.audio_data = []
+        self.close_record_stream()
+        self.stop_resampler()
+        if self.vad:
+            self.vad.stop_event.set()
+            self.vad = None
+        if self.streamer:
+            self.streamer.cancel()
+            self.streamer = None
+        self.capture = None
         self.status_label.config(text="녹음 취소됨", foreground="gray")
         self.set_result_text("")
         self.update_tray_icon("gray")
@@ -682,9 +3533,17 @@ class VoiceApp:
         self.recording_btn_frame.pack_forget()
         self.normal_btn_frame.pack(pady=10)
 
-        self.root.after(1500, lambda: self.status_label.config(
-            text=f"[{HOTKEY}] 녹음 시작", foreground="black"
-        ))
+        self.root.after(1500, self.show_idle_status)
+
+    def show_idle_status(self):
+        """대기 상태 표시 (녹음/변환 중이 아닐 때만)"""
+        if self.recording:
+            return
+        if self.worker.pending_count():
+            self.status_label.config(text="변환 중... (ESC 취소)", foreground="orange")
+            self.update_tray_icon("orange")
+        else:
+            self.status_label.config(text=f"[{HOTKEY}] 녹음 시작", foreground="black")
 
     def stop_recording(self):
         """녹음 중지 및 변환"""
@@ -695,9 +3554,7 @@ class VoiceApp:
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
             self.timer_id = None
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
+        self.close_record_stream()
 
         # 타이머 숨기기
         self.timer_frame.pack_forget()
@@ -706,51 +3563,156 @@ class VoiceApp:
         self.recording_btn_frame.pack_forget()
         self.normal_btn_frame.pack(pady=10)
 
-        self.status_label.config(text="변환 중...", foreground="orange")
+        streamer, self.streamer = self.streamer, None
+        resample_lost = self.stop_resampler()  # VAD가 마지막 오디오까지 보도록 먼저 변환 완료
+        capture, self.capture = self.capture, None
+        vad, self.vad = self.vad, None
+        if vad:
+            vad.stop_event.set()  # 남은 창만 처리하고 종료
+        if capture is None or len(capture) == 0:
+            if streamer:
+                streamer.cancel()
+            self.status_label.config(text="녹음 데이터 없음", foreground="gray")
+            self.update_tray_icon("gray")
+            self.root.after(3000, self.reset_status)
+            return
+
+        # 변환은 워커 스레드에서 (UI는 바로 다음 녹음 가능)
+        submitted = time.perf_counter()
+        stages = {"stream_open_sec": round(self.stream_open_sec, 4),
+                  "capture_sec": round(submitted - self.record_started, 2)}
+        if self.trigger_time and self.first_audio_time:
+            # 핫키 → 첫 오디오 블록 도착 (프리롤이 있으면 그보다 앞의 소리도 녹음에 포함됨)
+            stages["hotkey_to_audio_sec"] = round(self.first_audio_time - self.trigger_time, 4)
+        self.trigger_time = None
+        health = self.monitor.summary(capture.dropped + resample_lost)
+        stages.update(health)
+        if health["lost_audio_sec"] or health["late_callbacks"]:
+            print(f"[Voice App] 오디오 손실 추정 {health['lost_audio_sec']}s "
+                  f"(overflow {health['input_overflows']}회, 늦은 콜백 {health['late_callbacks']}회) "
+                  f"콜백 부하 분포: {self.monitor.format_hist()}")
+        archive = self.archive if self.config.get("archive_audio", False) else None
+        engine = self.active_engine
+        def run(job):
+            job.info.update(stages, queue_wait_sec=round(time.perf_counter() - submitted, 4))
+            text = finish_recording(engine, capture, vad, streamer, job.info, job.cancel_event)
+            if archive and text:
+                try:
+                    job.info["audio_file"] = archive.save(capture.view(0, len(capture)))
+                except OSError as e:
+                    print(f"[Voice App] 녹음 보관 실패: {e}")
+            return text
+        job = self.worker.submit(run, cancel_event=streamer.cancel_event if streamer else None)
+        if engine is self.draft_engine:
+            job.followup = lambda history_id, draft: self.refine(capture, vad, history_id, draft)
+
+        self.status_label.config(text="변환 중... (ESC 취소)", foreground="orange")
         self.update_tray_icon("orange")
-        self.root.update()
 
-        # 오디오 데이터 합치기
-        if self.audio_data:
-            audio = np.concatenate(self.audio_data).flatten()
-            text = self.transcribe(audio)
+    def cancel_transcription(self):
+        """진행 중인 변환 작업 모두 취소"""
+        self.worker.cancel_all()
+        self.status_label.config(text="변환 취소됨", foreground="gray")
+        self.update_tray_icon("gray")
+        self.root.after(1500, self.show_idle_status)
 
-            if text:
-                pyperclip.copy(text)
-                self.add_to_history(text)  # 히스토리 저장
-                self.set_result_text(text)  # 전체 텍스트 표시 (선택/복사 가능)
-                self.status_label.config(text="클립보드에 복사됨!", foreground="green")
-                self.update_tray_icon("green")
-            else:
-                self.status_label.config(text="인식 실패", foreground="gray")
-                self.update_tray_icon("gray")
+    def on_transcription_done(self, job):
+        """변환 완료 처리 (UI 스레드) - 제출 순서대로 호출됨"""
+        if job.cancelled:
+            return
+        text = job.result
+        if text:
+            start = time.perf_counter()
+            pyperclip.copy(text)
+            copied = time.perf_counter()
+            self.last_history_id = self.add_to_history(text, **job.info)  # 히스토리 저장
+            job.info["clipboard_sec"] = round(copied - start, 4)
+            job.info["history_sec"] = round(time.perf_counter() - copied, 4)
+            if job.followup and self.last_history_id is not None:
+                job.followup(self.last_history_id, text)
+        if job.error is None:
+            self.metrics.record(dict(job.info, chars_out=len(text or "")))
+
+        # 녹음 중이면 화면은 그대로 두고 클립보드/히스토리만 갱신
+        if self.recording:
+            return
+        if text:
+            self.set_result_text(text)  # 전체 텍스트 표시 (선택/복사 가능)
+        if self.worker.pending_count():
+            return  # 남은 작업이 끝나면 상태 표시
+        if text and job.info.get("lost_audio_sec"):
+            # 결과가 이상하면 빠진 오디오 때문일 수 있음을 표시
+            self.status_label.config(text=f"클립보드에 복사됨! (오디오 {job.info['lost_audio_sec']:.1f}s 손실)",
+                                     foreground="orange")
+            self.update_tray_icon("green")
+        elif text:
+            self.status_label.config(text="클립보드에 복사됨!", foreground="green")
+            self.update_tray_icon("green")
         else:
-            self.status_label.config(text="녹음 데이터 없음", foreground="gray")
+            self.status_label.config(text="인식 실패", foreground="gray")
             self.update_tray_icon("gray")
 
         # 3초 후 상태 초기화 및 창 숨기기
         self.root.after(3000, self.reset_status)
 
+    def refine(self, capture, vad, history_id, draft):
+        """2단계 변환 - 같은 녹음 버퍼를 본 모델로 다시 변환 (별도 큐)"""
+        def run(job):
+            start = time.perf_counter()
+            # 침묵 제외량은 초안 변환에서 이미 셈
+            text = self.engine.transcribe_range(capture, vad, 0, len(capture), cancel_event=job.cancel_event,
+                                                info=job.info, count_trimmed=False)
+            job.info["refine_sec"] = round(time.perf_counter() - start, 2)
+            return text
+        job = self.refine_worker.submit(run)
+        job.followup = lambda: self.apply_refined(job, history_id, draft)
+
+    def on_refine_done(self, job):
+        """2단계 변환 작업 완료 (UI 스레드)"""
+        if job.cancelled or job.error is not None:
+            return
+        job.followup()
+
+    def apply_refined(self, job, history_id, draft):
+        """히스토리/결과 창/클립보드를 본 모델 결과로 교체 + 초안과 달라진 정도 기록"""
+        text = job.result or ""
+        diff = text_diff_rate(draft, text)
+        self.metrics.record({"refine_sec": job.info.get("refine_sec"), "refine_diff": diff,
+                             "model": job.info.get("model")})
+        print(f"[Voice App] 2단계 변환 완료 ({job.info.get('refine_sec')}s, 달라진 단어 {diff:.0%})")
+        if not text or diff == 0:
+            return
+        try:
+            self.history.update(history_id, text, model=job.info.get("model"), draft_text=draft,
+                                refine_diff=diff, refine_sec=job.info.get("refine_sec"))
+        except sqlite3.Error as e:
+            print(f"[Voice App] 히스토리 갱신 실패: {e}")
+        # 사용자가 그 사이 다른 것을 복사했으면 클립보드는 건드리지 않음
+        if self.config.get("refine_clipboard", True):
+            try:
+                if pyperclip.paste() == draft:
+                    pyperclip.copy(text)
+            except pyperclip.PyperclipException:
+                pass
+        if self.last_history_id == history_id and not self.recording:
+            self.set_result_text(text)
+            if not self.worker.pending_count():
+                self.status_label.config(text="정확한 결과로 교체됨", foreground="green")
+
     def reset_status(self):
         """상태 초기화 및 창 자동 최소화"""
+        if self.recording or self.worker.pending_count():
+            return  # 새 녹음/변환이 진행 중이면 그대로 둠
         self.status_label.config(text=f"[{HOTKEY}] 녹음 시작", foreground="black")
         self.update_tray_icon("gray")
         self.hide_window()  # 트레이로 자동 최소화
 
-    def transcribe(self, audio: np.ndarray) -> str:
-        """음성을 텍스트로 변환"""
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
-            audio_int16 = (audio * 32767).astype(np.int16)
-            write_wav(temp_path, SAMPLE_RATE, audio_int16)
-
-        try:
-            language = self.config.get("language", "ko")
-            segments, _ = self.model.transcribe(temp_path, language=language, beam_size=5)
-            text = " ".join([seg.text for seg in segments])
-            return text.strip()
-        finally:
-            os.unlink(temp_path)
+    def on_partial_text(self, text):
+        """스트리밍 변환 중간 결과 표시 (백그라운드 스레드에서 호출)"""
+        def update():
+            if self.recording:
+                self.set_result_text(f"{text}\n\n[{HOTKEY}] 다시 누르면 완료")
+        self.root.after(0, update)
 
     def toggle_recording(self):
         """녹음 토글"""
@@ -759,6 +3721,8 @@ class VoiceApp:
         if self.hotkey_pressed:
             return  # 키 반복 방지
         self.hotkey_pressed = True
+        if not self.recording:
+            self.trigger_time = time.perf_counter()
         self.show_window()
         if not self.recording:
             self.start_recording()
@@ -788,6 +3752,7 @@ class VoiceApp:
         menu = pystray.Menu(
             pystray.MenuItem("창 열기", self.on_tray_show, default=True),
             pystray.MenuItem(f"녹음: {HOTKEY}", lambda: None, enabled=False),
+            pystray.MenuItem("통계", lambda icon, item: self.root.after(0, self.show_stats)),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("종료", self.on_tray_quit)
         )
@@ -807,22 +3772,21 @@ class VoiceApp:
         tray_thread.start()
 
     def start_socket_listener(self):
-        """소켓 리스너 시작 (다른 인스턴스의 신호 받기)"""
+        """소켓 리스너 시작 (다른 인스턴스의 신호 + 로컬 변환 서비스 요청)"""
         if self.lock_socket:
-            self.lock_socket.listen(1)
-            def listen():
-                while True:
-                    try:
-                        conn, addr = self.lock_socket.accept()
-                        data = conn.recv(1024)
-                        if data == b'SHOW':
-                            self.root.after(0, self.show_window)
-                        conn.close()
-                    except:
-                        break
-            listener_thread = threading.Thread(target=listen, daemon=True)
+            self.service = TranscriptionService(self.engine, lambda: self.model_loaded,
+                                                legacy_handler=self.on_socket_message)
+            listener_thread = threading.Thread(target=self.service.serve, args=(self.lock_socket,), daemon=True)
             listener_thread.start()
 
+    def on_socket_message(self, data):
+        """예전 방식 한 줄 메시지 (SHOW/STATS) - 응답할 bytes 반환"""
+        if data == b'SHOW':
+            self.root.after(0, self.show_window)
+        elif data == b'STATS':
+            return json.dumps(self.metrics.summary(), ensure_ascii=False).encode("utf-8")
+        return None
+
     def run(self, start_silent=False):
         """앱 실행"""
         print(f"[Voice App] 시작됨 - 시스템 트레이에서 실행 중")
@@ -835,10 +3799,10 @@ class VoiceApp:
         # 시스템 트레이 설정
         self.setup_tray()
 
-        # 모델 로드 (백그라운드)
+        # 모델 로드 (백그라운드 스레드 - UI는 바로 반응)
         if not start_silent:
             self.show_window()  # 일반 시작: 창 표시
-        self.root.after(100, self.load_model)
+        threading.Thread(target=self.load_model, daemon=True).start()
 
         # 글로벌 핫키 등록
         keyboard.add_hotkey(HOTKEY, self.toggle_recording)
@@ -852,7 +3816,562 @@ class VoiceApp:
         if self.tray_icon:
             self.tray_icon.stop()
 
+def measure(fn, repeats=3):
+    """실행 시간(최소값, 초)과 최대 메모리(MB) 측정 - 메모리는 tracemalloc 기준"""
+    import tracemalloc
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    # 시간 측정과 분리 (tracemalloc 오버헤드 제외)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+def bench_input(model_names, minutes_list, repeats=3):
+    """임시 WAV 경유 vs 메모리 직접 전달 - 같은 모델로 실제 디코딩까지 해서 비교"""
+    kwargs = dict(language="ko", **DECODE_PROFILES["fastest"])
+    print(f"{'모델':<10} | {'길이':>6} | {'WAV 경유':>16} | {'메모리 직접':>16} | {'분당 절감':>18}")
+    for name in model_names:
+        if name == "fake":
+            model = FakeWhisperModel()
+        else:
+            from faster_whisper import WhisperModel
+            device, compute_type = detect_device()
+            model = WhisperModel(name, device=device, compute_type=compute_type, local_files_only=True)
+            Transcriber({}).warm_up(model)
+
+        for minutes in minutes_list:
+            audio = make_synthetic_audio(minutes * 60)
+
+            def via_file():
+                # 이전 transcribe 경로: int16 양자화 → WAV 쓰기 → 모델이 파일을 다시 디코딩
+                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+                    path = f.name
+                try:
+                    write_wav(path, SAMPLE_RATE, (audio * 32767).astype(np.int16))
+                    segments, _ = model.transcribe(path, **kwargs)
+                    list(segments)
+                finally:
+                    os.unlink(path)
+
+            def in_memory():
+                # 현재 Transcriber.transcribe 경로: float32 버퍼를 그대로 전달
+                segments, _ = model.transcribe(np.ascontiguousarray(audio.reshape(-1), dtype=np.float32),
+                                               **kwargs)
+                list(segments)
+
+            file_sec, file_mb = measure(via_file, repeats)
+            mem_sec, mem_mb = measure(in_memory, repeats)
+            saved_ms = (file_sec - mem_sec) * 1000 / minutes
+            saved_mb = (file_mb - mem_mb) / minutes
+            print(f"{name:<10} | {minutes:>5g}분 | {file_sec * 1000:8.1f}ms {file_mb:5.1f}MB | "
+                  f"{mem_sec * 1000:8.1f}ms {mem_mb:5.1f}MB | {saved_ms:7.1f}ms {saved_mb:6.1f}MB")
+
+def bench_resample(seconds=30, block_ms=10):
+    """입력 경로별 CPU 비용 - 16kHz 그대로 기록 vs 장치 레이트 → 스트리밍 리샘플링 (+ 일괄 resample_poly 참고값)"""
+    from scipy.signal import resample_poly
+    print(f"{'경로':<28} | {'CPU/오디오 1초':>14} | {'블록당':>10} | {'코어 점유':>8}")
+
+    def run(label, rate, fn):
+        audio = make_synthetic_audio(seconds * rate / SAMPLE_RATE)  # rate 샘플/초로 seconds초
+        block = int(rate * block_ms / 1000)
+        blocks = [audio[i:i + block] for i in range(0, len(audio), block)]
+        start = time.process_time()
+        fn(blocks, rate)
+        cpu = time.process_time() - start
+        print(f"{label:<28} | {cpu / seconds * 1000:11.2f} ms | {cpu / len(blocks) * 1e6:7.1f} us | "
+              f"{cpu / seconds:7.2%}")
+
+    def direct(blocks, rate):
+        capture = CaptureBuffer(seconds + 1)
+        for b in blocks:
+            capture.write(b)
+
+    def streaming(blocks, rate):
+        capture = CaptureBuffer(seconds + 1)
+        ring = AudioRing(int(RESAMPLE_RING_SEC * rate))
+        resampler = StreamResampler(rate)
+        pos = 0
+        for b in blocks:
+            ring.write(b)
+            chunk, pos = ring.read(pos)
+            capture.write(resampler.process(chunk))
+
+    def offline(blocks, rate):
+        from math import gcd
+        g = gcd(rate, SAMPLE_RATE)
+        resample_poly(np.concatenate(blocks), SAMPLE_RATE // g, rate // g)
+
+    run("16000Hz 그대로 (현재 방식)", SAMPLE_RATE, direct)
+    for rate in (44100, 48000):
+        run(f"{rate}Hz 스트리밍 리샘플링", rate, streaming)
+        run(f"{rate}Hz resample_poly (일괄)", rate, offline)
+    print("(현재 방식의 드라이버 쪽 리샘플링 비용은 프로세스 밖이라 측정되지 않음)")
+
+def bench_batch(model_names, clip_secs, clips, fixtures, max_wait=0.05):
+    """연달아 쌓인 클립 처리량 - 하나씩 순서대로 디코딩 vs BatchScheduler로 묶어서 디코딩"""
+    from faster_whisper import WhisperModel
+    device, compute_type = detect_device()
+    sources = [load_audio_file(path) for path in fixtures]
+    print(f"{'모델':<10} | {'클립':>10} | {'순차':>14} | {'배치':>14} | {'배치 수':>6} | {'속도 향상':>8}")
+    for name in model_names:
+        model = WhisperModel(name, device=device, compute_type=compute_type)
+        Transcriber({}).warm_up(model)
+        for clip_sec in clip_secs:
+            n = int(clip_sec * SAMPLE_RATE)
+            if sources:
+                audio = [sources[i % len(sources)][:n] for i in range(clips)]
+            else:
+                audio = [make_synthetic_audio(clip_sec, seed=i) for i in range(clips)]
+            total_sec = sum(len(a) for a in audio) / SAMPLE_RATE
+            kwargs = dict(language="ko", **DECODE_PROFILES["fastest"])
+
+            start = time.perf_counter()
+            for a in audio:
+                segments, _ = model.transcribe(a, **kwargs)
+                list(segments)
+            sequential = time.perf_counter() - start
+
+            # 대기열에 한꺼번에 쌓인 상황 - 클립마다 호출 스레드 하나
+            scheduler = BatchScheduler(model, max_wait)
+            start = time.perf_counter()
+            threads = [threading.Thread(target=lambda a=a: list(scheduler.transcribe(a, **kwargs)[0]))
+                       for a in audio]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            batched = time.perf_counter() - start
+
+            print(f"{name:<10} | {clips:>3} × {clip_sec:>3.0f}s | {total_sec / sequential:7.1f} 오디오s/s | "
+                  f"{total_sec / batched:7.1f} 오디오s/s | {scheduler.batches:>6} | {sequential / batched:7.2f}x")
+
+def bench_vad_probe(backend):
+    """VAD 백엔드 하나 측정 (새 프로세스에서 실행) - 결과를 JSON 한 줄로 출력"""
+    rss_before = get_rss_mb()
+    start = time.perf_counter()
+    vad = create_vad(backend)
+    startup_sec = time.perf_counter() - start
+    rss_after = get_rss_mb()
+
+    audio = make_synthetic_audio(30)
+    frames = audio[:len(audio) // VAD_FRAME * VAD_FRAME].reshape(-1, VAD_FRAME)
+    vad.reset()
+    start = time.perf_counter()
+    vad(frames)
+    per_frame_us = (time.perf_counter() - start) / len(frames) * 1e6
+    print(json.dumps({"backend": backend, "startup_ms": startup_sec * 1000,
+                      "rss_mb": rss_after - rss_before, "frame_us": per_frame_us}))
+
+def bench_vad(backends):
+    """VAD 백엔드별 시작 시간/상주 메모리/창당 추론 시간 비교 (백엔드마다 새 프로세스)"""
+    import subprocess
+    base_cmd = [sys.executable] if getattr(sys, 'frozen', False) else [sys.executable, os.path.abspath(__file__)]
+    print(f"{'백엔드':<12} | {'시작 시간':>10} | {'메모리 증가':>10} | {'창당 추론':>10}")
+    for backend in backends:
+        proc = subprocess.run(base_cmd + ["bench", "vad-probe", "--backend", backend],
+                              capture_output=True, text=True, encoding="utf-8")
+        lines = proc.stdout.strip().splitlines()
+        try:
+            r = json.loads(lines[-1])
+        except (IndexError, ValueError):
+            error = (proc.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+            print(f"{backend:<12} | 실패: {error}")
+            continue
+        print(f"{backend:<12} | {r['startup_ms']:8.0f}ms | {r['rss_mb']:8.1f}MB | {r['frame_us']:8.1f}us")
+
+class FakeWhisperModel:
+    """결정적인 가짜 WhisperModel - 네트워크/GPU/모델 파일 없이 벤치마크 실행용
+
+    오디오 길이 × rtf(빔 크기 반영)만큼 시간을 쓰고, 오디오 길이로 정해지는 텍스트를 돌려준다.
+    """
+
+    def __init__(self, model_size="fake", rtf=0.05):
+        self.model_size = model_size
+        self.rtf = rtf
+
+    def transcribe(self, audio, language=None, beam_size=5, **kwargs):
+        if isinstance(audio, str):
+            from faster_whisper.audio import decode_audio
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+        cost = self.rtf * (0.5 + 0.1 * beam_size)  # beam 5 → rtf, 그리디 → rtf의 60%
+
+        def segments():
+            t = 0.0
+            while t < duration:
+                end = min(t + 5.0, duration)  # 5초마다 세그먼트 하나
+                time.sleep((end - t) * cost)
+                yield TextSegment(t, end, f" 구간 {int(t // 5) + 1}")
+                t = end
+
+        info = {"language": language, "duration": duration}
+        return segments(), info
+
+def bench_e2e_run(engine, audio, streaming, vad_model):
+    """녹음 → 종료 → 변환 → 클립보드 한 번 실행, 단계별 시간 측정"""
+    import tracemalloc
+    block = 512  # PortAudio 콜백 블록 크기 흉내
+    info = {}
+    rss_before = get_rss_mb()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    capture = CaptureBuffer(len(audio) / SAMPLE_RATE)
+    vad = VADPipeline(vad_model, capture).start() if vad_model else None
+    streamer = None
+    if streaming:
+        streamer = StreamingTranscriber(
+            lambda s, e, prompt, cancel, chunk_info: engine.transcribe_range(
+                capture, vad, s, e, prompt, cancel, chunk_info))
+        streamer.start(capture)
+    for i in range(0, len(audio), block):
+        capture.write(audio[i:i + block])
+    capture_sec = time.perf_counter() - start
+    if streamer:
+        # 실시간 녹음이었다면 녹음 도중 끝났을 청크 변환을 기다림 (RTF < 1 가정)
+        streamer.wait_idle()
+
+    stop = time.perf_counter()
+    text = finish_recording(engine, capture, vad, streamer, info)
+    decoded = time.perf_counter()
+    try:
+        pyperclip.copy(text)
+        clipboard_ok = True
+    except Exception:
+        clipboard_ok = False  # 클립보드 없는 환경 (헤드리스 서버 등)
+    done = time.perf_counter()
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    audio_sec = len(audio) / SAMPLE_RATE
+    return {
+        "audio_sec": round(audio_sec, 2),
+        "mode": "streaming" if streaming else "single",
+        "stages": {
+            "capture_sec": round(capture_sec, 4),
+            "vad_flush_sec": info.get("vad_flush_sec", 0),
+            "decode_sec": info.get("final_decode_sec", 0),
+            "clipboard_sec": round(done - decoded, 4),
+        },
+        "stop_to_clipboard_sec": round(done - stop, 3),
+        "model_decode_sec": info.get("decode_sec", 0),  # 녹음 중 청크 포함 전체 디코딩 시간
+        "rtf": round(info.get("decode_sec", 0) / audio_sec, 4) if audio_sec else 0,
+        "profile": info.get("profile"),
+        "trimmed_sec": info.get("trimmed_sec", 0),
+        "text_chars": len(text),
+        "clipboard_ok": clipboard_ok,
+        "tracemalloc_peak_mb": round(peak / 1024 / 1024, 1),
+        "rss_delta_mb": round(get_rss_mb() - rss_before, 1),
+    }
+
+def bench_e2e(model_names, lengths, fixtures, modes, vad_backend, output_dir):
+    """종료 → 클립보드 지연 벤치마크 - 모델별 × 픽스처별 × 모드별, 결과는 JSON으로 저장"""
+    import platform
+    config = load_config()
+    config["debug_dump_wav"] = False
+
+    audios = [(f"synthetic-{sec:g}s", make_synthetic_audio(sec)) for sec in lengths]
+    audios += [(os.path.basename(path), load_audio_file(path)) for path in fixtures]
+
+    vad_model = None
+    if vad_backend != "none":
+        try:
+            vad_model = create_vad(vad_backend, config.get("vad_onnx_path"))
+        except Exception as e:
+            print(f"[Bench] VAD 없이 진행 ({vad_backend} 로드 실패: {e})")
+
+    results = []
+    print(f"{'모델':<10} {'픽스처':<20} {'모드':<9} | {'종료→클립보드':>12} | {'RTF':>6} | {'메모리':>8}")
+    for name in model_names:
+        engine = Transcriber(config)
+        if name == "fake":
+            engine.model = FakeWhisperModel()
+        else:
+            from faster_whisper import WhisperModel
+            device, compute_type = detect_device()
+            engine.model = WhisperModel(name, device=device, compute_type=compute_type,
+                                        local_files_only=True)
+            engine.warm_up(engine.model)
+        engine.model_size = name
+
+        for fixture, audio in audios:
+            for mode in modes:
+                r = bench_e2e_run(engine, audio, mode == "streaming", vad_model)
+                r.update({"model": name, "fixture": fixture})
+                results.append(r)
+                print(f"{name:<10} {fixture:<20} {mode:<9} | {r['stop_to_clipboard_sec']:10.2f}s | "
+                      f"{r['rtf']:6.3f} | {r['tracemalloc_peak_mb']:6.1f}MB")
+        engine.model = None
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, time.strftime("e2e-%Y%m%d-%H%M%S.json"))
+    report = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "vad_backend": vad_backend if vad_model else "none",
+        "decode_profile": config.get("decode_profile", "auto"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[Bench] 결과 저장: {path}")
+
+def run_bench(argv):
+    """벤치마크 실행 (창/트레이/단축키 없이)"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="voice_app.py bench", description="Tilnote Voice 벤치마크")
+    parser.add_argument("target", choices=["input", "vad", "vad-probe", "e2e", "resample", "batch"],
+                        help="input: 임시 WAV 경유 vs 메모리 직접 전달, vad: VAD 백엔드 비교, "
+                             "e2e: 종료 → 클립보드 지연, resample: 장치 레이트 녹음 CPU 비용, "
+                             "batch: 쌓인 클립 순차 vs 배치 디코딩 처리량")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 2, 5], help="오디오 길이 (분)")
+    parser.add_argument("--repeats", type=int, default=3, help="반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--backend", nargs="+", default=VAD_BACKENDS, help="비교할 VAD 백엔드")
+    parser.add_argument("--models", nargs="+",
+                        help="input/e2e: 측정할 모델 (fake = 가짜 모델, 기본: fake + 로컬에 있는 모델)")
+    parser.add_argument("--lengths", type=float, nargs="+", default=[10, 30, 60, 120, 300],
+                        help="e2e: 합성 오디오 길이 (초)")
+    parser.add_argument("--fixtures", nargs="*", default=[], help="e2e: 추가 오디오 파일")
+    parser.add_argument("--modes", nargs="+", default=["single", "streaming"],
+                        choices=["single", "streaming"], help="e2e: 변환 방식")
+    parser.add_argument("--vad", default="silero_onnx", choices=VAD_BACKENDS + ["none"],
+                        help="e2e: VAD 백엔드")
+    parser.add_argument("--output", default=BENCH_RESULTS_DIR, help="e2e: 결과 JSON 저장 폴더")
+    parser.add_argument("--clips", type=int, default=BATCH_MAX_SIZE, help="batch: 쌓인 클립 수")
+    parser.add_argument("--clip-sec", type=float, nargs="+", default=[5, 15], help="batch: 클립 길이 (초)")
+    args = parser.parse_args(argv)
+
+    if args.target == "input":
+        models = args.models or ["fake"] + [m for m in MODEL_MEMORY_MB if is_model_downloaded(m)]
+        bench_input(models, args.minutes, args.repeats)
+    elif args.target == "vad":
+        bench_vad(args.backend)
+    elif args.target == "vad-probe":
+        bench_vad_probe(args.backend[0])
+    elif args.target == "resample":
+        bench_resample()
+    elif args.target == "e2e":
+        models = args.models or ["fake"] + [m for m in MODEL_MEMORY_MB if is_model_downloaded(m)]
+        bench_e2e(models, args.lengths, args.fixtures, args.modes, args.vad, args.output)
+    elif args.target == "batch":
+        models = args.models or [m for m in MODEL_MEMORY_MB if is_model_downloaded(m)]
+        if not models:
+            print("[Bench] 로컬에 받아둔 모델이 없음 - --models로 지정하면 다운로드 후 측정")
+            return 1
+        bench_batch(models, args.clip_sec, args.clips, args.fixtures)
+    return 0
+
+# ===== 일괄 변환 (python voice_app.py transcribe <파일/폴더...>) =====
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".webm", ".mp4", ".aac", ".wma")
+
+def collect_audio_files(paths):
+    """파일/폴더 목록 → 오디오 파일 목록 (폴더는 하위까지, 이름순)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, n) for n in sorted(names) if n.lower().endswith(AUDIO_EXTENSIONS)]
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"[Transcribe] 없는 경로: {path}")
+    return [os.path.abspath(f) for f in files]
+
+def load_done_paths(output_path):
+    """이전 실행에서 이미 변환한 파일 (이어하기용) - 실패한 파일은 다시 시도"""
+    done = set()
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 중단되며 잘린 마지막 줄
+                if "text" in entry:
+                    done.add(entry["path"])
+    except OSError:
+        pass
+    return done
+
+def transcribe_files(engine, files, output_path, txt_dir=None, workers=1):
+    """디코딩 → 변환 → 기록 파이프라인
+
+    디코딩 스레드 1개가 파일을 읽어 크기 제한 큐에 넣고 (메모리 상한 = 큐 크기 × 파일 길이),
+    변환 스레드 workers개가 같은 모델로 병렬 변환, 결과는 메인 스레드가 한 줄씩 기록한다.
+    """
+    decoded = queue.Queue(maxsize=workers + 1)
+    results = queue.Queue()
+
+    def decode():
+        for path in files:
+            try:
+                decoded.put((path, load_audio_file(path), None))
+            except Exception as e:
+                decoded.put((path, None, e))
+        for _ in range(workers):
+            decoded.put(None)
+
+    def transcribe():
+        while True:
+            item = decoded.get()
+            if item is None:
+                results.put(None)
+                return
+            path, audio, error = item
+            info = {}
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    raise error
+                text = engine.transcribe(audio, info=info)
+            except Exception as e:
+                results.put({"path": path, "error": str(e)})
+                continue
+            results.put({"path": path, "text": text, "duration": round(len(audio) / SAMPLE_RATE, 2),
+                         "decode_sec": round(time.perf_counter() - start, 2),
+                         "model": info.get("model"), "profile": info.get("profile")})
+
+    threading.Thread(target=decode, daemon=True).start()
+    for _ in range(workers):
+        threading.Thread(target=transcribe, daemon=True).start()
+
+    if txt_dir:
+        os.makedirs(txt_dir, exist_ok=True)
+    ok = failed = 0
+    audio_sec = 0.0
+    remaining = workers
+    with open(output_path, "a", encoding="utf-8") as out:
+        while remaining:
+            entry = results.get()
+            if entry is None:
+                remaining -= 1
+                continue
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            out.flush()  # 중단돼도 여기까지는 이어하기에서 건너뜀
+            name = os.path.basename(entry["path"])
+            if "error" in entry:
+                failed += 1
+                print(f"[Transcribe] 실패 {name}: {entry['error']}")
+                continue
+            ok += 1
+            audio_sec += entry["duration"]
+            if txt_dir:
+                txt_path = os.path.join(txt_dir, os.path.splitext(name)[0] + ".txt")
+                with open(txt_path, "w", encoding="utf-8") as f:
+                    f.write(entry["text"] + "\n")
+            print(f"[Transcribe] ({ok + failed}/{len(files)}) {name} - "
+                  f"{entry['duration']:.1f}s → {entry['decode_sec']:.1f}s")
+    return ok, failed, audio_sec
+
+def run_transcribe(argv):
+    """일괄 변환 CLI - Tk/트레이/핫키 없이 모델 하나로 여러 파일 변환"""
+    import argparse
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="voice_app.py transcribe",
+                                     description="오디오 파일/폴더 일괄 변환 (config.json 설정 사용)")
+    parser.add_argument("paths", nargs="+", help="오디오 파일 또는 폴더")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl", help="결과 JSONL (이어하기 기준)")
+    parser.add_argument("--txt-dir", help="파일별 .txt도 이 폴더에 저장")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="동시 변환 수")
+    parser.add_argument("--model", default=config.get("model_size", "small"), help="모델 크기")
+    parser.add_argument("--language", default=config.get("language", "ko"), help="언어")
+    parser.add_argument("--profile", choices=["auto"] + list(DECODE_PROFILES),
+                        default=config.get("decode_profile", "auto"), help="디코딩 프로필")
+    parser.add_argument("--restart", action="store_true", help="이미 변환한 파일도 다시 변환")
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+
+    files = collect_audio_files(args.paths)
+    done = set() if args.restart else load_done_paths(args.output)
+    todo = [f for f in files if f not in done]
+    if done:
+        print(f"[Transcribe] 이어하기: {len(files) - len(todo)}개 건너뜀")
+    if not todo:
+        print("[Transcribe] 변환할 파일 없음")
+        return 0
+
+    config.update(language=args.language, decode_profile=args.profile, debug_dump_wav=False)
+    engine = Transcriber(config)
+    device, compute_type = detect_device()
+    start = time.perf_counter()
+    # 앱과 같은 경로 (보정값 적용) - num_workers: 여러 스레드가 같은 모델로 동시에 transcribe 가능
+    cache = ModelCache(float("inf"), num_workers=workers)
+    engine.model, _ = load_calibrated_model(cache, config, args.model, device, compute_type)
+    engine.model_size = args.model
+    load_sec = time.perf_counter() - start
+    compute_type, cpu_threads = calibrated_settings(config, args.model, device, compute_type)
+    print(f"[Transcribe] 모델 로드 {load_sec:.1f}s ({args.model}, {device}/{compute_type}, "
+          f"스레드 {cpu_threads or '기본'}), {len(todo)}개 파일, 동시 {workers}개")
+
+    start = time.perf_counter()
+    try:
+        ok, failed, audio_sec = transcribe_files(engine, todo, args.output, args.txt_dir, workers)
+    except KeyboardInterrupt:
+        print(f"\n[Transcribe] 중단됨 - 다시 실행하면 이어서 변환합니다 ({args.output})")
+        return 130
+    wall = time.perf_counter() - start
+
+    print(f"[Transcribe] 완료 {ok}개, 실패 {failed}개 / 오디오 {audio_sec / 60:.1f}분, 소요 {wall:.1f}s")
+    if wall > 0:
+        print(f"[Transcribe] 처리량 {audio_sec / wall:.1f}x 실시간, {(ok + failed) / wall * 60:.1f}개/분")
+    return 1 if failed else 0
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # EXE 빌드에서 추론 프로세스 시작 (inference_process)
+
+    # 벤치마크 모드 - 중복 실행 검사/GUI 없이 실행
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sys.exit(run_bench(sys.argv[2:]))
+
+    # 실행 중인 앱의 변환 서비스로 파일 하나 변환 (세그먼트가 나오는 대로 출력)
+    if len(sys.argv) > 2 and sys.argv[1] == "send":
+        try:
+            with open(sys.argv[2], "rb") as f:
+                for message in request_transcription(f.read(), fmt="wav"):
+                    if message["type"] == "segment":
+                        print(f"[{message['start']:7.2f} → {message['end']:7.2f}] {message['text'].strip()}")
+                    elif message["type"] != "queued":
+                        print(json.dumps(message, ensure_ascii=False))
+        except OSError as e:
+            print(f"[Voice App] 서비스에 연결할 수 없음: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    # CPU 보정 - 스레드 수/연산 타입 측정 후 config.json에 저장
+    if len(sys.argv) > 1 and sys.argv[1] == "calibrate":
+        import argparse
+        config = load_config()
+        parser = argparse.ArgumentParser(prog="voice_app.py calibrate")
+        parser.add_argument("--model", default=config.get("model_size", "small"), help="모델 크기")
+        parser.add_argument("--fixture", help="측정용 오디오 파일 (기본: 합성 오디오)")
+        args = parser.parse_args(sys.argv[2:])
+        audio = load_audio_file(args.fixture)[:CALIBRATION_SEC * SAMPLE_RATE] if args.fixture else None
+        result = calibrate(args.model, audio, language=config.get("language", "ko"))
+        save_calibration(config, args.model, result)
+        print(f"[Calibrate] 저장됨: {result['compute_type']}, {result['cpu_threads']} 스레드 (RTF {result['rtf']})")
+        sys.exit(0)
+
+    # 일괄 변환 모드 - GUI 없이 파일 변환 (앱이 실행 중이어도 가능)
+    if len(sys.argv) > 1 and sys.argv[1] == "transcribe":
+        sys.exit(run_transcribe(sys.argv[2:]))
+
+    # 성능 통계 - 실행 중인 앱에 묻고, 없으면 기록 파일에서 계산
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        reply = query_existing_instance(b'STATS')
+        if reply:
+            print(json.dumps(json.loads(reply), ensure_ascii=False, indent=2))
+        else:
+            print(MetricsLog().format_summary())
+        sys.exit(0)
+
     lock = check_already_running()
     if lock is None:
         # 이미 실행 중 - 기존 창 열기 신호 보내기